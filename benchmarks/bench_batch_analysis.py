@@ -0,0 +1,67 @@
+"""Offline timeline throughput against real-time replay.
+
+Records synthetic 960x540 frames at 30 fps and times ``analyse_timeline``
+inline and with a process pool, for one config and for a 3x3 sweep.
+Run with ``python benchmarks/bench_batch_analysis.py [frames]``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from ambilight.capture.recording import FrameRecorder
+from ambilight.capture.synthetic import SyntheticFrameProvider
+from ambilight.config.models import AppConfig, OutputZone
+from ambilight.services.batch_analysis import analyse_timeline
+from ambilight.state.zone_state import ZoneRect
+
+_CONFIG = AppConfig(
+    display_id=1,
+    zone=ZoneRect(x=0, y=0, width=960, height=540),
+    preview_interval_sec=1.0,
+    analysis_hz=30.0,
+    dark_threshold=0.1,
+    saturation_boost=0.2,
+    zones=tuple(
+        OutputZone(
+            f"edge{i}", f"light.edge{i}", ZoneRect(x=i * 120, y=0, width=120, height=60)
+        )
+        for i in range(8)
+    ),
+)
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    sweep = [
+        replace(_CONFIG, dark_threshold=t, saturation_boost=b)
+        for t in (0.05, 0.1, 0.2)
+        for b in (0.0, 0.2, 0.4)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.amb"
+        source = SyntheticFrameProvider()
+        source.start(1)
+        with FrameRecorder(path, (540, 960)) as recorder:
+            for index in range(frames):
+                frame = source.get_frame()
+                recorder.write(replace(frame, capture_ns=(index + 1) * 33_333_333))
+        realtime = frames / 30.0
+        for label, configs in (("1 config", [_CONFIG]), ("3x3 sweep", sweep)):
+            for workers in sorted({1, os.cpu_count() or 1}):
+                start = time.perf_counter()
+                analyse_timeline(path, configs, workers=workers)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{label:9s} workers={workers}: {elapsed:6.2f}s for {frames} frames "
+                    f"({realtime / elapsed:5.1f}x real time)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark dominant color engines on 1080p-sized zone crops.
+
+Run with ``python benchmarks/bench_dominant_color.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import (
+    ENGINE_HISTOGRAM,
+    ENGINE_MEDIANCUT,
+    dominant_color_rgb,
+)
+
+
+def _synthetic_crop(rng: np.random.Generator, height: int, width: int) -> np.ndarray:
+    crop = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    crop[: height * 2 // 3] = (30, 60, 200)
+    return crop
+
+
+def _time_engine(engine: str, crop: np.ndarray, repeats: int) -> float:
+    dominant_color_rgb(crop, engine)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        dominant_color_rgb(crop, engine)
+    return (time.perf_counter() - start) / repeats * 1000.0
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for height, width in ((1080, 1920), (540, 960), (100, 1920)):
+        crop = _synthetic_crop(rng, height, width)
+        legacy_ms = _time_engine(ENGINE_MEDIANCUT, crop, repeats=3)
+        histogram_ms = _time_engine(ENGINE_HISTOGRAM, crop, repeats=20)
+        print(
+            f"{width}x{height}: mediancut={legacy_ms:.2f} ms "
+            f"histogram={histogram_ms:.2f} ms speedup={legacy_ms / histogram_ms:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare the pooled NumPy area-average downscaler with a PIL round trip.
+
+The PIL path is the previous capture code: ``Image.fromarray`` + bilinear
+``resize`` + ``np.asarray``. Sources are 1080p and 4K frames.
+Run with ``python benchmarks/bench_downscale.py``.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+from ambilight.capture.downscale import Downscaler
+
+_CASES = (
+    ((1080, 1920), (960, 540)),
+    ((1080, 1920), (1280, 720)),
+    ((2160, 3840), (1920, 1080)),
+    ((2160, 3840), (1280, 720)),
+)
+
+
+def _time_ms(fn, repeats: int = 10) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000.0
+
+
+def _peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024.0
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for src_shape, size in _CASES:
+        src = rng.integers(0, 256, size=(*src_shape, 3), dtype=np.uint8)
+        downscaler = Downscaler()
+
+        def pil(src=src, size=size) -> np.ndarray:
+            return np.asarray(
+                Image.fromarray(src).resize(size, resample=Image.BILINEAR)
+            )
+
+        def pooled(src=src, size=size, downscaler=downscaler) -> np.ndarray:
+            return downscaler.resize(src, size)
+
+        numpy_ms = _time_ms(pooled)
+        pil_ms = _time_ms(pil)
+        print(
+            f"{src_shape[1]}x{src_shape[0]} -> {size[0]}x{size[1]}: "
+            f"numpy={numpy_ms:.1f} ms ({_peak_kib(pooled):.0f} KiB peak) "
+            f"pil={pil_ms:.1f} ms ({_peak_kib(pil):.0f} KiB peak)"
+        )
+
+
+if __name__ == "__main__":
+    main()
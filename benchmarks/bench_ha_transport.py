@@ -0,0 +1,100 @@
+"""Compare Home Assistant REST and WebSocket transports against local stand-ins.
+
+Latency: time per call, including Home Assistant's answer. Throughput:
+calls issued back to back, the way the command sender issues them (each
+waits for its result, so failures are seen and retried).
+Run with ``python benchmarks/bench_ha_transport.py [calls]`` (needs ``websockets``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import time
+
+import uvicorn
+from fastapi import FastAPI
+from websockets.asyncio.server import serve
+
+from ambilight.ha.client import TRANSPORT_REST, TRANSPORT_WEBSOCKET, HomeAssistantClient
+
+
+async def _ws_handler(ws) -> None:
+    await ws.send(json.dumps({"type": "auth_required"}))
+    await ws.recv()
+    await ws.send(json.dumps({"type": "auth_ok"}))
+    async for raw in ws:
+        message = json.loads(raw)
+        await ws.send(
+            json.dumps({"id": message["id"], "type": "result", "success": True})
+        )
+
+
+def _rest_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/services/light/{service}")
+    async def call_service(service: str, payload: dict) -> list:
+        return []
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _measure(
+    client: HomeAssistantClient, calls: int
+) -> tuple[list[float], float]:
+    latencies = []
+    for index in range(calls // 4):
+        start = time.perf_counter()
+        await client.set_color((index % 256, 0, 0))
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    start = time.perf_counter()
+    for index in range(calls):
+        await client.set_color((index % 256, 0, 0))
+    return latencies, calls / (time.perf_counter() - start)
+
+
+async def main(calls: int) -> None:
+    rest_port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(_rest_app(), port=rest_port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    async with serve(_ws_handler, "127.0.0.1", 0) as ws_server:
+        ws_port = ws_server.sockets[0].getsockname()[1]
+        for transport, port in (
+            (TRANSPORT_REST, rest_port),
+            (TRANSPORT_WEBSOCKET, ws_port),
+        ):
+            client = HomeAssistantClient(
+                base_url=f"http://127.0.0.1:{port}",
+                token="token",
+                entity_id="light.lamp",
+                min_interval_ms=0,
+                transport=transport,
+            )
+            await _measure(client, 40)
+            latencies, rate = await _measure(client, calls)
+            await client.close()
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(
+                f"{transport:9s} latency p50 {statistics.median(latencies):6.2f} ms"
+                f"  p95 {p95:6.2f} ms  throughput {rate:8.0f} calls/s"
+            )
+    server.should_exit = True
+    await serving
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,71 @@
+"""Benchmark batched multi-zone analysis against one crop per zone.
+
+The controller bins its main zone (here the whole 960x540 frame, the default
+half-scale capture of a 1080p display) in the same pass as the output zones,
+which are edge segments of the frame. Each case adds 1, 8 or 32 output zones
+to the main zone. Run with ``python benchmarks/bench_multi_zone.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import histogram_dominant
+from ambilight.analysis.multi_zone import MultiZoneAnalyzer
+from ambilight.state.zone_state import ZoneRect
+
+_WIDTH, _HEIGHT, _DEPTH = 960, 540, 80
+
+
+def edge_zones(count: int) -> list[ZoneRect]:
+    """Split the four screen edges into ``count`` segments (one zone: the top edge)."""
+
+    if count == 1:
+        return [ZoneRect(x=0, y=0, width=_WIDTH, height=_DEPTH)]
+    per_edge = count // 4
+    zones = []
+    for i in range(per_edge):
+        w = _WIDTH // per_edge
+        h = _HEIGHT // per_edge
+        zones.append(ZoneRect(x=i * w, y=0, width=w, height=_DEPTH))
+        zones.append(ZoneRect(x=i * w, y=_HEIGHT - _DEPTH, width=w, height=_DEPTH))
+        zones.append(ZoneRect(x=0, y=i * h, width=_DEPTH, height=h))
+        zones.append(ZoneRect(x=_WIDTH - _DEPTH, y=i * h, width=_DEPTH, height=h))
+    return zones
+
+
+def _time(fn, repeats: int = 20) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000.0
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(_HEIGHT, _WIDTH, 3), dtype=np.uint8)
+    frame[: _HEIGHT // 2] = (20, 40, 90)
+    main_zone = ZoneRect(x=0, y=0, width=_WIDTH, height=_HEIGHT)
+    baseline = None
+    for count in (1, 8, 32):
+        zones = [main_zone, *edge_zones(count)]
+        analyzer = MultiZoneAnalyzer(zones)
+
+        def per_zone(zones=zones) -> None:
+            for z in zones:
+                histogram_dominant(frame[z.y : z.y + z.height, z.x : z.x + z.width])
+
+        separate_ms = _time(per_zone)
+        batched_ms = _time(lambda analyzer=analyzer: analyzer.analyse(frame))
+        baseline = baseline or batched_ms
+        print(
+            f"main+{count:>2} zones: separate={separate_ms:.2f} ms "
+            f"batched={batched_ms:.2f} ms ({batched_ms / baseline:.2f}x of main+1)"
+        )
+
+
+if __name__ == "__main__":
+    main()
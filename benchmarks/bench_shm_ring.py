@@ -0,0 +1,95 @@
+"""Measure frame handoff through the shared-memory ring.
+
+In-process: cost of one ``write`` + ``read`` compared with pickling the frame
+through a ``multiprocessing`` pipe. Cross-process: latency from capture to the
+consumer seeing the frame and delivered frames per second, with the synthetic
+producer running uncapped in a child process.
+Run with ``python benchmarks/bench_shm_ring.py``.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import statistics
+import threading
+import time
+from functools import partial
+
+import numpy as np
+
+from ambilight.capture.process_provider import ProcessFrameProvider
+from ambilight.capture.shm_ring import SharedFrameRing
+from ambilight.capture.synthetic import SyntheticFrameProvider
+
+_SHAPES = ((540, 960), (1080, 1920))
+
+
+def _ring_handoff_ms(shape: tuple[int, int], repeats: int = 200) -> float:
+    ring = SharedFrameRing.create(shape)
+    frame = np.random.default_rng(0).integers(0, 256, size=(*shape, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        ring.write(frame, time.time_ns())
+        ring.read()
+    elapsed = (time.perf_counter() - start) / repeats * 1000.0
+    ring.close()
+    return elapsed
+
+
+def _pipe_handoff_ms(shape: tuple[int, int], repeats: int = 50) -> float:
+    receiver, sender = mp.Pipe(duplex=False)
+    frame = np.random.default_rng(0).integers(0, 256, size=(*shape, 3), dtype=np.uint8)
+
+    def send_all() -> None:
+        for _ in range(repeats):
+            sender.send(frame)
+
+    # The pipe buffer is far smaller than a frame, so the sender needs its own thread.
+    thread = threading.Thread(target=send_all)
+    start = time.perf_counter()
+    thread.start()
+    for _ in range(repeats):
+        receiver.recv()
+    thread.join()
+    return (time.perf_counter() - start) / repeats * 1000.0
+
+
+def _cross_process(
+    shape: tuple[int, int], seconds: float = 2.0
+) -> tuple[float, float, float]:
+    height, width = shape
+    provider = ProcessFrameProvider(
+        partial(SyntheticFrameProvider, width, height), max_shape=shape, target_fps=0.0
+    )
+    provider.start(1)
+    ring = provider._ring
+    latencies = []
+    last_seq = ring.latest_seq
+    first_seq = last_seq
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        frame = ring.read(last_seq)
+        if frame is None:
+            continue
+        latencies.append((time.time_ns() - frame.capture_ns) / 1e6)
+        last_seq = frame.seq
+    delivered = (last_seq - first_seq) / seconds
+    provider.stop()
+    return statistics.median(latencies), max(latencies), delivered
+
+
+def main() -> None:
+    for shape in _SHAPES:
+        label = f"{shape[1]}x{shape[0]}"
+        print(
+            f"{label}: ring write+read={_ring_handoff_ms(shape):.2f} ms "
+            f"pipe pickle={_pipe_handoff_ms(shape):.2f} ms"
+        )
+        median_ms, max_ms, fps = _cross_process(shape)
+        print(
+            f"{label}: cross-process latency median={median_ms:.2f} ms max={max_ms:.2f} ms, {fps:.0f} fps"
+        )
+
+
+if __name__ == "__main__":
+    main()
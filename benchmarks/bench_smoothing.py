@@ -0,0 +1,67 @@
+"""Compare smoothing filters: CPU cost per update, step response and jitter.
+
+Samples arrive at 25 Hz. The step goes from black to (200, 200, 200); jitter is
+the output standard deviation for a steady input with +-8 uniform noise.
+Run with ``python benchmarks/bench_smoothing.py``.
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+
+import numpy as np
+
+from ambilight.analysis.smoothing import SMOOTHING_MODES, create_smoothing_filter
+
+_PERIOD_NS = 40_000_000
+
+
+def _cpu_cost_us(mode: str, samples: int = 20_000) -> float:
+    filt = create_smoothing_filter(mode)
+    colors = [(i % 256, (i * 7) % 256, (i * 13) % 256) for i in range(samples)]
+    start = time.perf_counter()
+    for i, color in enumerate(colors):
+        filt.update(color, i * _PERIOD_NS)
+    return (time.perf_counter() - start) / samples * 1e6
+
+
+def _step_response_ms(mode: str) -> tuple[float, float]:
+    filt = create_smoothing_filter(mode)
+    for i in range(25):
+        filt.update((0, 0, 0), i * _PERIOD_NS)
+    half = ninety = None
+    for i in range(25, 100):
+        value = filt.update((200, 200, 200), i * _PERIOD_NS)[0]
+        elapsed = (i - 24) * _PERIOD_NS / 1e6
+        if half is None and value >= 100:
+            half = elapsed
+        if ninety is None and value >= 180:
+            ninety = elapsed
+    return half or float("inf"), ninety or float("inf")
+
+
+def _jitter(mode: str) -> float:
+    rng = np.random.default_rng(0)
+    filt = create_smoothing_filter(mode)
+    outputs = []
+    for i in range(500):
+        noisy = int(128 + rng.integers(-8, 9))
+        value = filt.update((noisy, noisy, noisy), i * _PERIOD_NS)[0]
+        if i >= 50:
+            outputs.append(value)
+    return statistics.pstdev(outputs)
+
+
+def main() -> None:
+    print(f"{'mode':<10} {'cpu_us':>8} {'t50_ms':>8} {'t90_ms':>8} {'jitter':>8}")
+    for mode in SMOOTHING_MODES:
+        half, ninety = _step_response_ms(mode)
+        print(
+            f"{mode:<10} {_cpu_cost_us(mode):8.2f} {half:8.0f} {ninety:8.0f} "
+            f"{_jitter(mode):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Frame rate of each synthetic pattern, alone and through the analysis pipeline.
+
+Run with ``python benchmarks/bench_synthetic.py [frames]``.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from ambilight.capture.synthetic import PATTERNS, SyntheticFrameProvider
+from ambilight.config.models import AppConfig
+from ambilight.services.analysis_pipeline import AnalysisPipeline
+from ambilight.state.zone_state import ZoneRect
+
+_SIZES = ((960, 540), (1920, 1080))
+
+
+def _config(width: int, height: int) -> AppConfig:
+    return AppConfig(
+        display_id=1,
+        zone=ZoneRect(x=0, y=0, width=width, height=height),
+        preview_interval_sec=1.0,
+        analysis_hz=25.0,
+        dark_threshold=0.1,
+        saturation_boost=0.2,
+    )
+
+
+def main(frames: int) -> None:
+    for width, height in _SIZES:
+        config = _config(width, height)
+        for pattern in PATTERNS:
+            provider = SyntheticFrameProvider(width, height, pattern=pattern)
+            provider.start(1)
+            start = time.perf_counter()
+            for _ in range(frames):
+                provider.get_frame()
+            generate = frames / (time.perf_counter() - start)
+
+            pipeline = AnalysisPipeline()
+            start = time.perf_counter()
+            for index in range(frames):
+                pipeline.process(provider.get_frame(), index * 16_666_667, config)
+            pipelined = frames / (time.perf_counter() - start)
+            print(
+                f"{f'{width}x{height}':9s} {pattern:9s} generate {generate:8.0f} fps"
+                f"  through pipeline {pipelined:6.0f} fps"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,46 @@
+"""Benchmark the tiled zone histogram against a full re-bin per frame.
+
+Simulates a full-screen zone where only a windowed video region changes.
+Run with ``python benchmarks/bench_tile_histogram.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import dominant_color_histogram
+from ambilight.analysis.tile_histogram import TileHistogram
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for height, width in ((1080, 1920), (540, 960)):
+        zone = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        zone[: height // 2] = (20, 40, 90)
+        video = (slice(height // 4, height // 2), slice(width // 4, width // 2))
+        tiles = TileHistogram()
+        tiles.update(zone)
+        frames = 30
+        full_ms = 0.0
+        tiled_ms = 0.0
+        for _ in range(frames):
+            zone[video] = rng.integers(0, 256, size=3)
+            start = time.perf_counter()
+            expected = dominant_color_histogram(zone)
+            full_ms += time.perf_counter() - start
+            start = time.perf_counter()
+            result = tiles.update(zone)
+            tiled_ms += time.perf_counter() - start
+            assert result == expected
+        full_ms = full_ms / frames * 1000.0
+        tiled_ms = tiled_ms / frames * 1000.0
+        print(
+            f"{width}x{height}: full={full_ms:.2f} ms tiled={tiled_ms:.2f} ms "
+            f"speedup={full_ms / tiled_ms:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
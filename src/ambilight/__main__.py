@@ -2,10 +2,61 @@
 
 from __future__ import annotations
 
+import argparse
 import asyncio
+from pathlib import Path
 
-from ambilight.main import main
+from ambilight.main import analyse, main, record
+from ambilight.utils.logging import configure_logging
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m ambilight")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="run the sync service (default)")
+    rec = commands.add_parser("record", help="capture frames to a recording file")
+    rec.add_argument("output", type=Path)
+    rec.add_argument("--seconds", type=float, default=10.0)
+    rec.add_argument("--fps", type=float, default=30.0)
+    rec.add_argument(
+        "--source",
+        default="display",
+        help="'display', 'synthetic[:pattern]' or a recording to re-record",
+    )
+    rec.add_argument("--display", type=int, default=1)
+    rec.add_argument("--scale", type=float, default=0.5)
+    batch = commands.add_parser(
+        "analyse", help="compute color timelines for a recording or image folder"
+    )
+    batch.add_argument("source", type=Path)
+    batch.add_argument("--dark-threshold", type=float, nargs="+", default=())
+    batch.add_argument("--saturation-boost", type=float, nargs="+", default=())
+    batch.add_argument("--workers", type=int, default=None)
+    batch.add_argument(
+        "--fps", type=float, default=30.0, help="frame rate of image folders"
+    )
+    batch.add_argument(
+        "--output", type=Path, default=None, help="write timelines to .npz"
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = _parse_args()
+    if args.command == "record":
+        configure_logging()
+        record(
+            args.output, args.seconds, args.fps, args.source, args.display, args.scale
+        )
+    elif args.command == "analyse":
+        configure_logging()
+        analyse(
+            args.source,
+            args.dark_threshold,
+            args.saturation_boost,
+            args.workers,
+            args.output,
+            args.fps,
+        )
+    else:
+        asyncio.run(main())
@@ -0,0 +1,204 @@
+"""Registry of dominant-color backends with startup calibration."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import (
+    ENGINE_HISTOGRAM,
+    ENGINE_MEDIANCUT,
+    HISTOGRAM_BINS,
+    HISTOGRAM_BITS,
+    LEGACY_TOLERANCE,
+    as_rgb,
+    dominant_color_histogram,
+    dominant_color_mediancut,
+    histogram_dominant,
+    refine_bin,
+)
+from ambilight.utils.logging import get_logger
+
+RgbColor = Tuple[int, int, int]
+
+BACKEND_NUMBA = "numba"
+AUTO_BACKEND = "auto"
+
+# Calibration frames are capped to a full 1080p display.
+_MAX_CALIBRATION_SIZE = (1920, 1080)
+
+
+@dataclass(frozen=True)
+class AnalysisBackend:
+    """Named dominant-color extractor operating on a zone crop.
+
+    Backends that bin pixels into the shared packed-RGB histogram also expose
+    ``histogram``, returning the bin counts with the dominant color so zone
+    statistics need no extra pass.
+    """
+
+    name: str
+    extract: Callable[[np.ndarray], RgbColor]
+    description: str = ""
+    histogram: Optional[Callable[[np.ndarray], tuple[np.ndarray, RgbColor]]] = None
+
+
+@dataclass(frozen=True)
+class CalibrationResult:
+    selected: str
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    max_error: Dict[str, int] = field(default_factory=dict)
+
+
+_REGISTRY: Dict[str, AnalysisBackend] = {}
+
+
+def register_backend(backend: AnalysisBackend) -> None:
+    _REGISTRY[backend.name] = backend
+
+
+def get_backend(name: str) -> AnalysisBackend:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"unknown analysis backend: {name}") from None
+
+
+def available_backends() -> List[AnalysisBackend]:
+    return list(_REGISTRY.values())
+
+
+def synthetic_zone(
+    rng: np.random.Generator, width: int, height: int
+) -> tuple[np.ndarray, RgbColor]:
+    """Return a noisy zone with a known dominant color covering most of it."""
+
+    dominant = tuple(int(c) for c in rng.integers(0, 256, size=3))
+    zone = np.empty((height, width, 3), dtype=np.uint8)
+    zone[:, :] = dominant
+    for _ in range(3):
+        x = int(rng.integers(0, width))
+        y = int(rng.integers(0, height))
+        zone[y : y + max(1, height // 4), x : x + max(1, width // 4)] = rng.integers(
+            0, 256, size=3
+        )
+    noise = rng.integers(-2, 3, size=zone.shape)
+    zone = np.clip(zone.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    return zone, (dominant[0], dominant[1], dominant[2])
+
+
+def calibrate_backends(
+    width: int,
+    height: int,
+    frames: int = 3,
+    tolerance: int = LEGACY_TOLERANCE,
+    backends: Optional[Iterable[AnalysisBackend]] = None,
+    seed: int = 0,
+) -> CalibrationResult:
+    """Time each backend on synthetic zones and pick the fastest accurate one.
+
+    Backends whose result is further than ``tolerance`` from the known
+    dominant color on any frame are excluded from selection.
+    """
+
+    width = max(1, min(width, _MAX_CALIBRATION_SIZE[0]))
+    height = max(1, min(height, _MAX_CALIBRATION_SIZE[1]))
+    rng = np.random.default_rng(seed)
+    samples = [synthetic_zone(rng, width, height) for _ in range(max(1, frames))]
+    candidates = list(backends) if backends is not None else available_backends()
+
+    timings: Dict[str, float] = {}
+    errors: Dict[str, int] = {}
+    for backend in candidates:
+        backend.extract(samples[0][0])
+        best = float("inf")
+        worst_error = 0
+        for zone, expected in samples:
+            start = time.perf_counter()
+            result = backend.extract(zone)
+            best = min(best, (time.perf_counter() - start) * 1000.0)
+            worst_error = max(
+                worst_error,
+                max(abs(a - b) for a, b in zip(result, expected, strict=True)),
+            )
+        timings[backend.name] = best
+        errors[backend.name] = worst_error
+
+    accurate = [name for name in timings if errors[name] <= tolerance]
+    if accurate:
+        selected = min(accurate, key=lambda name: timings[name])
+    else:
+        selected = ENGINE_HISTOGRAM
+    get_logger("ambilight.analysis", width=width, height=height).info(
+        "Selected analysis backend %s timings_ms=%s", selected, timings
+    )
+    return CalibrationResult(selected=selected, timings_ms=timings, max_error=errors)
+
+
+def _numba_backend() -> Optional[AnalysisBackend]:
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    shift = 8 - HISTOGRAM_BITS
+    bits = HISTOGRAM_BITS
+    bins = HISTOGRAM_BINS
+
+    @numba.njit(nogil=True, cache=False)
+    def _kernel(rgb):  # pragma: no cover - compiled
+        counts = np.zeros(bins, np.int64)
+        sums = np.zeros((bins, 3), np.int64)
+        height, width = rgb.shape[0], rgb.shape[1]
+        for y in range(height):
+            for x in range(width):
+                r = np.int64(rgb[y, x, 0])
+                g = np.int64(rgb[y, x, 1])
+                b = np.int64(rgb[y, x, 2])
+                index = (
+                    ((r >> shift) << (2 * bits)) | ((g >> shift) << bits) | (b >> shift)
+                )
+                counts[index] += 1
+                sums[index, 0] += r
+                sums[index, 1] += g
+                sums[index, 2] += b
+        winner = counts.argmax()
+        return counts, sums[winner, 0], sums[winner, 1], sums[winner, 2]
+
+    def histogram(pixels: np.ndarray) -> tuple[np.ndarray, RgbColor]:
+        rgb = as_rgb(pixels)
+        if rgb.size == 0:
+            return np.zeros(bins, dtype=np.int64), (0, 0, 0)
+        counts, r, g, b = _kernel(rgb)
+        return counts, refine_bin((r, g, b), int(counts.max()))
+
+    return AnalysisBackend(
+        name=BACKEND_NUMBA,
+        extract=lambda pixels: histogram(pixels)[1],
+        description="numba JIT histogram",
+        histogram=histogram,
+    )
+
+
+register_backend(
+    AnalysisBackend(
+        name=ENGINE_MEDIANCUT,
+        extract=dominant_color_mediancut,
+        description="PIL median-cut quantizer",
+    )
+)
+register_backend(
+    AnalysisBackend(
+        name=ENGINE_HISTOGRAM,
+        extract=dominant_color_histogram,
+        description="NumPy packed-RGB histogram",
+        histogram=histogram_dominant,
+    )
+)
+_numba = _numba_backend()
+if _numba is not None:
+    register_backend(_numba)
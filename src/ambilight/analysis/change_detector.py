@@ -0,0 +1,45 @@
+"""Cheap zone change detection from a sparse pixel sample."""
+
+from __future__ import annotations
+
+import math
+import zlib
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+import numpy as np
+
+
+def zone_signature(pixels: np.ndarray, max_samples: int = 4096) -> int:
+    """Return a CRC32 over an evenly spaced grid of at most ``max_samples`` pixels."""
+
+    height, width = pixels.shape[:2]
+    step = max(1, math.ceil(math.sqrt(height * width / max(1, max_samples))))
+    sample = pixels[step // 2 :: step, step // 2 :: step]
+    return zlib.crc32(np.ascontiguousarray(sample).data)
+
+
+@dataclass
+class FrameChangeDetector:
+    """Report whether a zone differs from the previous call.
+
+    The signature samples a sparse grid, so changes that fall entirely between
+    sample points are missed; that is acceptable for dominant-color tracking.
+    """
+
+    max_samples: int = 4096
+    hits: int = 0
+    misses: int = 0
+    _last: Optional[tuple] = None
+
+    def has_changed(self, pixels: np.ndarray, key: Hashable = None) -> bool:
+        signature = (key, pixels.shape, zone_signature(pixels, self.max_samples))
+        if signature == self._last:
+            self.hits += 1
+            return False
+        self._last = signature
+        self.misses += 1
+        return True
+
+    def reset(self) -> None:
+        self._last = None
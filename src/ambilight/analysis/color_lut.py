@@ -0,0 +1,216 @@
+"""Color post-processing chain precompiled into a cached 3D lookup table."""
+
+from __future__ import annotations
+
+import colorsys
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+from ambilight.analysis.dark_detector import LUMA_WEIGHTS
+
+RgbColor = Tuple[int, int, int]
+# Vectorised transform over an (N, 3) float array of normalised RGB values.
+ColorTransform = Callable[[np.ndarray], np.ndarray]
+
+LUT_SIZE = 33
+# 48 hue steps put a grid point at each sixth of the hue circle.
+HUE_SIZE = 49
+# Finer saturation steps keep the boost's clamp within one level.
+SATURATION_SIZE = 65
+
+
+def rgb_to_hsv(rgb: np.ndarray) -> np.ndarray:
+    """Vectorised ``colorsys.rgb_to_hsv`` for an (N, 3) array in [0, 1]."""
+
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    delta = maxc - minc
+    safe_max = np.where(maxc > 0, maxc, 1.0)
+    safe_delta = np.where(delta > 0, delta, 1.0)
+    s = np.where(maxc > 0, delta / safe_max, 0.0)
+    rc = (maxc - rgb[:, 0]) / safe_delta
+    gc = (maxc - rgb[:, 1]) / safe_delta
+    bc = (maxc - rgb[:, 2]) / safe_delta
+    h = np.where(
+        rgb[:, 0] == maxc,
+        bc - gc,
+        np.where(rgb[:, 1] == maxc, 2.0 + rc - bc, 4.0 + gc - rc),
+    )
+    h = np.where(delta > 0, (h / 6.0) % 1.0, 0.0)
+    return np.stack([h, s, maxc], axis=1)
+
+
+def hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    """Vectorised ``colorsys.hsv_to_rgb`` for an (N, 3) array in [0, 1]."""
+
+    h, s, v = hsv[:, 0], hsv[:, 1], hsv[:, 2]
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+    choices_r = [v, q, p, p, t, v]
+    choices_g = [t, v, v, q, p, p]
+    choices_b = [p, p, t, v, v, q]
+    conditions = [i == k for k in range(6)]
+    return np.stack(
+        [
+            np.select(conditions, choices_r),
+            np.select(conditions, choices_g),
+            np.select(conditions, choices_b),
+        ],
+        axis=1,
+    )
+
+
+def saturation_boost(boost: float) -> ColorTransform:
+    def apply(rgb: np.ndarray) -> np.ndarray:
+        hsv = rgb_to_hsv(rgb)
+        hsv[:, 1] = np.minimum(1.0, hsv[:, 1] + boost)
+        return hsv_to_rgb(hsv)
+
+    return apply
+
+
+def gamma_correction(gamma: float) -> ColorTransform:
+    def apply(rgb: np.ndarray) -> np.ndarray:
+        return np.power(rgb, 1.0 / gamma)
+
+    return apply
+
+
+def white_balance(gains: Sequence[float]) -> ColorTransform:
+    def apply(rgb: np.ndarray) -> np.ndarray:
+        return np.clip(rgb * np.asarray(gains, dtype=np.float64), 0.0, 1.0)
+
+    return apply
+
+
+@dataclass(frozen=True, eq=False)
+class ColorLut:
+    """3D LUT for the color chain, indexed by hue, saturation and value.
+
+    Hue is undefined on the grey axis, so a table over RGB smears a
+    saturation boost across near-neutral colors. Over HSV the chain is
+    smooth: ``hsv_to_rgb`` is trilinear within each sixth of the hue circle,
+    and the hue axis starts a grid cell at every sixth, so only further
+    transforms (and the boost's clamp at full saturation) are approximated.
+    ``apply`` interpolates on a flat view of the table, which is cheaper than
+    NumPy indexing for one color; ``apply_many`` is the vectorised lookup.
+    """
+
+    table: np.ndarray
+    dark_threshold: float
+    _flat: memoryview = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        table = np.ascontiguousarray(self.table, dtype=np.float32)
+        object.__setattr__(self, "table", table)
+        object.__setattr__(self, "_flat", memoryview(table.ravel()))
+
+    def apply(self, color: RgbColor) -> RgbColor:
+        h, s, v = colorsys.rgb_to_hsv(
+            color[0] / 255.0, color[1] / 255.0, color[2] / 255.0
+        )
+        hue_cells, sat_cells, value_cells = (n - 1 for n in self.table.shape[:3])
+        ph, ps, pv = h * hue_cells, s * sat_cells, v * value_cells
+        ih = min(int(ph), hue_cells - 1)
+        is_ = min(int(ps), sat_cells - 1)
+        iv = min(int(pv), value_cells - 1)
+        fh, fs, fv = ph - ih, ps - is_, pv - iv
+        flat = self._flat
+        stride_v = 3
+        stride_s = (value_cells + 1) * stride_v
+        stride_h = (sat_cells + 1) * stride_s
+        base = ih * stride_h + is_ * stride_s + iv * stride_v
+        out = []
+        for c in range(3):
+            i = base + c
+            c00 = flat[i] + fv * (flat[i + stride_v] - flat[i])
+            i += stride_s
+            c01 = flat[i] + fv * (flat[i + stride_v] - flat[i])
+            i += stride_h - stride_s
+            c10 = flat[i] + fv * (flat[i + stride_v] - flat[i])
+            i += stride_s
+            c11 = flat[i] + fv * (flat[i + stride_v] - flat[i])
+            c0 = c00 + fs * (c01 - c00)
+            c1 = c10 + fs * (c11 - c10)
+            out.append(int(c0 + fh * (c1 - c0) + 0.5))
+        return (out[0], out[1], out[2])
+
+    def apply_many(self, colors: np.ndarray) -> np.ndarray:
+        """Map an (N, 3) array of RGB colors through the LUT."""
+
+        hsv = rgb_to_hsv(np.asarray(colors, dtype=np.float64) / 255.0)
+        cells = np.asarray(self.table.shape[:3]) - 1
+        scaled = hsv * cells
+        base = np.minimum(np.floor(scaled).astype(np.int64), cells - 1)
+        frac = scaled - base
+        out = np.zeros((scaled.shape[0], 3), dtype=np.float64)
+        for corner in range(8):
+            dh, ds, dv = (corner >> 2) & 1, (corner >> 1) & 1, corner & 1
+            weight = (
+                (frac[:, 0] if dh else 1.0 - frac[:, 0])
+                * (frac[:, 1] if ds else 1.0 - frac[:, 1])
+                * (frac[:, 2] if dv else 1.0 - frac[:, 2])
+            )
+            out += (
+                weight[:, None]
+                * self.table[base[:, 0] + dh, base[:, 1] + ds, base[:, 2] + dv]
+            )
+        return (out + 0.5).astype(np.uint8)
+
+    def is_dark(self, color: RgbColor) -> bool:
+        r, g, b = color
+        wr, wg, wb = LUMA_WEIGHTS
+        return (wr * r + wg * g + wb * b) / 255.0 <= self.dark_threshold
+
+
+def compile_lut(
+    transforms: Sequence[ColorTransform],
+    dark_threshold: float,
+    size: int = LUT_SIZE,
+    hue_size: int = HUE_SIZE,
+    saturation_size: int = SATURATION_SIZE,
+) -> ColorLut:
+    """Evaluate a transform chain on a hue x saturation x value grid."""
+
+    axes = (
+        np.linspace(0.0, 1.0, hue_size),
+        np.linspace(0.0, 1.0, saturation_size),
+        np.linspace(0.0, 1.0, size),
+    )
+    hsv = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+    # Grey has no hue; evaluate zero saturation as the limit from each hue's
+    # side, which is what near-grey colors of that hue interpolate towards.
+    hsv[:, 1] = np.maximum(hsv[:, 1], 1e-9)
+    rgb = hsv_to_rgb(hsv)
+    for transform in transforms:
+        rgb = transform(rgb)
+    table = (np.clip(rgb, 0.0, 1.0) * 255.0).reshape(hue_size, saturation_size, size, 3)
+    return ColorLut(table=table, dark_threshold=dark_threshold)
+
+
+@lru_cache(maxsize=8)
+def build_color_lut(
+    saturation: float,
+    dark_threshold: float,
+    gamma: float = 1.0,
+    gains: Tuple[float, float, float] = (1.0, 1.0, 1.0),
+    size: int = LUT_SIZE,
+) -> ColorLut:
+    """Return the cached LUT for a set of post-processing parameters."""
+
+    transforms = []
+    if saturation > 0.0:
+        transforms.append(saturation_boost(saturation))
+    if gamma != 1.0:
+        transforms.append(gamma_correction(gamma))
+    if gains != (1.0, 1.0, 1.0):
+        transforms.append(white_balance(gains))
+    return compile_lut(transforms, dark_threshold, size)
@@ -3,18 +3,31 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from ambilight.analysis.zone_stats import ZoneStats
 
 RgbColor = Tuple[int, int, int]
 
+# Rec. 709 luma coefficients.
+LUMA_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
 
 @dataclass
 class DarkDetector:
     """Detect dark scenes using a normalized luminance threshold."""
 
     threshold: float
+    min_dark_fraction: float = 0.8
 
     def is_dark(self, color: RgbColor) -> bool:
         r, g, b = color
-        luminance = (0.2126 * r + 0.7152 * g + 0.0722 * b) / 255.0
+        wr, wg, wb = LUMA_WEIGHTS
+        luminance = (wr * r + wg * g + wb * b) / 255.0
         return luminance <= self.threshold
+
+    def is_dark_zone(self, stats: "ZoneStats") -> bool:
+        """Return True when most of the zone is below the threshold."""
+
+        return stats.pixel_count > 0 and stats.dark_fraction >= self.min_dark_fraction
@@ -1,22 +1,48 @@
-"""Dominant color extraction using quantized palette."""
+"""Dominant color extraction using quantized palette or packed-RGB histograms."""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
 from PIL import Image
 
 RgbColor = Tuple[int, int, int]
 
+ENGINE_MEDIANCUT = "mediancut"
+ENGINE_HISTOGRAM = "histogram"
+DEFAULT_ENGINE = ENGINE_HISTOGRAM
+
+# Reduced-bit histogram: 4 bits per channel packed into a 12-bit bin index.
+HISTOGRAM_BITS = 4
+HISTOGRAM_BINS = 1 << (3 * HISTOGRAM_BITS)
+_SHIFT = 8 - HISTOGRAM_BITS
+
+# Max per-channel difference allowed between the histogram and mediancut engines
+# on zones with a clear dominant region.
+LEGACY_TOLERANCE = 16
+
 
 @dataclass(frozen=True)
 class DominantColorResult:
     rgb: RgbColor
 
 
-def dominant_color_rgb(pixels: "Image.Image | list | tuple | object") -> RgbColor:
-    """Return dominant color using palette quantization (no averaging)."""
+def dominant_color_rgb(
+    pixels: "Image.Image | list | tuple | object", engine: str = DEFAULT_ENGINE
+) -> RgbColor:
+    """Return dominant color of a zone crop (no averaging across the zone)."""
+
+    if engine == ENGINE_HISTOGRAM:
+        return dominant_color_histogram(pixels)
+    if engine == ENGINE_MEDIANCUT:
+        return dominant_color_mediancut(pixels)
+    raise ValueError(f"unknown dominant color engine: {engine}")
+
+
+def dominant_color_mediancut(pixels: "Image.Image | list | tuple | object") -> RgbColor:
+    """Return dominant color using PIL palette quantization (legacy engine)."""
 
     image = Image.fromarray(pixels).convert("RGB")
     quantized = image.quantize(colors=8, method=Image.MEDIANCUT)
@@ -27,3 +53,58 @@ def dominant_color_rgb(pixels: "Image.Image | list | tuple | object") -> RgbColo
     dominant_index = max(color_counts, key=lambda item: item[0])[1]
     base = dominant_index * 3
     return (palette[base], palette[base + 1], palette[base + 2])
+
+
+def dominant_color_histogram(pixels: np.ndarray) -> RgbColor:
+    """Return dominant color from a packed-RGB histogram.
+
+    Pixels are binned with ``HISTOGRAM_BITS`` per channel, the most populated
+    bin wins, and the result is the mean of the pixels that fell into it.
+    """
+
+    return histogram_dominant(pixels)[1]
+
+
+def histogram_dominant(pixels: np.ndarray) -> tuple[np.ndarray, RgbColor]:
+    """Return the zone's packed-RGB bin counts and its dominant color."""
+
+    rgb = as_rgb(pixels)
+    if rgb.size == 0:
+        return np.zeros(HISTOGRAM_BINS, dtype=np.int64), (0, 0, 0)
+    packed = pack_bins(rgb)
+    counts = np.bincount(packed.ravel(), minlength=HISTOGRAM_BINS)
+    winner = int(counts.argmax())
+    mask = packed == winner
+    sums = [rgb[..., channel][mask].sum(dtype=np.int64) for channel in range(3)]
+    return counts, refine_bin(sums, int(counts[winner]))
+
+
+def as_rgb(pixels: object) -> np.ndarray:
+    """Return an ``(H, W, 3)`` uint8 view of grayscale, RGB or RGBA pixels."""
+
+    array = np.asarray(pixels)
+    if array.dtype != np.uint8:
+        array = array.astype(np.uint8)
+    if array.ndim == 2:
+        return np.repeat(array[:, :, None], 3, axis=2)
+    return array[:, :, :3]
+
+
+def pack_bins(rgb: np.ndarray) -> np.ndarray:
+    """Pack reduced-bit RGB channels into a uint16 histogram bin index."""
+
+    packed = (rgb[..., 0] >> _SHIFT).astype(np.uint16)
+    packed <<= HISTOGRAM_BITS
+    packed |= rgb[..., 1] >> _SHIFT
+    packed <<= HISTOGRAM_BITS
+    packed |= rgb[..., 2] >> _SHIFT
+    return packed
+
+
+def refine_bin(channel_sums: "np.ndarray | list", count: int) -> RgbColor:
+    """Return the rounded mean color of a histogram bin."""
+
+    if count <= 0:
+        return (0, 0, 0)
+    r, g, b = (int((int(total) * 2 + count) // (2 * count)) for total in channel_sums)
+    return (r, g, b)
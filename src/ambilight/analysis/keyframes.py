@@ -0,0 +1,112 @@
+"""Pick the points of a smoothed color trajectory that a light fade must hit."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from ambilight.analysis.smoothing import Timestamp, to_ns
+from ambilight.state.output_state import delta_e
+
+RgbColor = Tuple[int, int, int]
+
+_NS_PER_MS = 1_000_000
+_NS_PER_SEC = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class Keyframe:
+    """Target state (``None`` = off) and the fade to reach it, in seconds."""
+
+    color: Optional[RgbColor]
+    transition_sec: float
+
+
+@dataclass
+class KeyframeSelector:
+    """Reduce a per-tick color stream to keyframes joined by linear fades.
+
+    Samples accumulate after the last keyframe (the anchor) as long as a
+    straight fade from the anchor to the newest sample stays within
+    ``tolerance`` (CIE76 delta E) of every sample in between. When it no
+    longer does, the previous sample ends the segment. A segment also ends
+    when the color stops moving, after ``max_segment_ms``, or as soon as it
+    moved ``max_step`` away from the anchor. Each keyframe's transition is
+    its segment's duration (at most ``max_segment_ms``), so the light
+    replays slow fades one segment late instead of stepping every tick.
+    Scene cuts (a ``max_step`` jump between two samples) and switching on
+    or off are steps.
+    """
+
+    tolerance: float = 2.0
+    max_step: float = 20.0
+    max_segment_ms: float = 500.0
+    _anchor: Optional[Tuple[int, Optional[RgbColor]]] = field(default=None, init=False)
+    _samples: List[Tuple[int, RgbColor]] = field(default_factory=list, init=False)
+
+    def reset(self) -> None:
+        self._anchor = None
+        self._samples = []
+
+    def update(
+        self, color: Optional[RgbColor], timestamp: Timestamp
+    ) -> Optional[Keyframe]:
+        """Feed one sample; returns a keyframe when one should be sent now."""
+
+        ts = to_ns(timestamp)
+        if self._anchor is None or color is None or self._anchor[1] is None:
+            if (
+                self._anchor is not None
+                and not self._samples
+                and color == self._anchor[1]
+            ):
+                return None
+            return self._emit(ts, color, ts)
+        anchor_ts, anchor_color = self._anchor
+        previous = self._samples[-1] if self._samples else None
+        self._samples.append((ts, color))
+        if previous is not None and previous[1] == color:
+            # Settled: the fade ends where the trajectory stopped moving.
+            if color == anchor_color:
+                self._anchor = (ts, color)
+                self._samples = []
+                return None
+            return self._emit(previous[0], color, anchor_ts)
+        last_color = anchor_color if previous is None else previous[1]
+        if delta_e(color, last_color) >= self.max_step:
+            # Scene cut: step to it rather than fading over the segment so far.
+            return self._emit(ts, color, ts)
+        if delta_e(color, anchor_color) >= self.max_step:
+            return self._emit(ts, color, anchor_ts)
+        if previous is not None and not self._is_linear(
+            anchor_ts, anchor_color, ts, color
+        ):
+            keyframe = self._emit(previous[0], previous[1], anchor_ts)
+            self._samples = [(ts, color)]
+            return keyframe
+        if ts - anchor_ts >= self.max_segment_ms * _NS_PER_MS:
+            return self._emit(ts, color, anchor_ts)
+        return None
+
+    def _is_linear(
+        self, start_ts: int, start: RgbColor, end_ts: int, end: RgbColor
+    ) -> bool:
+        span = end_ts - start_ts
+        if span <= 0:
+            return True
+        for ts, color in self._samples[:-1]:
+            share = (ts - start_ts) / span
+            faded = tuple(
+                round(a + (b - a) * share) for a, b in zip(start, end, strict=True)
+            )
+            if delta_e(color, faded) > self.tolerance:
+                return False
+        return True
+
+    def _emit(self, ts: int, color: Optional[RgbColor], anchor_ts: int) -> Keyframe:
+        self._anchor = (ts, color)
+        self._samples = []
+        if color is None:
+            return Keyframe(None, 0.0)
+        transition = min(ts - anchor_ts, self.max_segment_ms * _NS_PER_MS) / _NS_PER_SEC
+        return Keyframe(color, round(transition, 3))
@@ -0,0 +1,123 @@
+"""Batched histogram analysis of many zones from one frame read."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import (
+    HISTOGRAM_BINS,
+    as_rgb,
+    pack_bins,
+    refine_bin,
+)
+from ambilight.state.zone_state import DisplayBounds, ZoneRect
+
+RgbColor = Tuple[int, int, int]
+
+
+@dataclass
+class MultiZoneAnalyzer:
+    """Histogram N possibly overlapping zones, binning each pixel only once.
+
+    The frame is cut once per frame shape into rectangular cells covered by
+    the same set of zones. Each cell is histogrammed once and a zone's
+    histogram is the sum of its cells, so overlapping pixels are not re-binned
+    and all zones come from the same frame read.
+    """
+
+    zones: Sequence[ZoneRect]
+    _shape: Optional[tuple[int, int]] = field(default=None, init=False)
+    _cells: List[tuple[slice, slice, Tuple[int, ...]]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    # Indices of the cells that make up each zone.
+    _zone_cells: List[List[int]] = field(default_factory=list, init=False, repr=False)
+
+    def analyse(self, pixels: np.ndarray) -> List[tuple[np.ndarray, RgbColor]]:
+        """Return ``(bin_counts, dominant_color)`` for each zone, in order."""
+
+        rgb = as_rgb(pixels)
+        if self._shape != rgb.shape[:2]:
+            self._build(rgb.shape[:2])
+        blocks = [rgb[rows, cols] for rows, cols, _ in self._cells]
+        packed = [pack_bins(block).ravel() for block in blocks]
+        cell_counts = [
+            np.bincount(cell_bins, minlength=HISTOGRAM_BINS) for cell_bins in packed
+        ]
+        zone_counts = []
+        for cells in self._zone_cells:
+            counts = cell_counts[cells[0]]
+            for index in cells[1:]:
+                counts = counts + cell_counts[index]
+            zone_counts.append(counts)
+        winners = [int(counts.argmax()) for counts in zone_counts]
+
+        # Channel sums of each cell's pixels in the winning bins of its zones.
+        cell_sums: Dict[tuple[int, int], List[int]] = {}
+        for index, (_, _, members) in enumerate(self._cells):
+            block = blocks[index]
+            for winner in {winners[zone] for zone in members}:
+                mask = (packed[index] == winner).reshape(block.shape[:2])
+                cell_sums[index, winner] = [
+                    int(block[..., c][mask].sum()) for c in range(3)
+                ]
+
+        results = []
+        for zone, winner in enumerate(winners):
+            totals = [0, 0, 0]
+            for index in self._zone_cells[zone]:
+                sums = cell_sums[index, winner]
+                totals = [t + s for t, s in zip(totals, sums, strict=True)]
+            counts = zone_counts[zone]
+            results.append((counts, refine_bin(totals, int(counts[winner]))))
+        return results
+
+    def _build(self, shape: tuple[int, int]) -> None:
+        bounds = DisplayBounds(width=shape[1], height=shape[0])
+        rects = [zone.clamp_to_bounds(bounds) for zone in self.zones]
+        xs = sorted(
+            {0, shape[1], *(r.x for r in rects), *(r.x + r.width for r in rects)}
+        )
+        ys = sorted(
+            {0, shape[0], *(r.y for r in rects), *(r.y + r.height for r in rects)}
+        )
+        # Grid cells of equal membership, merged along rows and then down columns.
+        cells: List[tuple[slice, slice, Tuple[int, ...]]] = []
+        open_spans: Dict[tuple[int, int, Tuple[int, ...]], List[int]] = {}
+        for top, bottom in zip(ys, ys[1:], strict=False):
+            runs: List[List] = []
+            for left, right in zip(xs, xs[1:], strict=False):
+                members = tuple(
+                    i
+                    for i, r in enumerate(rects)
+                    if r.x <= left
+                    and right <= r.x + r.width
+                    and r.y <= top
+                    and bottom <= r.y + r.height
+                )
+                if runs and runs[-1][2] == members:
+                    runs[-1][1] = right
+                else:
+                    runs.append([left, right, members])
+            for left, right, members in runs:
+                if not members:
+                    continue
+                span = open_spans.get((left, right, members))
+                if span is not None and span[1] == top:
+                    span[1] = bottom
+                    continue
+                if span is not None:
+                    cells.append((slice(*span), slice(left, right), members))
+                open_spans[left, right, members] = [top, bottom]
+        for (left, right, members), span in open_spans.items():
+            cells.append((slice(*span), slice(left, right), members))
+        zone_cells: List[List[int]] = [[] for _ in rects]
+        for index, (_, _, members) in enumerate(cells):
+            for member in members:
+                zone_cells[member].append(index)
+        self._cells = cells
+        self._zone_cells = zone_cells
+        self._shape = shape
@@ -1,36 +1,225 @@
-"""Temporal smoothing with a fixed 150 ms window."""
+"""Temporal smoothing filters sharing an ``update(color, timestamp)`` interface.
+
+Timestamps are integer monotonic nanoseconds (``time.monotonic_ns()``);
+``datetime`` values are still accepted and converted.
+"""
 
 from __future__ import annotations
 
+import math
 from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Deque, Tuple
+from datetime import UTC, datetime
+from typing import Deque, List, Optional, Protocol, Tuple, Union
 
 RgbColor = Tuple[int, int, int]
+Timestamp = Union[int, datetime]
+
+SMOOTHING_WINDOW = "window"
+SMOOTHING_EMA = "ema"
+SMOOTHING_ONE_EURO = "one_euro"
+SMOOTHING_KALMAN = "kalman"
+SMOOTHING_MODES = (
+    SMOOTHING_WINDOW,
+    SMOOTHING_EMA,
+    SMOOTHING_ONE_EURO,
+    SMOOTHING_KALMAN,
+)
+
+_NS_PER_MS = 1_000_000
+_NS_PER_SEC = 1_000_000_000
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def to_ns(timestamp: Timestamp) -> int:
+    """Return a timestamp as integer nanoseconds."""
+
+    if isinstance(timestamp, datetime):
+        epoch = _EPOCH_UTC if timestamp.tzinfo is not None else _EPOCH
+        delta = timestamp - epoch
+        return (
+            delta.days * 86_400 + delta.seconds
+        ) * _NS_PER_SEC + delta.microseconds * 1000
+    return int(timestamp)
+
+
+def _clamp_color(values: List[float]) -> RgbColor:
+    r, g, b = (min(255, max(0, int(round(v)))) for v in values)
+    return (r, g, b)
+
+
+class SmoothingFilter(Protocol):
+    """Interface shared by all smoothing filters."""
+
+    def update(self, color: RgbColor, timestamp: Timestamp) -> RgbColor:
+        """Add a sample and return the smoothed color."""
+
+    def reset(self) -> None:
+        """Drop filter state."""
 
 
 @dataclass
 class SmoothingFilter150ms:
-    """Fixed temporal smoothing filter with a 150 ms window."""
+    """Fixed temporal smoothing filter with a 150 ms window.
+
+    Keeps running channel sums so each update is amortised O(1).
+    """
 
     window_ms: int = 150
-    _samples: Deque[tuple[datetime, RgbColor]] = field(default_factory=deque)
+    _samples: Deque[tuple[int, RgbColor]] = field(default_factory=deque)
+    _totals: List[int] = field(default_factory=lambda: [0, 0, 0])
 
-    def update(self, color: RgbColor, timestamp: datetime) -> RgbColor:
-        self._samples.append((timestamp, color))
-        cutoff = timestamp - timedelta(milliseconds=self.window_ms)
-        while self._samples and self._samples[0][0] < cutoff:
-            self._samples.popleft()
+    def update(self, color: RgbColor, timestamp: Timestamp) -> RgbColor:
+        ts = to_ns(timestamp)
+        self._samples.append((ts, color))
+        totals = self._totals
+        totals[0] += color[0]
+        totals[1] += color[1]
+        totals[2] += color[2]
+        cutoff = ts - self.window_ms * _NS_PER_MS
+        while self._samples[0][0] < cutoff:
+            _, old = self._samples.popleft()
+            totals[0] -= old[0]
+            totals[1] -= old[1]
+            totals[2] -= old[2]
         return self._average()
 
+    def reset(self) -> None:
+        self._samples.clear()
+        self._totals = [0, 0, 0]
+
     def _average(self) -> RgbColor:
-        if not self._samples:
-            return (0, 0, 0)
-        total = [0, 0, 0]
-        for _, color in self._samples:
-            total[0] += color[0]
-            total[1] += color[1]
-            total[2] += color[2]
         count = len(self._samples)
+        if not count:
+            return (0, 0, 0)
+        total = self._totals
         return (total[0] // count, total[1] // count, total[2] // count)
+
+
+@dataclass
+class EmaFilter:
+    """Exponential moving average with a time constant independent of frame rate."""
+
+    time_constant_ms: float = 60.0
+    _state: Optional[List[float]] = None
+    _last_ts: int = 0
+
+    def update(self, color: RgbColor, timestamp: Timestamp) -> RgbColor:
+        ts = to_ns(timestamp)
+        if self._state is None:
+            self._state = [float(c) for c in color]
+        else:
+            dt_ms = max(0, ts - self._last_ts) / _NS_PER_MS
+            alpha = 1.0 - math.exp(-dt_ms / self.time_constant_ms)
+            self._state = [
+                s + alpha * (c - s) for s, c in zip(self._state, color, strict=True)
+            ]
+        self._last_ts = ts
+        return _clamp_color(self._state)
+
+    def reset(self) -> None:
+        self._state = None
+
+
+@dataclass
+class OneEuroFilter:
+    """One-Euro filter: low cutoff when steady, higher cutoff on fast changes.
+
+    ``min_cutoff`` and ``d_cutoff`` are in Hz, ``beta`` scales the cutoff with
+    the speed of change in color units per second.
+    """
+
+    min_cutoff: float = 1.5
+    beta: float = 0.02
+    d_cutoff: float = 1.0
+    _value: Optional[List[float]] = None
+    _speed: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    _last_ts: int = 0
+
+    def update(self, color: RgbColor, timestamp: Timestamp) -> RgbColor:
+        ts = to_ns(timestamp)
+        if self._value is None or ts <= self._last_ts:
+            if self._value is None:
+                self._value = [float(c) for c in color]
+            self._last_ts = ts
+            return _clamp_color(self._value)
+        dt = (ts - self._last_ts) / _NS_PER_SEC
+        self._last_ts = ts
+        speed_alpha = self._alpha(self.d_cutoff, dt)
+        for i in range(3):
+            raw_speed = (color[i] - self._value[i]) / dt
+            self._speed[i] += speed_alpha * (raw_speed - self._speed[i])
+            cutoff = self.min_cutoff + self.beta * abs(self._speed[i])
+            self._value[i] += self._alpha(cutoff, dt) * (color[i] - self._value[i])
+        return _clamp_color(self._value)
+
+    def reset(self) -> None:
+        self._value = None
+        self._speed = [0.0, 0.0, 0.0]
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+
+@dataclass
+class KalmanFilter:
+    """Per-channel constant-velocity Kalman filter.
+
+    ``process_noise`` is the acceleration variance (units/s^2)^2 and
+    ``measurement_noise`` the sample variance in color units squared.
+    """
+
+    process_noise: float = 2.0e6
+    measurement_noise: float = 60.0
+    _state: Optional[List[List[float]]] = None
+    _last_ts: int = 0
+
+    def update(self, color: RgbColor, timestamp: Timestamp) -> RgbColor:
+        ts = to_ns(timestamp)
+        if self._state is None:
+            # Per channel: position, velocity, P00, P01, P11.
+            self._state = [
+                [float(c), 0.0, self.measurement_noise, 0.0, 1.0e4] for c in color
+            ]
+            self._last_ts = ts
+            return _clamp_color([s[0] for s in self._state])
+        dt = max(0, ts - self._last_ts) / _NS_PER_SEC
+        self._last_ts = ts
+        q = self.process_noise
+        r = self.measurement_noise
+        for channel, measured in zip(self._state, color, strict=True):
+            pos, vel, p00, p01, p11 = channel
+            pos += vel * dt
+            p00 += dt * (2.0 * p01 + dt * p11) + q * dt**4 / 4.0
+            p01 += dt * p11 + q * dt**3 / 2.0
+            p11 += q * dt**2
+            gain_pos = p00 / (p00 + r)
+            gain_vel = p01 / (p00 + r)
+            residual = measured - pos
+            pos += gain_pos * residual
+            vel += gain_vel * residual
+            p11 -= gain_vel * p01
+            p01 -= gain_vel * p00
+            p00 -= gain_pos * p00
+            channel[:] = [pos, vel, p00, p01, p11]
+        return _clamp_color([s[0] for s in self._state])
+
+    def reset(self) -> None:
+        self._state = None
+
+
+def create_smoothing_filter(mode: str = SMOOTHING_WINDOW) -> SmoothingFilter:
+    """Return a new smoothing filter for a configured mode."""
+
+    if mode == SMOOTHING_WINDOW:
+        return SmoothingFilter150ms()
+    if mode == SMOOTHING_EMA:
+        return EmaFilter()
+    if mode == SMOOTHING_ONE_EURO:
+        return OneEuroFilter()
+    if mode == SMOOTHING_KALMAN:
+        return KalmanFilter()
+    raise ValueError(f"unknown smoothing mode: {mode}")
@@ -0,0 +1,106 @@
+"""Incremental zone histogram built from cached per-tile histograms."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import (
+    HISTOGRAM_BINS,
+    as_rgb,
+    pack_bins,
+    refine_bin,
+)
+
+RgbColor = Tuple[int, int, int]
+
+
+@dataclass
+class TileHistogram:
+    """Keep a packed-RGB histogram per tile and re-bin only tiles that changed.
+
+    ``update`` follows the ``dominant_color_rgb`` contract and returns the same
+    color as the ``histogram`` engine for the whole zone.
+    """
+
+    tile_size: int = 128
+    tiles_recomputed: int = 0
+    tiles_reused: int = 0
+    _previous: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _tile_counts: np.ndarray = field(init=False, repr=False)
+    _tile_sums: np.ndarray = field(init=False, repr=False)
+    _counts: np.ndarray = field(init=False, repr=False)
+    _sums: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._reset((0, 0))
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Merged zone histogram (read-only view)."""
+
+        view = self._counts.view()
+        view.flags.writeable = False
+        return view
+
+    def update(self, pixels: np.ndarray) -> RgbColor:
+        rgb = as_rgb(pixels)
+        if rgb.size == 0:
+            return (0, 0, 0)
+        if self._previous is None or self._previous.shape != rgb.shape:
+            self._reset(rgb.shape[:2])
+            dirty = np.ones(self._tile_counts.shape[:2], dtype=bool)
+            self._previous = np.empty_like(rgb)
+        else:
+            dirty = self._dirty_tiles(rgb)
+
+        size = self.tile_size
+        for ty, tx in zip(*np.nonzero(dirty), strict=True):
+            rows = slice(ty * size, (ty + 1) * size)
+            cols = slice(tx * size, (tx + 1) * size)
+            tile = rgb[rows, cols]
+            self._previous[rows, cols] = tile
+            self._rebin(ty, tx, tile)
+        recomputed = int(dirty.sum())
+        self.tiles_recomputed += recomputed
+        self.tiles_reused += dirty.size - recomputed
+
+        winner = int(self._counts.argmax())
+        return refine_bin(self._sums[winner], int(self._counts[winner]))
+
+    def _reset(self, shape: tuple[int, int]) -> None:
+        rows = -(-shape[0] // self.tile_size)
+        cols = -(-shape[1] // self.tile_size)
+        self._previous = None
+        # Per-tile sums fit in int32 for tiles up to 2**23 pixels.
+        self._tile_counts = np.zeros((rows, cols, HISTOGRAM_BINS), dtype=np.int32)
+        self._tile_sums = np.zeros((rows, cols, HISTOGRAM_BINS, 3), dtype=np.int32)
+        self._counts = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        self._sums = np.zeros((HISTOGRAM_BINS, 3), dtype=np.int64)
+
+    def _dirty_tiles(self, rgb: np.ndarray) -> np.ndarray:
+        height, width = rgb.shape[:2]
+        changed = (rgb != self._previous).reshape(height, width * 3)
+        starts_y = np.arange(0, height, self.tile_size)
+        starts_x = np.arange(0, width, self.tile_size) * 3
+        per_row = np.logical_or.reduceat(changed, starts_y, axis=0)
+        return np.logical_or.reduceat(per_row, starts_x, axis=1)
+
+    def _rebin(self, ty: int, tx: int, tile: np.ndarray) -> None:
+        packed = pack_bins(tile).ravel()
+        counts = np.bincount(packed, minlength=HISTOGRAM_BINS)
+        sums = np.stack(
+            [
+                np.bincount(
+                    packed, weights=tile[..., channel].ravel(), minlength=HISTOGRAM_BINS
+                )
+                for channel in range(3)
+            ],
+            axis=1,
+        ).astype(np.int64)
+        self._counts += counts - self._tile_counts[ty, tx]
+        self._sums += sums - self._tile_sums[ty, tx]
+        self._tile_counts[ty, tx] = counts
+        self._tile_sums[ty, tx] = sums
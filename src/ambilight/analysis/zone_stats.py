@@ -0,0 +1,102 @@
+"""Zone statistics derived from a single packed-RGB histogram pass."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from ambilight.analysis.color_lut import rgb_to_hsv
+from ambilight.analysis.dark_detector import LUMA_WEIGHTS
+from ambilight.analysis.dominant_color import (
+    HISTOGRAM_BINS,
+    HISTOGRAM_BITS,
+    histogram_dominant,
+)
+
+RgbColor = Tuple[int, int, int]
+
+# Coarse histogram: 2 bits per channel (64 bins) folded from the full histogram.
+COARSE_BITS = 2
+COARSE_BINS = 1 << (3 * COARSE_BITS)
+
+
+def _bin_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    levels = 1 << HISTOGRAM_BITS
+    index = np.arange(HISTOGRAM_BINS)
+    high = np.stack(
+        [
+            index >> (2 * HISTOGRAM_BITS),
+            (index >> HISTOGRAM_BITS) & (levels - 1),
+            index & (levels - 1),
+        ],
+        axis=1,
+    )
+    step = 256 // levels
+    centers = (high * step + step // 2) / 255.0
+    luminance = centers @ np.asarray(LUMA_WEIGHTS)
+    saturation = rgb_to_hsv(centers)[:, 1]
+    drop = HISTOGRAM_BITS - COARSE_BITS
+    coarse = high >> drop
+    coarse_index = (
+        (coarse[:, 0] << (2 * COARSE_BITS))
+        | (coarse[:, 1] << COARSE_BITS)
+        | coarse[:, 2]
+    )
+    return luminance, saturation, coarse_index
+
+
+_BIN_LUMINANCE, _BIN_SATURATION, _BIN_COARSE = _bin_tables()
+
+
+@dataclass(frozen=True)
+class ZoneStats:
+    """Compact per-frame summary of a zone.
+
+    Luminance, dark fraction and saturation are evaluated at histogram bin
+    centres, so they are accurate to the bin width (1/16 of the range).
+    """
+
+    dominant_rgb: RgbColor
+    mean_luminance: float
+    dark_fraction: float
+    saturation_spread: float
+    coarse_histogram: Tuple[int, ...]
+    pixel_count: int
+
+
+def compute_zone_stats(pixels: np.ndarray, dark_threshold: float) -> ZoneStats:
+    """Return zone statistics from one histogram pass over ``pixels``."""
+
+    counts, dominant = histogram_dominant(pixels)
+    return zone_stats_from_histogram(counts, dominant, dark_threshold)
+
+
+def zone_stats_from_histogram(
+    counts: np.ndarray, dominant: RgbColor, dark_threshold: float
+) -> ZoneStats:
+    """Derive zone statistics from packed-RGB bin counts."""
+
+    total = int(counts.sum())
+    if total == 0:
+        return ZoneStats(
+            dominant_rgb=dominant,
+            mean_luminance=0.0,
+            dark_fraction=0.0,
+            saturation_spread=0.0,
+            coarse_histogram=(0,) * COARSE_BINS,
+            pixel_count=0,
+        )
+    weights = counts / total
+    mean_saturation = float(weights @ _BIN_SATURATION)
+    variance = float(weights @ (_BIN_SATURATION - mean_saturation) ** 2)
+    coarse = np.bincount(_BIN_COARSE, weights=counts, minlength=COARSE_BINS)
+    return ZoneStats(
+        dominant_rgb=dominant,
+        mean_luminance=float(weights @ _BIN_LUMINANCE),
+        dark_fraction=float(weights[_BIN_LUMINANCE <= dark_threshold].sum()),
+        saturation_spread=variance**0.5,
+        coarse_histogram=tuple(int(c) for c in coarse),
+        pixel_count=total,
+    )
@@ -0,0 +1,172 @@
+"""Area-average downscaling into reusable buffers.
+
+Integer factors use a box filter over strided slices. Other factors use a
+separable area average: each output pixel is a weighted sum of the few
+source pixels its footprint overlaps. Every intermediate array lives in a
+per-shape plan and outputs rotate through a small pool, so steady-state
+resizing does not allocate.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+Shape = Tuple[int, ...]
+
+
+@dataclass
+class BufferPool:
+    """Rotate through ``count`` preallocated arrays of one shape.
+
+    A returned buffer is overwritten ``count`` calls later, so consumers must
+    finish with (or copy) a frame before then. The pool reallocates only when
+    the requested shape changes.
+    """
+
+    count: int = 3
+    allocations: int = 0
+    _shape: Optional[Shape] = field(default=None, init=False)
+    _buffers: List[np.ndarray] = field(default_factory=list, init=False)
+    _next: int = field(default=0, init=False)
+
+    def take(self, shape: Shape, dtype: np.dtype = np.uint8) -> np.ndarray:
+        if shape != self._shape or self._buffers[0].dtype != dtype:
+            self._buffers = [np.empty(shape, dtype=dtype) for _ in range(self.count)]
+            self._shape = shape
+            self.allocations += self.count
+        buffer = self._buffers[self._next]
+        self._next = (self._next + 1) % self.count
+        return buffer
+
+
+class _BoxPlan:
+    """Integer factors: sum strided slices per axis in uint16, then round-divide."""
+
+    def __init__(self, src: Shape, size: Tuple[int, int]) -> None:
+        width, height = size
+        self.factor_y = src[0] // height
+        self.factor_x = src[1] // width
+        self.shape = (height, width, src[2])
+        # uint16 holds a sum of 256 uint8 samples plus the rounding half (65408).
+        dtype = np.uint16 if self.factor_x * self.factor_y <= 256 else np.uint32
+        self.cols = np.empty((src[0], width, src[2]), dtype=dtype)
+        self.acc = np.empty(self.shape, dtype=dtype)
+        self.area = self.factor_y * self.factor_x
+
+    def run(self, src: np.ndarray, out: np.ndarray) -> None:
+        fx, fy = self.factor_x, self.factor_y
+        np.copyto(self.cols, src[:, 0::fx], casting="unsafe")
+        for k in range(1, fx):
+            np.add(self.cols, src[:, k::fx], out=self.cols)
+        np.copyto(self.acc, self.cols[0::fy], casting="unsafe")
+        for k in range(1, fy):
+            np.add(self.acc, self.cols[k::fy], out=self.acc)
+        self.acc += self.area // 2
+        self.acc //= self.area
+        np.copyto(out, self.acc, casting="unsafe")
+
+
+def _taps(source: int, target: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """Source indices and area weights of each output pixel, one array per tap."""
+
+    ratio = source / target
+    starts = np.arange(target) * ratio
+    ends = starts + ratio
+    first = np.floor(starts).astype(np.intp)
+    count = int(np.ceil(ratio)) + 1
+    indices, weights = [], []
+    for k in range(count):
+        pixel = first + k
+        overlap = np.clip(
+            np.minimum(ends, pixel + 1) - np.maximum(starts, pixel), 0.0, None
+        )
+        if not overlap.any():
+            continue
+        indices.append(np.minimum(pixel, source - 1))
+        weights.append((overlap / ratio).astype(np.float32))
+    return indices, weights
+
+
+class _AreaPlan:
+    """Fractional factors: separable area average with a few weighted taps per axis.
+
+    Rows are resampled first because gathering whole rows is a contiguous copy;
+    the column pass then runs on the already reduced height.
+    """
+
+    def __init__(self, src: Shape, size: Tuple[int, int]) -> None:
+        width, height = size
+        src_h, src_w, channels = src
+        self.shape = (height, width, channels)
+        self.y_index, y_weights = _taps(src_h, height)
+        self.x_index, x_weights = _taps(src_w, width)
+        self.y_weights = [w[:, None, None] for w in y_weights]
+        # Repeated per channel so the multiply runs over contiguous memory.
+        self.x_weights = [
+            np.repeat(w, channels).reshape(1, width, channels) for w in x_weights
+        ]
+        self.gather_rows = np.empty((height, src_w, channels), dtype=np.uint8)
+        self.term_rows = np.empty((height, src_w, channels), dtype=np.float32)
+        self.rows = np.empty((height, src_w, channels), dtype=np.float32)
+        self.gather_cols = np.empty(self.shape, dtype=np.float32)
+        self.result = np.empty(self.shape, dtype=np.float32)
+        # Whole pixels as opaque records, so column gathers move one item per pixel.
+        self._pixel = np.dtype((np.void, channels * 4))
+
+    def run(self, src: np.ndarray, out: np.ndarray) -> None:
+        for k, (index, weight) in enumerate(
+            zip(self.y_index, self.y_weights, strict=True)
+        ):
+            np.take(src, index, axis=0, out=self.gather_rows, mode="clip")
+            target = self.rows if k == 0 else self.term_rows
+            np.multiply(self.gather_rows, weight, out=target)
+            if k:
+                self.rows += self.term_rows
+
+        rows = self.rows.view(self._pixel)[..., 0]
+        gathered = self.gather_cols.view(self._pixel)[..., 0]
+        for k, (index, weight) in enumerate(
+            zip(self.x_index, self.x_weights, strict=True)
+        ):
+            # mode="clip" writes straight into ``out``; "raise" buffers a copy.
+            np.take(rows, index, axis=1, out=gathered, mode="clip")
+            if k == 0:
+                np.multiply(self.gather_cols, weight, out=self.result)
+            else:
+                self.gather_cols *= weight
+                self.result += self.gather_cols
+        self.result += 0.5
+        np.clip(self.result, 0.0, 255.0, out=self.result)
+        np.copyto(out, self.result, casting="unsafe")
+
+
+class Downscaler:
+    """Resize RGB frames by area averaging into pooled output buffers."""
+
+    def __init__(self, pool_size: int = 3) -> None:
+        self.pool = BufferPool(count=pool_size)
+        self._plans: Dict[Tuple[Shape, Tuple[int, int]], object] = {}
+
+    def resize(self, src: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+        """Return ``src`` scaled to ``size`` = (width, height); never upscales."""
+
+        width, height = size
+        if (width, height) == (src.shape[1], src.shape[0]):
+            return src
+        if width > src.shape[1] or height > src.shape[0]:
+            raise ValueError("Downscaler cannot upscale")
+        key = (src.shape, size)
+        plan = self._plans.get(key)
+        if plan is None:
+            if self._plans:
+                # Zones change rarely; keep only the current geometry's scratch space.
+                self._plans.clear()
+            exact = src.shape[0] % height == 0 and src.shape[1] % width == 0
+            plan = _BoxPlan(src.shape, size) if exact else _AreaPlan(src.shape, size)
+            self._plans[key] = plan
+        out = self.pool.take(plan.shape)
+        plan.run(src, out)
+        return out
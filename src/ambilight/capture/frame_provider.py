@@ -4,15 +4,46 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Protocol
+from typing import Optional, Protocol, Sequence, Tuple
 
 import numpy as np
 
+from ambilight.state.zone_state import DisplayBounds, ZoneRect
+
 
 @dataclass(frozen=True)
 class Frame:
     pixels: np.ndarray
     timestamp: datetime
+    # When a provider returns only a region, ``origin`` is the position of
+    # ``pixels`` in the full frame and ``full_size`` the full (width, height).
+    origin: Tuple[int, int] = (0, 0)
+    full_size: Optional[Tuple[int, int]] = None
+    # Capture sequence number, increasing per distinct captured image, and the
+    # ``time.monotonic_ns()`` of that capture. ``seq == 0`` means unsequenced.
+    seq: int = 0
+    capture_ns: int = 0
+
+    @property
+    def bounds(self) -> DisplayBounds:
+        if self.full_size is not None:
+            return DisplayBounds(width=self.full_size[0], height=self.full_size[1])
+        return DisplayBounds(width=self.pixels.shape[1], height=self.pixels.shape[0])
+
+    def view(self, rect: ZoneRect) -> Optional[np.ndarray]:
+        """Return the pixels of a full-frame rectangle, or None if not captured."""
+
+        x = rect.x - self.origin[0]
+        y = rect.y - self.origin[1]
+        height, width = self.pixels.shape[:2]
+        if x < 0 or y < 0 or x + rect.width > width or y + rect.height > height:
+            return None
+        return self.pixels[y : y + rect.height, x : x + rect.width]
+
+    def is_newer_than(self, seq: int) -> bool:
+        """True unless this frame was already seen as ``seq``; unsequenced frames always are."""
+
+        return self.seq == 0 or self.seq > seq
 
 
 class FrameProvider(Protocol):
@@ -24,5 +55,21 @@ class FrameProvider(Protocol):
     def stop(self) -> None:
         """Stop capture."""
 
-    def get_frame(self) -> Frame | None:
-        """Fetch the latest frame or None if unavailable."""
+    def get_frame(self, since_seq: int = 0) -> Frame | None:
+        """Fetch the latest frame or None if unavailable.
+
+        When nothing new was captured after ``since_seq``, providers return the
+        previous frame again (same ``seq``) without re-processing it; callers
+        check ``Frame.is_newer_than`` to skip it.
+        """
+
+    def set_regions(self, regions: Sequence[ZoneRect]) -> None:
+        """Limit later frames to the bounding box of ``regions``.
+
+        Regions are in full-frame coordinates; an empty sequence restores full
+        frames. Providers that cannot capture a region crop with
+        ``ambilight.capture.regions.crop_frame`` before any further work.
+        """
+
+    def get_preview(self, max_width: int) -> Frame | None:
+        """Return a low-resolution rendition of the full frame for the preview."""
@@ -0,0 +1,176 @@
+"""Run a frame provider in a child process and read its frames from shared memory."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Optional, Sequence, Tuple
+
+from ambilight.capture.frame_provider import Frame, FrameProvider
+from ambilight.capture.regions import bounding_region, crop_frame, preview_rendition
+from ambilight.capture.shm_ring import SharedFrameRing
+from ambilight.state.zone_state import ZoneRect
+from ambilight.utils.logging import get_logger
+
+ProviderFactory = Callable[[], FrameProvider]
+
+
+def _capture_main(
+    factory: ProviderFactory,
+    display_id: int,
+    ring_name: str,
+    max_shape: Tuple[int, int],
+    slots: int,
+    target_fps: float,
+    stop_event,
+    ready_event,
+) -> None:
+    ring = SharedFrameRing.attach(ring_name, max_shape, slots)
+    provider = factory()
+    provider.start(display_id)
+    ready_event.set()
+    interval = 1.0 / target_fps if target_fps > 0 else 0.0
+    last_seq = 0
+    try:
+        while not stop_event.is_set():
+            started = time.perf_counter()
+            frame = provider.get_frame(last_seq)
+            fresh = frame is not None and frame.is_newer_than(last_seq)
+            if fresh:
+                # Repeats are not copied again; the reader keeps the last slot.
+                last_seq = frame.seq
+                ring.write(frame.pixels, frame.capture_ns or time.monotonic_ns())
+            elapsed = time.perf_counter() - started
+            stop_event.wait(max(interval - elapsed, 0.0 if fresh else 0.005))
+    finally:
+        provider.stop()
+        ring.close()
+
+
+class ProcessFrameProvider(FrameProvider):
+    """Capture in a separate process so driver stalls cannot block the controller.
+
+    The child writes each frame into a ``SharedFrameRing``; ``get_frame``
+    returns a read-only view of the newest slot without copying. A view stays
+    valid for at least ``slots - 1`` further captures, which at capture rate is
+    far longer than one analysis step. Frame ``seq`` is the ring sequence and
+    ``capture_ns`` the child's monotonic clock, which is system-wide. Once
+    the child has exited no frame is returned, so the controller reports
+    capture as disconnected. ``factory`` must be picklable (a class
+    or ``functools.partial``) because the child is started with ``spawn``.
+    """
+
+    def __init__(
+        self,
+        factory: ProviderFactory,
+        max_shape: Tuple[int, int] = (1080, 1920),
+        slots: int = 4,
+        target_fps: float = 60.0,
+        start_timeout: float = 10.0,
+    ) -> None:
+        self._factory = factory
+        self._max_shape = max_shape
+        self._slots = slots
+        self._target_fps = target_fps
+        self._start_timeout = start_timeout
+        self._ctx = mp.get_context("spawn")
+        self._ring: Optional[SharedFrameRing] = None
+        self._process = None
+        self._stop_event = None
+        self._region: Optional[ZoneRect] = None
+        self._latest: Optional[Frame] = None
+        self._logger = get_logger("ambilight.capture")
+
+    def start(self, display_id: int) -> None:
+        if self._process is not None:
+            return
+        self._ring = SharedFrameRing.create(self._max_shape, self._slots)
+        self._stop_event = self._ctx.Event()
+        ready = self._ctx.Event()
+        self._process = self._ctx.Process(
+            target=_capture_main,
+            args=(
+                self._factory,
+                display_id,
+                self._ring.name,
+                self._max_shape,
+                self._slots,
+                self._target_fps,
+                self._stop_event,
+                ready,
+            ),
+            name="ambilight-capture",
+            daemon=True,
+        )
+        self._process.start()
+        if not ready.wait(self._start_timeout):
+            self.stop()
+            raise RuntimeError("capture process failed to start")
+
+    def stop(self) -> None:
+        if self._process is not None:
+            # Setting the event waits for its sleepers to wake, and a child
+            # killed while waiting never does; only signal a live child.
+            if self._process.is_alive():
+                self._stop_event.set()
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._logger.warning("capture process did not exit; terminating")
+                self._process.terminate()
+                self._process.join(timeout=1.0)
+        self._process = None
+        self._latest = None
+        if self._ring is not None:
+            self._ring.close()
+        self._ring = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def set_regions(self, regions: Sequence[ZoneRect]) -> None:
+        # The child captures full frames; regions are cut from the ring view.
+        self._region = bounding_region(regions)
+
+    def get_frame(self, since_seq: int = 0) -> Frame | None:
+        latest = self._read()
+        return None if latest is None else crop_frame(latest, self._region)
+
+    def get_preview(self, max_width: int) -> Frame | None:
+        latest = self._read()
+        if latest is None:
+            return None
+        return replace(latest, pixels=preview_rendition(latest.pixels, max_width))
+
+    def _read(self) -> Optional[Frame]:
+        if self._ring is None:
+            return None
+        if not self._process.is_alive():
+            # A dead child publishes nothing; its last frame is not a live capture.
+            if self._latest is not None:
+                self._logger.warning(
+                    "capture process exited with code %s", self._process.exitcode
+                )
+                self._latest = None
+            return None
+        latest = self._latest
+        if latest is not None and self._ring.latest_seq == latest.seq:
+            # Nothing published since the cached frame: hand it back unchanged.
+            return latest
+        ring_frame = self._ring.read()
+        if ring_frame is None:
+            return None
+        pixels = ring_frame.pixels
+        pixels.flags.writeable = False
+        age_ns = max(0, time.monotonic_ns() - ring_frame.capture_ns)
+        latest = Frame(
+            pixels=pixels,
+            timestamp=datetime.utcnow() - timedelta(microseconds=age_ns / 1000),
+            seq=ring_frame.seq,
+            capture_ns=ring_frame.capture_ns,
+        )
+        self._latest = latest
+        return latest
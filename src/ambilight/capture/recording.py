@@ -0,0 +1,244 @@
+"""Frame recordings in a chunked memory-mapped file, and a provider replaying them.
+
+Layout: a 64-byte header followed by equally sized chunks. Each chunk holds
+a table of per-frame records (seq, capture_ns, height, width) and then
+``chunk_frames`` fixed-size RGB slots of ``max_height x max_width``. Frames
+smaller than a slot occupy its top-left corner. The file grows one chunk at
+a time, and both sides map it with ``np.memmap``, so writing is one copy per
+frame and replay copies nothing.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ambilight.capture.frame_provider import Frame, FrameProvider
+from ambilight.capture.regions import bounding_region, crop_frame, preview_rendition
+from ambilight.state.zone_state import ZoneRect
+
+MAGIC = b"AMBREC01"
+VERSION = 1
+_HEADER_BYTES = 64
+# Header words after the magic.
+_VERSION, _MAX_HEIGHT, _MAX_WIDTH, _CHUNK_FRAMES, _FRAME_COUNT = range(5)
+_RECORD_FIELDS = 4
+_SEQ, _CAPTURE_NS, _HEIGHT, _WIDTH = range(_RECORD_FIELDS)
+_ALIGN = 64
+
+
+def _chunk_layout(
+    max_shape: Tuple[int, int], chunk_frames: int
+) -> Tuple[int, int, int]:
+    """(table bytes, slot bytes, chunk bytes) for one chunk."""
+
+    table = -(-chunk_frames * _RECORD_FIELDS * 8 // _ALIGN) * _ALIGN
+    slot = max_shape[0] * max_shape[1] * 3
+    return table, slot, table + chunk_frames * slot
+
+
+class FrameRecorder:
+    """Append frames to a recording file; one memcpy per frame, no pickling."""
+
+    def __init__(
+        self, path: Path, max_shape: Tuple[int, int], chunk_frames: int = 64
+    ) -> None:
+        if chunk_frames < 1:
+            raise ValueError("chunk_frames must be positive")
+        self.path = Path(path)
+        self.max_shape = max_shape
+        self.chunk_frames = chunk_frames
+        self.frame_count = 0
+        self._table_bytes, self._slot_bytes, self._chunk_bytes = _chunk_layout(
+            max_shape, chunk_frames
+        )
+        with open(self.path, "wb") as handle:
+            handle.write(MAGIC)
+            handle.write(np.zeros(7, dtype=np.int64).tobytes())
+        self._header = np.memmap(
+            self.path, dtype=np.int64, mode="r+", offset=len(MAGIC), shape=(7,)
+        )
+        self._header[:5] = (VERSION, max_shape[0], max_shape[1], chunk_frames, 0)
+        self._records: Optional[np.ndarray] = None
+        self._slots: Optional[np.ndarray] = None
+
+    def write(self, frame: Frame) -> int:
+        """Store one frame; returns its index in the recording."""
+
+        height, width = frame.pixels.shape[:2]
+        if height > self.max_shape[0] or width > self.max_shape[1]:
+            raise ValueError(f"frame {width}x{height} exceeds recording slot size")
+        index = self.frame_count
+        offset = index % self.chunk_frames
+        if offset == 0:
+            self._map_chunk(index // self.chunk_frames)
+        self._slots[offset, :height, :width] = frame.pixels
+        capture_ns = frame.capture_ns or time.monotonic_ns()
+        self._records[offset] = (frame.seq, capture_ns, height, width)
+        self.frame_count = index + 1
+        # Publish the count last so a concurrent reader never sees a partial frame.
+        self._header[_FRAME_COUNT] = self.frame_count
+        return index
+
+    def close(self) -> None:
+        for array in (self._records, self._slots, self._header):
+            if array is not None:
+                array.flush()
+        self._records = self._slots = None
+
+    def _map_chunk(self, chunk: int) -> None:
+        if self._slots is not None:
+            self._records.flush()
+            self._slots.flush()
+        start = _HEADER_BYTES + chunk * self._chunk_bytes
+        with open(self.path, "r+b") as handle:
+            handle.truncate(start + self._chunk_bytes)
+        self._records = np.memmap(
+            self.path,
+            dtype=np.int64,
+            mode="r+",
+            offset=start,
+            shape=(self.chunk_frames, _RECORD_FIELDS),
+        )
+        self._slots = np.memmap(
+            self.path,
+            dtype=np.uint8,
+            mode="r+",
+            offset=start + self._table_bytes,
+            shape=(self.chunk_frames, *self.max_shape, 3),
+        )
+
+    def __enter__(self) -> "FrameRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FrameRecording:
+    """Read-only view of a recording file; frames are views into the mapping."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(data[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{self.path} is not a frame recording")
+        header = data[len(MAGIC) : _HEADER_BYTES].view(np.int64)
+        if int(header[_VERSION]) != VERSION:
+            raise ValueError(f"unsupported recording version {int(header[_VERSION])}")
+        self.max_shape = (int(header[_MAX_HEIGHT]), int(header[_MAX_WIDTH]))
+        self.chunk_frames = int(header[_CHUNK_FRAMES])
+        table_bytes, _, chunk_bytes = _chunk_layout(self.max_shape, self.chunk_frames)
+        chunks = (data.size - _HEADER_BYTES) // chunk_bytes
+        self._records: List[np.ndarray] = []
+        self._slots: List[np.ndarray] = []
+        for chunk in range(chunks):
+            start = _HEADER_BYTES + chunk * chunk_bytes
+            table = data[start : start + table_bytes].view(np.int64)
+            records = table[: self.chunk_frames * _RECORD_FIELDS]
+            self._records.append(records.reshape(self.chunk_frames, _RECORD_FIELDS))
+            slots = data[start + table_bytes : start + chunk_bytes]
+            self._slots.append(slots.reshape(self.chunk_frames, *self.max_shape, 3))
+        self.frame_count = min(int(header[_FRAME_COUNT]), chunks * self.chunk_frames)
+        self._data = data
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def capture_times_ns(self) -> np.ndarray:
+        """Recorded capture time of every frame, for pacing replay."""
+
+        if not self.frame_count:
+            return np.zeros(0, dtype=np.int64)
+        times = np.concatenate([records[:, _CAPTURE_NS] for records in self._records])
+        return times[: self.frame_count]
+
+    def pixels(self, index: int) -> np.ndarray:
+        if not 0 <= index < self.frame_count:
+            raise IndexError(index)
+        chunk, offset = divmod(index, self.chunk_frames)
+        record = self._records[chunk][offset]
+        return self._slots[chunk][offset, : int(record[_HEIGHT]), : int(record[_WIDTH])]
+
+
+class ReplayFrameProvider(FrameProvider):
+    """Serve a recording as if it were a live display.
+
+    ``speed=1.0`` paces frames by their recorded capture times (``2.0`` plays
+    twice as fast); ``speed=0`` advances one frame per ``get_frame`` call.
+    Frames are read-only views into the file mapping. At the end of the
+    recording ``get_frame`` returns None unless ``loop`` is set.
+    """
+
+    def __init__(self, path: Path, speed: float = 1.0, loop: bool = False) -> None:
+        self._path = Path(path)
+        self._speed = speed
+        self._loop = loop
+        self._recording: Optional[FrameRecording] = None
+        self._offsets_ns: Optional[np.ndarray] = None
+        self._started_ns = 0
+        self._index = -1
+        self._seq = 0
+        self._region: Optional[ZoneRect] = None
+        self._latest: Optional[Frame] = None
+
+    def start(self, display_id: int) -> None:
+        self._recording = FrameRecording(self._path)
+        times = self._recording.capture_times_ns()
+        self._offsets_ns = times - times[0] if times.size else times
+        self._started_ns = time.monotonic_ns()
+        self._index = -1
+        self._latest = None
+
+    def stop(self) -> None:
+        self._recording = None
+        self._offsets_ns = None
+        self._latest = None
+
+    def set_regions(self, regions: Sequence[ZoneRect]) -> None:
+        self._region = bounding_region(regions)
+
+    def get_preview(self, max_width: int) -> Frame | None:
+        latest = self._latest
+        if latest is None:
+            return None
+        return replace(latest, pixels=preview_rendition(latest.pixels, max_width))
+
+    def get_frame(self, since_seq: int = 0) -> Frame | None:
+        if self._recording is None or not len(self._recording):
+            return None
+        index = self._next_index()
+        if index is None:
+            return None
+        if index != self._index or self._latest is None:
+            # Counted per frame served, so sequence numbers keep rising across loops.
+            self._index = index
+            self._seq += 1
+            self._latest = Frame(
+                pixels=self._recording.pixels(index),
+                timestamp=datetime.utcnow(),
+                seq=self._seq,
+                capture_ns=time.monotonic_ns(),
+            )
+        return crop_frame(self._latest, self._region)
+
+    def _next_index(self) -> Optional[int]:
+        count = len(self._recording)
+        if self._speed <= 0:
+            position = self._index + 1
+        else:
+            elapsed = (time.monotonic_ns() - self._started_ns) * self._speed
+            duration = int(self._offsets_ns[-1])
+            if self._loop and duration > 0:
+                elapsed %= duration + 1
+            position = int(np.searchsorted(self._offsets_ns, elapsed, side="right")) - 1
+        if position >= count:
+            if not self._loop:
+                return None
+            position %= count
+        return max(position, 0)
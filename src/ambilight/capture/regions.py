@@ -0,0 +1,98 @@
+"""Region helpers shared by frame providers."""
+
+from __future__ import annotations
+
+import zlib
+from dataclasses import replace
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from ambilight.capture.frame_provider import Frame
+from ambilight.state.zone_state import DisplayBounds, ZoneRect
+
+
+def bounding_region(regions: Sequence[ZoneRect]) -> Optional[ZoneRect]:
+    """Smallest rectangle containing all regions, or None for no regions."""
+
+    if not regions:
+        return None
+    left = min(r.x for r in regions)
+    top = min(r.y for r in regions)
+    right = max(r.x + r.width for r in regions)
+    bottom = max(r.y + r.height for r in regions)
+    return ZoneRect(x=left, y=top, width=right - left, height=bottom - top)
+
+
+def crop_frame(frame: Frame, region: Optional[ZoneRect]) -> Frame:
+    """Cut a full frame down to ``region`` as a view, keeping its placement."""
+
+    if region is None:
+        return frame
+    height, width = frame.pixels.shape[:2]
+    rect = region.clamp_to_bounds(DisplayBounds(width=width, height=height))
+    return replace(
+        frame,
+        pixels=frame.pixels[
+            rect.y : rect.y + rect.height, rect.x : rect.x + rect.width
+        ],
+        origin=(rect.x, rect.y),
+        full_size=(width, height),
+    )
+
+
+def display_box(
+    region: ZoneRect, scale: float, shape: Tuple[int, ...]
+) -> Tuple[int, int, int, int]:
+    """``(left, top, right, bottom)`` display pixels of a region in frame coordinates."""
+
+    inverse = 1.0 / min(scale, 1.0)
+    left = int(region.x * inverse)
+    top = int(region.y * inverse)
+    right = min(shape[1], int(round((region.x + region.width) * inverse)))
+    bottom = min(shape[0], int(round((region.y + region.height) * inverse)))
+    return left, top, right, bottom
+
+
+def regions_signature(
+    display: np.ndarray, regions: Sequence[ZoneRect], scale: float = 1.0
+) -> Tuple[int, ...]:
+    """Signature of the display pixels under ``regions`` (frame coordinates).
+
+    Every display pixel under a region is hashed, since the area-average
+    downscale reads them all: a change to any of them can move the frame
+    analysis sees. Pixels outside every region are not read. No regions
+    means the whole display.
+    """
+
+    height, width = display.shape[:2]
+    bounds = DisplayBounds(
+        width=max(1, int(width * min(scale, 1.0))),
+        height=max(1, int(height * min(scale, 1.0))),
+    )
+    if not regions:
+        regions = [ZoneRect(x=0, y=0, width=bounds.width, height=bounds.height)]
+    signature = []
+    for region in regions:
+        rect = region.clamp_to_bounds(bounds)
+        left, top, right, bottom = display_box(rect, scale, display.shape)
+        signature.append(_crc32(display[top:bottom, left:right]))
+    return tuple(signature)
+
+
+def _crc32(pixels: np.ndarray) -> int:
+    """CRC32 of all pixels; row by row for a sub-rectangle, which avoids a copy."""
+
+    if pixels.flags.c_contiguous:
+        return zlib.crc32(pixels.data)
+    crc = 0
+    for row in pixels:
+        crc = zlib.crc32(np.ascontiguousarray(row).data, crc)
+    return crc
+
+
+def preview_rendition(pixels: np.ndarray, max_width: int) -> np.ndarray:
+    """Strided subsample no wider than ``max_width``; cheap enough per preview tick."""
+
+    step = max(1, -(-pixels.shape[1] // max_width))
+    return pixels[::step, ::step]
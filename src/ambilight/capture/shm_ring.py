@@ -0,0 +1,161 @@
+"""Shared-memory ring buffer handing frames between processes without copies."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Per-slot header: seqlock counter, frame sequence, capture time (ns), height, width.
+_LOCK, _SEQ, _CAPTURE_NS, _HEIGHT, _WIDTH = range(5)
+_SLOT_FIELDS = 8
+# Ring header: latest published sequence number.
+_RING_FIELDS = 8
+_ALIGN = 64
+
+
+@dataclass(frozen=True)
+class RingFrame:
+    """A frame view living in shared memory.
+
+    ``pixels`` is only guaranteed intact while ``SharedFrameRing.is_current``
+    returns True for it; copy it if it must outlive ``slots - 1`` more writes.
+    """
+
+    seq: int
+    capture_ns: int
+    slot: int
+    lock: int
+    pixels: np.ndarray
+
+
+class SharedFrameRing:
+    """Fixed-size ring of RGB frame slots in ``multiprocessing.shared_memory``.
+
+    One writer publishes frames with increasing sequence numbers. Each slot
+    is guarded by a seqlock: the counter is odd while the writer fills the
+    slot, so readers can detect torn or overwritten frames without locks.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        slots: int,
+        max_shape: Tuple[int, int],
+        owner: bool,
+    ) -> None:
+        self._shm = shm
+        self.slots = slots
+        self.max_shape = max_shape
+        self._owner = owner
+        header_words = _RING_FIELDS + slots * _SLOT_FIELDS
+        self._ring = np.ndarray((_RING_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        self._headers = np.ndarray(
+            (slots, _SLOT_FIELDS),
+            dtype=np.int64,
+            buffer=shm.buf,
+            offset=_RING_FIELDS * 8,
+        )
+        data_offset = -(-header_words * 8 // _ALIGN) * _ALIGN
+        height, width = max_shape
+        self._data = np.ndarray(
+            (slots, height, width, 3),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=data_offset,
+        )
+
+    @staticmethod
+    def nbytes(slots: int, max_shape: Tuple[int, int]) -> int:
+        header = (_RING_FIELDS + slots * _SLOT_FIELDS) * 8
+        return -(-header // _ALIGN) * _ALIGN + slots * max_shape[0] * max_shape[1] * 3
+
+    @classmethod
+    def create(
+        cls, max_shape: Tuple[int, int], slots: int = 4, name: Optional[str] = None
+    ) -> "SharedFrameRing":
+        if slots < 2:
+            raise ValueError("a frame ring needs at least 2 slots")
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=cls.nbytes(slots, max_shape)
+        )
+        ring = cls(shm, slots, max_shape, owner=True)
+        ring._ring[:] = 0
+        ring._headers[:] = 0
+        return ring
+
+    @classmethod
+    def attach(
+        cls, name: str, max_shape: Tuple[int, int], slots: int = 4
+    ) -> "SharedFrameRing":
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, slots, max_shape, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self._ring[0])
+
+    def write(self, pixels: np.ndarray, capture_ns: int) -> int:
+        """Copy a frame into the next slot and publish it; returns its sequence."""
+
+        height, width = pixels.shape[:2]
+        if height > self.max_shape[0] or width > self.max_shape[1]:
+            raise ValueError(f"frame {width}x{height} exceeds ring slot size")
+        seq = int(self._ring[0]) + 1
+        slot = seq % self.slots
+        header = self._headers[slot]
+        header[_LOCK] += 1
+        self._data[slot, :height, :width] = pixels
+        header[_SEQ] = seq
+        header[_CAPTURE_NS] = capture_ns
+        header[_HEIGHT] = height
+        header[_WIDTH] = width
+        header[_LOCK] += 1
+        self._ring[0] = seq
+        return seq
+
+    def read(self, since_seq: int = 0) -> Optional[RingFrame]:
+        """Return a view of the newest frame if it is newer than ``since_seq``."""
+
+        for _ in range(self.slots):
+            seq = int(self._ring[0])
+            if seq <= since_seq:
+                return None
+            slot = seq % self.slots
+            header = self._headers[slot]
+            lock = int(header[_LOCK])
+            if lock & 1 or int(header[_SEQ]) != seq:
+                continue
+            height, width = int(header[_HEIGHT]), int(header[_WIDTH])
+            frame = RingFrame(
+                seq=seq,
+                capture_ns=int(header[_CAPTURE_NS]),
+                slot=slot,
+                lock=lock,
+                pixels=self._data[slot, :height, :width],
+            )
+            if int(header[_LOCK]) == lock:
+                return frame
+        return None
+
+    def is_current(self, frame: RingFrame) -> bool:
+        """True while the frame's slot has not been rewritten since ``read``."""
+
+        return int(self._headers[frame.slot, _LOCK]) == frame.lock
+
+    def close(self) -> None:
+        # Drop our views before closing the mapping they point into.
+        del self._ring, self._headers, self._data
+        try:
+            self._shm.close()
+        except BufferError:
+            # A caller still holds a frame view; the mapping goes away with it.
+            pass
+        if self._owner:
+            self._shm.unlink()
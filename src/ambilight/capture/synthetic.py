@@ -0,0 +1,245 @@
+"""Synthetic frame providers for tests, benchmarks, load generation and non-Windows hosts.
+
+Each pattern precomputes its source images once at ``start``; a frame is a
+single copy of a view into them, written into a small pool of preallocated
+buffers. Generation is deterministic for a given seed and runs at thousands
+of frames per second, so the whole pipeline can be profiled without a display.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Optional, Sequence
+
+import numpy as np
+
+from ambilight.capture.downscale import BufferPool
+from ambilight.capture.frame_provider import Frame, FrameProvider
+from ambilight.capture.regions import bounding_region, crop_frame, preview_rendition
+from ambilight.state.zone_state import ZoneRect
+
+PATTERN_GRADIENT = "gradient"
+PATTERN_SOLID = "solid"
+PATTERN_NOISE = "noise"
+PATTERN_SCENECUT = "scenecut"
+PATTERN_SCROLL = "scroll"
+PATTERNS = (
+    PATTERN_GRADIENT,
+    PATTERN_SOLID,
+    PATTERN_NOISE,
+    PATTERN_SCENECUT,
+    PATTERN_SCROLL,
+)
+
+_PALETTE = np.array(
+    [
+        (220, 40, 40),
+        (40, 200, 60),
+        (30, 60, 220),
+        (240, 200, 40),
+        (200, 60, 200),
+        (20, 20, 20),
+        (240, 240, 240),
+        (40, 200, 200),
+    ],
+    dtype=np.uint8,
+)
+
+
+class _Pattern:
+    """Precomputed source images; ``view`` selects what frame ``step`` shows."""
+
+    def __init__(self, width: int, height: int, rng: np.random.Generator) -> None:
+        self.width = width
+        self.height = height
+
+    def view(self, step: int) -> np.ndarray:
+        raise NotImplementedError
+
+
+class _Gradient(_Pattern):
+    """A hue ramp across the width, darkening downwards, drifting sideways."""
+
+    speed = 4
+
+    def __init__(self, width: int, height: int, rng: np.random.Generator) -> None:
+        super().__init__(width, height, rng)
+        phase = np.arange(width, dtype=np.float32) / width * 2.0 * np.pi
+        shifts = np.array([0.0, 2.0, 4.0], dtype=np.float32) * np.pi / 3.0
+        row = (0.5 + 0.5 * np.cos(phase[:, None] - shifts[None, :])) * 255.0
+        shade = np.linspace(1.0, 0.25, height, dtype=np.float32)[:, None, None]
+        image = (row[None, :, :] * shade).astype(np.uint8)
+        # Two periods side by side, so every offset is a plain slice.
+        self._image = np.concatenate([image, image], axis=1)
+
+    def view(self, step: int) -> np.ndarray:
+        offset = step * self.speed % self.width
+        return self._image[:, offset : offset + self.width]
+
+
+class _Solid(_Pattern):
+    """Flat colors from a fixed palette, each held for ``hold`` frames."""
+
+    hold = 60
+
+    def __init__(self, width: int, height: int, rng: np.random.Generator) -> None:
+        super().__init__(width, height, rng)
+        # One full row per color: broadcasting a row down the frame copies
+        # contiguous memory, broadcasting a single pixel does not.
+        self._rows = np.repeat(_PALETTE[:, None, :], width, axis=1)
+
+    def view(self, step: int) -> np.ndarray:
+        return self._rows[(step - 1) // self.hold % len(_PALETTE)]
+
+
+class _Noise(_Pattern):
+    """Uniform RGB noise, cycling through a small bank of seeded images."""
+
+    bank = 4
+
+    def __init__(self, width: int, height: int, rng: np.random.Generator) -> None:
+        super().__init__(width, height, rng)
+        self._images = rng.integers(
+            0, 256, size=(self.bank, height, width, 3), dtype=np.uint8
+        )
+
+    def view(self, step: int) -> np.ndarray:
+        return self._images[step % self.bank]
+
+
+class _SceneCut(_Pattern):
+    """Static scenes of color blocks and noise, cut hard every ``scene_frames``."""
+
+    scenes = 6
+    scene_frames = 45
+
+    def __init__(self, width: int, height: int, rng: np.random.Generator) -> None:
+        super().__init__(width, height, rng)
+        images = np.empty((self.scenes, height, width, 3), dtype=np.uint8)
+        for index in range(self.scenes):
+            blocks = rng.integers(0, len(_PALETTE), size=(4, 6))
+            rows = np.arange(height) * 4 // height
+            cols = np.arange(width) * 6 // width
+            image = _PALETTE[blocks[rows[:, None], cols[None, :]]].astype(np.int16)
+            image += rng.integers(-12, 13, size=image.shape, dtype=np.int16)
+            images[index] = np.clip(image, 0, 255)
+        self._images = images
+
+    def view(self, step: int) -> np.ndarray:
+        return self._images[(step - 1) // self.scene_frames % self.scenes]
+
+
+class _Scroll(_Pattern):
+    """Page-like content (bars of "text" on a light background) scrolling up."""
+
+    speed = 3
+
+    def __init__(self, width: int, height: int, rng: np.random.Generator) -> None:
+        super().__init__(width, height, rng)
+        image = np.full((height, width, 3), 235, dtype=np.uint8)
+        line = max(4, height // 30)
+        for top in range(0, height - line, line * 2):
+            start = int(rng.integers(0, width // 8 + 1))
+            stop = start + int(rng.integers(width // 4, width - start + 1))
+            image[top : top + line, start:stop] = _PALETTE[
+                int(rng.integers(0, len(_PALETTE)))
+            ]
+        self._image = np.concatenate([image, image], axis=0)
+
+    def view(self, step: int) -> np.ndarray:
+        offset = step * self.speed % self.height
+        return self._image[offset : offset + self.height]
+
+
+_PATTERN_TYPES = {
+    PATTERN_GRADIENT: _Gradient,
+    PATTERN_SOLID: _Solid,
+    PATTERN_NOISE: _Noise,
+    PATTERN_SCENECUT: _SceneCut,
+    PATTERN_SCROLL: _Scroll,
+}
+
+
+class SyntheticFrameProvider(FrameProvider):
+    """Produce frames of a synthetic ``pattern`` (one of ``PATTERNS``).
+
+    With ``fps=0`` each ``get_frame`` captures a new frame. With ``fps > 0``
+    frames advance with wall-clock time like a display refreshing at that
+    rate, and calls in between return the current frame again (same seq).
+    Frames live in a pool of ``pool_size`` buffers, so a frame is overwritten
+    ``pool_size`` captures later; copy it to keep it longer.
+    """
+
+    def __init__(
+        self,
+        width: int = 960,
+        height: int = 540,
+        pattern: str = PATTERN_GRADIENT,
+        fps: float = 0.0,
+        seed: int = 0,
+        pool_size: int = 3,
+    ) -> None:
+        if pattern not in _PATTERN_TYPES:
+            raise ValueError(
+                f"unknown synthetic pattern {pattern!r}; expected one of {PATTERNS}"
+            )
+        self._width = width
+        self._height = height
+        self._pattern_name = pattern
+        self._fps = fps
+        self._seed = seed
+        self._pool = BufferPool(pool_size)
+        self._pattern: Optional[_Pattern] = None
+        self._started_ns = 0
+        self._step = 0
+        self._region: Optional[ZoneRect] = None
+        self._latest: Optional[Frame] = None
+
+    @property
+    def allocations(self) -> int:
+        """Frame buffers allocated so far; constant once running."""
+
+        return self._pool.allocations
+
+    def start(self, display_id: int) -> None:
+        rng = np.random.default_rng(self._seed)
+        self._pattern = _PATTERN_TYPES[self._pattern_name](
+            self._width, self._height, rng
+        )
+        self._started_ns = time.monotonic_ns()
+        self._step = 0
+        self._latest = None
+
+    def stop(self) -> None:
+        self._pattern = None
+        self._latest = None
+
+    def set_regions(self, regions: Sequence[ZoneRect]) -> None:
+        self._region = bounding_region(regions)
+
+    def get_preview(self, max_width: int) -> Frame | None:
+        latest = self._latest
+        if latest is None:
+            return None
+        return replace(latest, pixels=preview_rendition(latest.pixels, max_width))
+
+    def get_frame(self, since_seq: int = 0) -> Frame | None:
+        if self._pattern is None:
+            return None
+        step = self._step + 1
+        if self._fps > 0:
+            elapsed = time.monotonic_ns() - self._started_ns
+            step = int(elapsed * self._fps // 1_000_000_000) + 1
+        if step != self._step or self._latest is None:
+            self._step = step
+            pixels = self._pool.take((self._height, self._width, 3))
+            np.copyto(pixels, self._pattern.view(step))
+            self._latest = Frame(
+                pixels=pixels,
+                timestamp=datetime.utcnow(),
+                seq=step,
+                capture_ns=time.monotonic_ns(),
+            )
+        return crop_frame(self._latest, self._region)
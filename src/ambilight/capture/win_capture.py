@@ -2,23 +2,52 @@
 
 from __future__ import annotations
 
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
 import dxcam
 import numpy as np
-from PIL import Image
 
+from ambilight.capture.downscale import Downscaler
 from ambilight.capture.frame_provider import Frame, FrameProvider
+from ambilight.capture.regions import (
+    bounding_region,
+    display_box,
+    preview_rendition,
+    regions_signature,
+)
+from ambilight.state.zone_state import DisplayBounds, ZoneRect
 
 
 class WinCaptureFrameProvider(FrameProvider):
-    """Capture frames from a Windows display using dxcam."""
+    """Capture frames from a Windows display using dxcam.
+
+    Frame coordinates are display pixels times ``scale``. With regions set,
+    only their bounding box is cut from the captured frame and downscaled.
+    Downscaled frames come from a pool of three buffers, so a frame is
+    overwritten two captures later.
+
+    dxcam's video mode repeats the last image when the screen is idle and
+    does not say whether an image is new. A capture whose signature over
+    every display pixel of the active regions matches the previous one keeps
+    its sequence number and returns the cached frame without cropping or
+    downscaling again.
+    """
 
     def __init__(self, scale: float = 1.0) -> None:
         self._camera: Optional[dxcam.DXCamera] = None
         self._scale = scale
         self._display_id: Optional[int] = None
+        self._region: Optional[ZoneRect] = None
+        self._regions: Tuple[ZoneRect, ...] = ()
+        self._latest: Optional[np.ndarray] = None
+        self._downscaler = Downscaler()
+        self._seq = 0
+        self._signature: Optional[Tuple[int, ...]] = None
+        self._capture_ns = 0
+        self._captured_at = datetime.utcnow()
+        self._frame: Optional[Frame] = None
 
     def start(self, display_id: int) -> None:
         if display_id not in (1, 2):
@@ -34,21 +63,73 @@ class WinCaptureFrameProvider(FrameProvider):
         if self._camera is not None:
             self._camera.stop()
         self._camera = None
+        self._latest = None
+        self._signature = None
+        self._frame = None
 
-    def get_frame(self) -> Frame | None:
+    def set_regions(self, regions: Sequence[ZoneRect]) -> None:
+        self._region = bounding_region(regions)
+        self._regions = tuple(regions)
+        self._signature = None
+        self._frame = None
+
+    def get_preview(self, max_width: int) -> Frame | None:
+        latest = self._latest
+        if latest is None:
+            return None
+        return Frame(
+            pixels=preview_rendition(latest, max_width),
+            timestamp=self._captured_at,
+            seq=self._seq,
+            capture_ns=self._capture_ns,
+        )
+
+    def get_frame(self, since_seq: int = 0) -> Frame | None:
         if self._camera is None:
             return None
-        frame = self._camera.get_latest_frame()
-        if frame is None:
+        raw = self._camera.get_latest_frame()
+        if raw is None:
             return None
-        pixels = self._downscale(frame)
-        return Frame(pixels=pixels, timestamp=datetime.utcnow())
+        signature = regions_signature(raw, self._regions, self._scale)
+        if signature == self._signature and self._frame is not None:
+            return self._frame
+        if signature != self._signature:
+            self._signature = signature
+            self._seq += 1
+            self._capture_ns = time.monotonic_ns()
+            self._captured_at = datetime.utcnow()
+        self._latest = raw
+        pixels, origin, full_size = self._crop_and_scale(raw)
+        self._frame = Frame(
+            pixels=pixels,
+            timestamp=self._captured_at,
+            origin=origin,
+            full_size=full_size,
+            seq=self._seq,
+            capture_ns=self._capture_ns,
+        )
+        return self._frame
+
+    def _crop_and_scale(
+        self, frame: np.ndarray
+    ) -> tuple[np.ndarray, tuple[int, int], Optional[tuple[int, int]]]:
+        full_size = self._scaled_size(frame.shape[1], frame.shape[0])
+        if self._region is None:
+            return self._downscale(frame, full_size), (0, 0), None
+        region = self._region.clamp_to_bounds(DisplayBounds(*full_size))
+        # Map the region back to display pixels and resize only that block.
+        left, top, right, bottom = display_box(region, self._scale, frame.shape)
+        pixels = self._downscale(
+            frame[top:bottom, left:right], (region.width, region.height)
+        )
+        return pixels, (region.x, region.y), full_size
 
-    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+    def _scaled_size(self, width: int, height: int) -> tuple[int, int]:
         if self._scale >= 1.0:
-            return frame
-        width = max(1, int(frame.shape[1] * self._scale))
-        height = max(1, int(frame.shape[0] * self._scale))
-        image = Image.fromarray(frame)
-        resized = image.resize((width, height), resample=Image.BILINEAR)
-        return np.asarray(resized)
+            return width, height
+        return max(1, int(width * self._scale)), max(1, int(height * self._scale))
+
+    def _downscale(self, frame: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+        width = min(size[0], frame.shape[1])
+        height = min(size[1], frame.shape[0])
+        return self._downscaler.resize(frame, (width, height))
@@ -5,13 +5,25 @@ from __future__ import annotations
 import json
 from dataclasses import asdict
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Tuple
 
-from ambilight.config.models import AppConfig, Preset
+from ambilight.analysis.smoothing import SMOOTHING_WINDOW
+from ambilight.config.models import AppConfig, OutputZone, Preset
 from ambilight.config.validators import validate_config
 from ambilight.state.zone_state import ZoneRect
 
 
+def _zones_from_list(items: list) -> Tuple[OutputZone, ...]:
+    return tuple(
+        OutputZone(
+            name=str(item["name"]),
+            entity_id=str(item["entity_id"]),
+            rect=ZoneRect(**item["rect"]),
+        )
+        for item in items
+    )
+
+
 def _config_from_dict(data: dict) -> AppConfig:
     zone = ZoneRect(**data["zone"])
     return validate_config(
@@ -22,6 +34,8 @@ def _config_from_dict(data: dict) -> AppConfig:
             analysis_hz=float(data["analysis_hz"]),
             dark_threshold=float(data["dark_threshold"]),
             saturation_boost=float(data["saturation_boost"]),
+            smoothing_mode=str(data.get("smoothing_mode", SMOOTHING_WINDOW)),
+            zones=_zones_from_list(data.get("zones", [])),
         )
     )
 
@@ -38,6 +52,8 @@ def _preset_from_dict(data: dict) -> Preset:
         analysis_hz=float(data["analysis_hz"]),
         dark_threshold=float(data["dark_threshold"]),
         saturation_boost=float(data["saturation_boost"]),
+        smoothing_mode=str(data.get("smoothing_mode", SMOOTHING_WINDOW)),
+        zones=_zones_from_list(data.get("zones", [])),
     )
 
 
@@ -3,10 +3,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Tuple
 
+from ambilight.analysis.smoothing import SMOOTHING_WINDOW
 from ambilight.state.zone_state import ZoneRect
 
 
+@dataclass(frozen=True)
+class OutputZone:
+    """Extra screen region driving its own light entity."""
+
+    name: str
+    entity_id: str
+    rect: ZoneRect
+
+
 @dataclass(frozen=True)
 class AppConfig:
     display_id: int
@@ -15,6 +26,8 @@ class AppConfig:
     analysis_hz: float
     dark_threshold: float
     saturation_boost: float
+    smoothing_mode: str = SMOOTHING_WINDOW
+    zones: Tuple[OutputZone, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -26,3 +39,5 @@ class Preset:
     analysis_hz: float
     dark_threshold: float
     saturation_boost: float
+    smoothing_mode: str = SMOOTHING_WINDOW
+    zones: Tuple[OutputZone, ...] = ()
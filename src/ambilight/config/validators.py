@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from ambilight.config.models import AppConfig
+from typing import Iterable
+
+from ambilight.analysis.smoothing import SMOOTHING_MODES
+from ambilight.config.models import AppConfig, OutputZone
 from ambilight.state.zone_state import ZoneRect
 
 
@@ -15,12 +18,28 @@ def validate_zone(zone: ZoneRect) -> None:
         raise ValueError("zone width/height must be > 0")
 
 
+def validate_output_zones(zones: Iterable[OutputZone]) -> None:
+    names = set()
+    for zone in zones:
+        if not zone.name:
+            raise ValueError("output zone name is required")
+        if zone.name in names:
+            raise ValueError(f"duplicate output zone name: {zone.name}")
+        names.add(zone.name)
+        if "." not in zone.entity_id:
+            raise ValueError(f"output zone {zone.name} needs a light entity id")
+        validate_zone(zone.rect)
+
+
 def validate_config(config: AppConfig) -> AppConfig:
     if config.display_id not in (1, 2):
         raise ValueError("display_id must be 1 or 2")
     validate_zone(config.zone)
     if not 0.5 <= config.preview_interval_sec <= 2.0:
         raise ValueError("preview_interval_sec out of bounds")
+    if config.smoothing_mode not in SMOOTHING_MODES:
+        raise ValueError("smoothing_mode must be one of " + ", ".join(SMOOTHING_MODES))
+    validate_output_zones(config.zones)
     dark = clamp(config.dark_threshold, 0.0, 1.0)
     sat = clamp(config.saturation_boost, 0.0, 1.0)
     return AppConfig(
@@ -30,4 +49,6 @@ def validate_config(config: AppConfig) -> AppConfig:
         analysis_hz=config.analysis_hz,
         dark_threshold=dark,
         saturation_boost=sat,
+        smoothing_mode=config.smoothing_mode,
+        zones=tuple(config.zones),
     )
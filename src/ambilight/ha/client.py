@@ -1,25 +1,47 @@
-"""Home Assistant REST client with backoff and throttling."""
+"""Home Assistant client with backoff and throttling, over REST or WebSocket."""
 
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 import httpx
 
+from ambilight.ha.rate_control import AimdRateController
+from ambilight.ha.websocket import WebSocketTransport, websocket_url
+
 RgbColor = Tuple[int, int, int]
 
+TRANSPORT_REST = "rest"
+TRANSPORT_WEBSOCKET = "websocket"
+
 
 @dataclass
 class HomeAssistantClient:
+    """Light service calls for one default entity.
+
+    ``transport="rest"`` posts each call to ``/api/services``.
+    ``transport="websocket"`` sends calls over one persistent, authenticated
+    WebSocket connection instead. Either way a call returns Home Assistant's
+    answer, so a rejected command (unknown entity, service error) reports
+    False and is retried rather than remembered as applied. With ``rate_control`` the
+    interval between commands to one entity follows measured round trips
+    instead of the fixed ``min_interval_ms``, and failures lower the rate
+    rather than sleeping.
+    """
+
     base_url: str
     token: str
     entity_id: str
     min_interval_ms: int = 100
+    transport: str = TRANSPORT_REST
+    rate_control: Optional[AimdRateController] = None
     _client: httpx.AsyncClient = field(init=False)
-    _last_send: Optional[datetime] = None
+    _ws: Optional[WebSocketTransport] = field(default=None, init=False)
+    _last_send: Dict[str, datetime] = field(default_factory=dict)
     _backoff_seconds: float = 1.0
     _max_backoff: float = 30.0
 
@@ -29,41 +51,81 @@ class HomeAssistantClient:
             headers={"Authorization": f"Bearer {self.token}"},
             timeout=5.0,
         )
+        if self.transport == TRANSPORT_WEBSOCKET:
+            self._ws = WebSocketTransport(
+                websocket_url(self.base_url), self.token, on_result=self._record_result
+            )
+        elif self.transport != TRANSPORT_REST:
+            raise ValueError(f"unknown Home Assistant transport {self.transport!r}")
 
     async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
         await self._client.aclose()
 
-    async def set_color(self, color: RgbColor, brightness: int = 255) -> bool:
-        await self._throttle()
+    async def set_color(
+        self,
+        color: RgbColor,
+        brightness: int = 255,
+        entity_id: Optional[str] = None,
+        transition: Optional[float] = None,
+    ) -> bool:
+        """Turn the light on at ``color``, fading over ``transition`` seconds if given."""
+
+        entity = entity_id or self.entity_id
+        await self._throttle(entity)
         payload = {
-            "entity_id": self.entity_id,
+            "entity_id": entity,
             "rgb_color": list(color),
             "brightness": brightness,
         }
-        return await self._post("/api/services/light/turn_on", payload)
+        if transition is not None:
+            payload["transition"] = transition
+        return await self._call_service("turn_on", payload)
+
+    async def turn_off(self, entity_id: Optional[str] = None) -> bool:
+        entity = entity_id or self.entity_id
+        await self._throttle(entity)
+        payload = {"entity_id": entity}
+        return await self._call_service("turn_off", payload)
 
-    async def turn_off(self) -> bool:
-        await self._throttle()
-        payload = {"entity_id": self.entity_id}
-        return await self._post("/api/services/light/turn_off", payload)
+    async def _call_service(self, service: str, payload: dict) -> bool:
+        if self._ws is not None:
+            return await self._ws.call_service("light", service, payload, wait=True)
+        return await self._post(f"/api/services/light/{service}", payload)
 
     async def _post(self, path: str, payload: dict) -> bool:
+        start = time.perf_counter()
         try:
             response = await self._client.post(path, json=payload)
             response.raise_for_status()
             self._backoff_seconds = 1.0
+            self._record_result((time.perf_counter() - start) * 1000.0, True)
             return True
         except httpx.HTTPError:
+            if self.rate_control is not None:
+                self._record_result((time.perf_counter() - start) * 1000.0, False)
+                return False
             await asyncio.sleep(self._backoff_seconds)
             self._backoff_seconds = min(self._max_backoff, self._backoff_seconds * 2)
             return False
 
-    async def _throttle(self) -> None:
-        if self._last_send is None:
-            self._last_send = datetime.utcnow()
+    async def _throttle(self, entity_id: str) -> None:
+        """Rate-limit each entity separately so zones do not delay each other."""
+
+        last_send = self._last_send.get(entity_id)
+        if last_send is None:
+            self._last_send[entity_id] = datetime.utcnow()
             return
-        delta = datetime.utcnow() - self._last_send
-        min_interval = timedelta(milliseconds=self.min_interval_ms)
+        delta = datetime.utcnow() - last_send
+        if self.rate_control is not None:
+            min_interval = timedelta(milliseconds=self.rate_control.interval_ms)
+        else:
+            min_interval = timedelta(milliseconds=self.min_interval_ms)
         if delta < min_interval:
             await asyncio.sleep((min_interval - delta).total_seconds())
-        self._last_send = datetime.utcnow()
+        self._last_send[entity_id] = datetime.utcnow()
+
+    def _record_result(self, rtt_ms: float, success: bool) -> None:
+        if self.rate_control is not None:
+            self.rate_control.record(rtt_ms, success)
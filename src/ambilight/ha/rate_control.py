@@ -0,0 +1,85 @@
+"""Adaptive send rate for Home Assistant commands (additive increase, multiplicative decrease)."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+RTT_PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class AimdRateController:
+    """Pick the interval between commands to one light from measured round trips.
+
+    Every acknowledged command raises the rate so it grows by about
+    ``increase_hz`` per second while Home Assistant keeps up. A failed
+    command, or a round trip slower than ``congestion_ratio`` times the
+    fastest recent one (plus ``rtt_slack_ms`` of jitter), multiplies the
+    rate by ``decrease_factor``, at most once per ``decrease_cooldown_sec``:
+    a burst of failures or slow replies reports one congestion event, so an
+    outage of a few seconds does not drive the rate to the floor. The rate
+    stays within ``min_rate_hz`` and ``max_rate_hz``, the most the lights
+    are expected to follow.
+    """
+
+    rate_hz: float = 10.0
+    min_rate_hz: float = 1.0
+    max_rate_hz: float = 30.0
+    increase_hz: float = 1.0
+    decrease_factor: float = 0.5
+    congestion_ratio: float = 2.0
+    rtt_slack_ms: float = 10.0
+    decrease_cooldown_sec: float = 0.5
+    window: int = 200
+    successes: int = 0
+    failures: int = 0
+    decreases: int = 0
+    _rtts: Deque[float] = field(default_factory=deque, init=False)
+    _last_decrease: float = field(default=float("-inf"), init=False)
+
+    def __post_init__(self) -> None:
+        self._rtts = deque(maxlen=self.window)
+        self.rate_hz = min(self.max_rate_hz, max(self.min_rate_hz, self.rate_hz))
+
+    @property
+    def interval_ms(self) -> float:
+        return 1000.0 / self.rate_hz
+
+    def record(self, rtt_ms: float, success: bool, now: Optional[float] = None) -> None:
+        """Feed the outcome of one command and adjust the rate."""
+
+        now = time.monotonic() if now is None else now
+        if not success:
+            self.failures += 1
+            self._decrease(now)
+            return
+        self.successes += 1
+        baseline = min(self._rtts) if self._rtts else rtt_ms
+        self._rtts.append(rtt_ms)
+        if rtt_ms > baseline * self.congestion_ratio + self.rtt_slack_ms:
+            self._decrease(now)
+            return
+        # At low rates samples are rare; never more than double per sample.
+        step = min(self.rate_hz, self.increase_hz / self.rate_hz)
+        self.rate_hz = min(self.max_rate_hz, self.rate_hz + step)
+
+    def rtt_percentiles(self) -> Dict[str, float]:
+        """Nearest-rank RTT percentiles over the recent window, in milliseconds."""
+
+        if not self._rtts:
+            return {}
+        ordered = sorted(self._rtts)
+        last = len(ordered) - 1
+        return {
+            f"p{p}": round(ordered[round(last * p / 100)], 2) for p in RTT_PERCENTILES
+        }
+
+    def _decrease(self, now: float) -> None:
+        if now - self._last_decrease < self.decrease_cooldown_sec:
+            return
+        self.decreases += 1
+        self._last_decrease = now
+        self.rate_hz = max(self.min_rate_hz, self.rate_hz * self.decrease_factor)
@@ -0,0 +1,213 @@
+"""Home Assistant WebSocket transport: one authenticated connection, pipelined calls.
+
+Requires the optional ``websockets`` package (``pip install .[ws]``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from ambilight.utils.logging import get_logger
+
+
+def websocket_url(base_url: str) -> str:
+    """``http://host:8123`` -> ``ws://host:8123/api/websocket``."""
+
+    parsed = urlparse(base_url)
+    scheme = "wss" if parsed.scheme == "https" else "ws"
+    return f"{scheme}://{parsed.netloc}{parsed.path.rstrip('/')}/api/websocket"
+
+
+class AuthenticationError(ConnectionError):
+    """Home Assistant rejected the access token."""
+
+
+class WebSocketTransport:
+    """Send ``call_service`` messages over one persistent connection.
+
+    Calls are pipelined: ``call_service`` returns once the message is written
+    and results are matched to their ids by a reader task, unless
+    ``wait=True``. A call whose result does not arrive within
+    ``result_timeout`` seconds fails and drops the connection, which may be
+    half-open. A dropped connection is reopened by the next call, with
+    exponential backoff between failed attempts. ``on_result`` receives the
+    round trip in milliseconds and the outcome of every call sent, and a
+    failure for every failed connection attempt; calls refused while
+    backing off are not reported, as nothing was tried.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        on_result: Optional[Callable[[float, bool], None]] = None,
+        result_timeout: float = 5.0,
+    ) -> None:
+        try:
+            from websockets.asyncio.client import connect
+        except ImportError as exc:  # pragma: no cover - depends on the environment
+            raise RuntimeError(
+                "the websocket transport needs the 'websockets' package (pip install .[ws])"
+            ) from exc
+        self.url = url
+        self._token = token
+        self._connect = connect
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self.result_timeout = result_timeout
+        self._backoff = reconnect_delay
+        self._retry_at = 0.0
+        self._ws: Optional[Any] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._open_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._sent_at: Dict[int, float] = {}
+        self._on_result = on_result
+        self.connects = 0
+        self.sent = 0
+        self.acknowledged = 0
+        self.errors = 0
+        self._logger = get_logger("ambilight.ha.websocket")
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def call_service(
+        self, domain: str, service: str, data: Dict[str, Any], wait: bool = False
+    ) -> bool:
+        """Send one service call; with ``wait`` also await Home Assistant's result."""
+
+        ws = await self._connection()
+        if ws is None:
+            return False
+        message_id = next(self._ids)
+        result = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = result
+        self._sent_at[message_id] = time.perf_counter()
+        message = {
+            "id": message_id,
+            "type": "call_service",
+            "domain": domain,
+            "service": service,
+            "service_data": data,
+        }
+        try:
+            await ws.send(json.dumps(message))
+        except Exception as exc:  # websockets.ConnectionClosed and socket errors
+            self._logger.warning("Home Assistant websocket send failed: %s", exc)
+            await self._drop()
+            return False
+        self.sent += 1
+        if not wait:
+            return True
+        try:
+            return await asyncio.wait_for(result, self.result_timeout)
+        except TimeoutError:
+            self._logger.warning(
+                "Home Assistant websocket call %s timed out", message_id
+            )
+            await self._drop()
+            return False
+
+    async def close(self) -> None:
+        await self._drop()
+
+    async def _connection(self) -> Optional[Any]:
+        """The open connection, reconnecting if due; None while backing off."""
+
+        async with self._open_lock:
+            if self._ws is not None:
+                return self._ws
+            if time.monotonic() < self._retry_at:
+                return None
+            try:
+                ws = await self._open()
+            except Exception as exc:
+                self._logger.warning("Home Assistant websocket connect failed: %s", exc)
+                self._report(None, False)
+                self._retry_at = time.monotonic() + self._backoff
+                self._backoff = min(self._max_reconnect_delay, self._backoff * 2)
+                return None
+            self._backoff = self._reconnect_delay
+            self._ws = ws
+            self._reader = asyncio.create_task(self._read(ws))
+            self.connects += 1
+            return ws
+
+    async def _open(self) -> Any:
+        # A half-open socket never answers the close handshake; do not wait long.
+        ws = await self._connect(self.url, open_timeout=5.0, close_timeout=1.0)
+        try:
+            greeting = json.loads(await ws.recv())
+            if greeting.get("type") == "auth_required":
+                await ws.send(json.dumps({"type": "auth", "access_token": self._token}))
+                greeting = json.loads(await ws.recv())
+            if greeting.get("type") != "auth_ok":
+                raise AuthenticationError(
+                    greeting.get("message", "authentication failed")
+                )
+        except BaseException:
+            await ws.close()
+            raise
+        return ws
+
+    async def _read(self, ws: Any) -> None:
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get("type") != "result":
+                    continue
+                success = bool(message.get("success"))
+                self.acknowledged += 1
+                if not success:
+                    self.errors += 1
+                    self._logger.warning(
+                        "Home Assistant call failed: %s", message.get("error")
+                    )
+                self._report(message.get("id"), success)
+                result = self._pending.pop(message.get("id"), None)
+                if result is not None and not result.done():
+                    result.set_result(success)
+        except Exception as exc:
+            self._logger.info("Home Assistant websocket closed: %s", exc)
+        finally:
+            if self._ws is ws:
+                self._ws = None
+                self._fail_pending()
+
+    async def _drop(self) -> None:
+        ws, self._ws = self._ws, None
+        reader, self._reader = self._reader, None
+        if ws is not None:
+            await ws.close()
+        if reader is not None:
+            reader.cancel()
+        self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+        for message_id, result in pending.items():
+            self._report(message_id, False)
+            if not result.done():
+                result.set_result(False)
+
+    def _report(self, message_id: Optional[int], success: bool) -> None:
+        sent_at = self._sent_at.pop(message_id, None)
+        if self._on_result is not None:
+            rtt_ms = (
+                0.0 if sent_at is None else (time.perf_counter() - sent_at) * 1000.0
+            )
+            self._on_result(rtt_ms, success)
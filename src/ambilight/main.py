@@ -4,23 +4,159 @@ from __future__ import annotations
 
 import asyncio
 import os
+import time
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
+from typing import Dict, Optional, Sequence
 
+import numpy as np
 import uvicorn
 
+from ambilight.analysis.backends import AUTO_BACKEND, calibrate_backends
+from ambilight.analysis.dominant_color import ENGINE_HISTOGRAM
+from ambilight.capture.frame_provider import FrameProvider
+from ambilight.capture.process_provider import ProcessFrameProvider
+from ambilight.capture.recording import FrameRecorder, ReplayFrameProvider
+from ambilight.capture.synthetic import PATTERN_GRADIENT, SyntheticFrameProvider
 from ambilight.config.env_loader import load_env_config
 from ambilight.config.json_store import JsonConfigStore
 from ambilight.config.models import AppConfig
-from ambilight.ha.client import HomeAssistantClient
+from ambilight.ha.client import TRANSPORT_REST, HomeAssistantClient
+from ambilight.ha.rate_control import AimdRateController
 from ambilight.mjpeg.publisher import MjpegPreviewPublisher
+from ambilight.services.batch_analysis import analyse_timeline
+from ambilight.services.frame_hub import FrameHub
 from ambilight.services.sync_controller import SyncController
 from ambilight.state.runtime_state import RuntimeState
 from ambilight.state.zone_state import ZoneRect
-from ambilight.utils.logging import configure_logging
+from ambilight.utils.logging import configure_logging, get_logger
 from ambilight.web.bridge import Bridge
 from ambilight.web.lan_ui_server import LanUiServer
 from ambilight.web.local_api import LocalApiServer
-from ambilight.capture.win_capture import WinCaptureFrameProvider
+
+DEFAULT_CONFIG = AppConfig(
+    display_id=1,
+    zone=ZoneRect(x=0, y=0, width=100, height=100),
+    preview_interval_sec=1.0,
+    analysis_hz=25.0,
+    dark_threshold=0.1,
+    saturation_boost=0.2,
+)
+
+
+def create_frame_provider(source: str = "display", scale: float = 0.5) -> FrameProvider:
+    """Build the capture source; dxcam is only imported for the real display.
+
+    ``source`` is ``display``, ``synthetic[:pattern]`` or a recording path.
+    Synthetic frames are sized by ``SYNTHETIC_SIZE`` (``WIDTHxHEIGHT``) and
+    paced by ``SYNTHETIC_FPS`` (``0`` captures a new frame on every request).
+    """
+
+    if source.partition(":")[0] == "synthetic":
+        pattern = source.partition(":")[2] or PATTERN_GRADIENT
+        width, _, height = os.getenv("SYNTHETIC_SIZE", "960x540").lower().partition("x")
+        return SyntheticFrameProvider(
+            int(width),
+            int(height),
+            pattern=pattern,
+            fps=float(os.getenv("SYNTHETIC_FPS", "60")),
+        )
+    if source != "display":
+        return ReplayFrameProvider(
+            Path(source), speed=float(os.getenv("REPLAY_SPEED", "1.0"))
+        )
+    from ambilight.capture.win_capture import WinCaptureFrameProvider
+
+    if os.getenv("CAPTURE_PROCESS", "0") == "1":
+        return ProcessFrameProvider(partial(WinCaptureFrameProvider, scale=scale))
+    return WinCaptureFrameProvider(scale=scale)
+
+
+def record(
+    path: Path,
+    seconds: float,
+    fps: float = 30.0,
+    source: str = "display",
+    display_id: int = 1,
+    scale: float = 0.5,
+) -> int:
+    """Capture ``seconds`` of frames into a recording file; returns the frame count."""
+
+    logger = get_logger("ambilight.record")
+    provider = create_frame_provider(source, scale)
+    hub = FrameHub(provider, capture_hz=fps)
+    subscription = hub.subscribe("recorder", max_hz=fps)
+    provider.start(display_id)
+    hub.start()
+    recorder = None
+    version = 0
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline:
+            delivery = subscription.frames.wait(version, timeout=0.5)
+            if delivery is None:
+                continue
+            version, frame = delivery
+            if frame is None:
+                continue
+            if recorder is None:
+                recorder = FrameRecorder(path, frame.pixels.shape[:2])
+            recorder.write(frame)
+    finally:
+        hub.stop()
+        provider.stop()
+        if recorder is not None:
+            recorder.close()
+    count = recorder.frame_count if recorder is not None else 0
+    logger.info(
+        "recorded %d frames to %s (%d dropped)", count, path, subscription.dropped
+    )
+    return count
+
+
+def analyse(
+    source: Path,
+    dark_thresholds: Sequence[float] = (),
+    saturation_boosts: Sequence[float] = (),
+    workers: Optional[int] = None,
+    output: Optional[Path] = None,
+    fps: float = 30.0,
+) -> None:
+    """Print a color timeline summary for each threshold/boost combination."""
+
+    base = JsonConfigStore(Path.cwd() / "config").load_config(DEFAULT_CONFIG)
+    configs = [
+        replace(base, dark_threshold=threshold, saturation_boost=boost)
+        for threshold in (dark_thresholds or (base.dark_threshold,))
+        for boost in (saturation_boosts or (base.saturation_boost,))
+    ]
+    engine = os.getenv("ANALYSIS_ENGINE", ENGINE_HISTOGRAM)
+    if engine == AUTO_BACKEND:
+        # Histogram backends agree bin for bin; timing calibration buys nothing here.
+        engine = ENGINE_HISTOGRAM
+    started = time.perf_counter()
+    timelines = analyse_timeline(
+        source, configs, engine=engine, workers=workers, fps=fps
+    )
+    elapsed = time.perf_counter() - started
+    frames = len(timelines[0].frame_ns) if timelines else 0
+    print(f"{frames} frames x {len(configs)} configs in {elapsed:.2f}s ({engine})")
+    print("dark_threshold  saturation_boost  dark_frames")
+    for timeline in timelines:
+        config = timeline.config
+        print(
+            f"{config.dark_threshold:14.3f}  {config.saturation_boost:16.3f}"
+            f"  {timeline.dark_fraction:10.1%}"
+        )
+    if output is not None:
+        arrays: Dict[str, np.ndarray] = {}
+        for index, timeline in enumerate(timelines):
+            arrays.update(timeline.to_arrays(prefix=f"c{index}_"))
+            arrays[f"c{index}_params"] = np.asarray(
+                [timeline.config.dark_threshold, timeline.config.saturation_boost]
+            )
+        np.savez(output, **arrays)
 
 
 async def _serve(app, host: str, port: int) -> None:
@@ -32,30 +168,44 @@ async def _serve(app, host: str, port: int) -> None:
 async def main() -> None:
     configure_logging()
     env = load_env_config()
-    config_dir = Path.cwd() / "config"
-    store = JsonConfigStore(config_dir)
-    default = AppConfig(
-        display_id=1,
-        zone=ZoneRect(x=0, y=0, width=100, height=100),
-        preview_interval_sec=1.0,
-        analysis_hz=25.0,
-        dark_threshold=0.1,
-        saturation_boost=0.2,
-    )
-    config = store.load_config(default)
+    store = JsonConfigStore(Path.cwd() / "config")
+    config = store.load_config(DEFAULT_CONFIG)
 
     ha_client = HomeAssistantClient(
-        base_url=env.ha_base_url, token=env.ha_token, entity_id=env.ha_entity_id
+        base_url=env.ha_base_url,
+        token=env.ha_token,
+        entity_id=env.ha_entity_id,
+        transport=os.getenv("HA_TRANSPORT", TRANSPORT_REST),
     )
-    frame_provider = WinCaptureFrameProvider(scale=0.5)
+    if os.getenv("HA_ADAPTIVE_RATE", "1") == "1":
+        ha_client.rate_control = AimdRateController(
+            rate_hz=1000.0 / ha_client.min_interval_ms,
+            max_rate_hz=float(os.getenv("HA_MAX_RATE_HZ", "30")),
+        )
+    # CAPTURE_SOURCE (or REPLAY_FILE) serves synthetic frames or a recording
+    # instead of the display, e.g. on Linux.
+    source = os.getenv("CAPTURE_SOURCE") or os.getenv("REPLAY_FILE", "display")
+    frame_provider = create_frame_provider(source)
     publisher = MjpegPreviewPublisher()
     runtime_state = RuntimeState()
+    engine = os.getenv("ANALYSIS_ENGINE", AUTO_BACKEND)
+    if engine == AUTO_BACKEND:
+        calibration = await asyncio.to_thread(
+            calibrate_backends, config.zone.width, config.zone.height
+        )
+        engine = calibration.selected
+        runtime_state.diagnostics.backend_timings_ms = calibration.timings_ms
+    runtime_state.diagnostics.analysis_backend = engine
     controller = SyncController(
         frame_provider=frame_provider,
         ha_client=ha_client,
         publisher=publisher,
         runtime_state=runtime_state,
         config=config,
+        dominant_engine=engine,
+        output_delta_e=float(os.getenv("OUTPUT_DELTA_E", "2.0")),
+        output_refresh_sec=float(os.getenv("OUTPUT_REFRESH_SEC", "30")),
+        output_transitions=os.getenv("HA_TRANSITIONS", "1") == "1",
     )
 
     local_api = LocalApiServer(store, controller, runtime_state, publisher)
@@ -71,11 +221,10 @@ async def main() -> None:
             "/api/sync/resume",
             "/api/sync/stop",
         },
-        allowed_prefixes=(
-            "/api/presets/",
-        ),
+        allowed_prefixes=("/api/presets/",),
     )
-    ui_server = LanUiServer(bridge, Path(__file__).parent / "web" / "static")
+    # Same process: LAN viewers subscribe to the publisher without a localhost hop.
+    ui_server = LanUiServer(bridge, Path(__file__).parent / "web" / "static", publisher)
 
     local_port = int(os.getenv("LOCAL_API_PORT", "8765"))
     ui_port = int(os.getenv("LAN_UI_PORT", "8080"))
@@ -89,6 +238,7 @@ async def main() -> None:
         await controller.stop()
         await ha_client.turn_off()
         await ha_client.close()
+        publisher.close()
 
 
 if __name__ == "__main__":
@@ -1,34 +1,230 @@
-"""MJPEG preview publisher."""
+"""MJPEG preview publisher.
+
+Each preview frame is encoded at most once per rendition that someone is
+watching, and the encoded part is fanned out to every viewer of that
+rendition. With no viewers nothing is encoded. A viewer awaits new frames
+instead of polling, receives each frame at most once, and keeps only a short
+queue: a viewer that reads slower than frames arrive drops the oldest queued
+frames and catches up on the newest.
+"""
 
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from io import BytesIO
-from typing import Generator, Optional
+from threading import Lock
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Literal, Optional
 
 import numpy as np
 from PIL import Image
 
-from ambilight.utils.bounded_queue import BoundedQueue
+BOUNDARY = b"--frame"
+DEFAULT_QUALITY = 80
+# Width caps of the named renditions; ``full`` is the preview as captured.
+RENDITION_WIDTHS: Dict[str, Optional[int]] = {"thumb": 160, "medium": 320, "full": None}
+PreviewSize = Literal["thumb", "medium", "full"]
+
+
+@dataclass(frozen=True)
+class Rendition:
+    """Encoding parameters of one preview stream."""
+
+    max_width: Optional[int] = None
+    quality: int = DEFAULT_QUALITY
+
+    @classmethod
+    def named(cls, size: str = "full", quality: int = DEFAULT_QUALITY) -> "Rendition":
+        if size not in RENDITION_WIDTHS:
+            raise ValueError(f"unknown preview size {size!r}")
+        return cls(RENDITION_WIDTHS[size], quality)
+
+
+def encode_part(pixels: np.ndarray, rendition: Rendition) -> bytes:
+    """JPEG-encode ``pixels`` for ``rendition`` and wrap it as one multipart part."""
+
+    image = Image.fromarray(pixels).convert("RGB")
+    if rendition.max_width and image.width > rendition.max_width:
+        image = image.reduce(-(-image.width // rendition.max_width))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=rendition.quality)
+    jpeg = buffer.getvalue()
+    return (
+        BOUNDARY
+        + b"\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n" % len(jpeg)
+        + jpeg
+        + b"\r\n"
+    )
+
+
+@dataclass
+class PreviewViewer:
+    """One connected stream with at most ``max_frames`` frames waiting to be sent."""
+
+    loop: asyncio.AbstractEventLoop
+    rendition: Rendition = Rendition()
+    max_frames: int = 2
+    frames_sent: int = 0
+    bytes_sent: int = 0
+    dropped: int = 0
+    _queue: Deque[bytes] = field(default_factory=deque, init=False)
+    _ready: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _last_seq: int = field(default=0, init=False)
+
+    def offer(self, seq: int, part: bytes) -> None:
+        """Queue frame ``seq`` unless already seen; runs on the viewer's loop."""
+
+        if seq <= self._last_seq:
+            return
+        self._last_seq = seq
+        if len(self._queue) >= self.max_frames:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(part)
+        self._ready.set()
+
+    async def next(self) -> bytes:
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
 
 
 class MjpegPreviewPublisher:
-    """Publish MJPEG frames from the latest available snapshot."""
-
-    def __init__(self, max_frames: int = 2) -> None:
-        self._frames = BoundedQueue[bytes](maxlen=max_frames)
-
-    def update_frame(self, pixels: np.ndarray) -> None:
-        image = Image.fromarray(pixels).convert("RGB")
-        buffer = BytesIO()
-        image.save(buffer, format="JPEG", quality=80)
-        self._frames.put(buffer.getvalue())
-
-    def stream(self) -> Generator[bytes, None, None]:
-        boundary = b"--frame"
-        while True:
-            frame = self._frames.get_latest()
-            if frame is None:
-                yield b""
+    """Publish MJPEG frames to any number of viewers.
+
+    ``update_frame`` may be called from any thread; viewers are served on
+    their own event loop. Renditions are encoded on a small thread pool and
+    cached for the current frame, so encoding cost depends on the number of
+    distinct renditions watched, not on the number of viewers.
+    ``max_frames`` bounds each viewer's queue.
+    """
+
+    def __init__(self, max_frames: int = 2, encode_workers: int = 2) -> None:
+        self.max_frames = max_frames
+        self.frames_published = 0
+        self.frames_encoded = 0
+        self._executor = ThreadPoolExecutor(
+            encode_workers, thread_name_prefix="mjpeg-encode"
+        )
+        self._lock = Lock()
+        self._pixels: Optional[np.ndarray] = None
+        # Encoded parts of frame ``frames_published``, per rendition.
+        self._parts: Dict[Rendition, bytes] = {}
+        self._viewers: List[PreviewViewer] = []
+        # Totals of disconnected viewers, so counters never go backwards.
+        self._closed = {"frames_sent": 0, "bytes_sent": 0, "frames_dropped": 0}
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._viewers)
+
+    def update_frame(self, pixels: np.ndarray) -> int:
+        """Offer a new preview frame; returns its sequence number.
+
+        Only renditions with at least one viewer are encoded. A copy of the
+        pixels is kept so a viewer connecting later can be served the latest
+        frame; the caller's array may be a pooled buffer reused for later
+        captures. Each frame gets a fresh copy, never rewritten, because a
+        late viewer may still be encoding the previous one.
+        """
+
+        pixels = pixels.copy()
+        with self._lock:
+            self.frames_published += 1
+            seq = self.frames_published
+            self._pixels = pixels
+            self._parts = {}
+            wanted = {viewer.rendition for viewer in self._viewers}
+        if not wanted:
+            return seq
+        parts = self._encode(seq, pixels, wanted)
+        with self._lock:
+            viewers = list(self._viewers)
+        for viewer in viewers:
+            part = parts.get(viewer.rendition)
+            if part is None:
                 continue
-            yield boundary + b"\r\n"
-            yield b"Content-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
+            try:
+                viewer.loop.call_soon_threadsafe(viewer.offer, seq, part)
+            except RuntimeError:
+                # The viewer's loop has already been closed.
+                pass
+        return seq
+
+    def stats(self) -> Dict[str, int]:
+        """Viewer count, frames encoded, and frames/bytes sent and dropped over all viewers."""
+
+        with self._lock:
+            totals = dict(self._closed)
+            for viewer in self._viewers:
+                totals["frames_sent"] += viewer.frames_sent
+                totals["bytes_sent"] += viewer.bytes_sent
+                totals["frames_dropped"] += viewer.dropped
+            totals["subscribers"] = len(self._viewers)
+            totals["frames_encoded"] = self.frames_encoded
+        return totals
+
+    async def stream(
+        self, rendition: Optional[Rendition] = None
+    ) -> AsyncIterator[bytes]:
+        """Multipart body for one viewer, starting with the latest frame if any."""
+
+        if rendition is None:
+            rendition = Rendition()
+        loop = asyncio.get_running_loop()
+        viewer = PreviewViewer(loop, rendition, self.max_frames)
+        with self._lock:
+            self._viewers.append(viewer)
+            seq, pixels = self.frames_published, self._pixels
+            part = self._parts.get(rendition)
+        try:
+            if pixels is not None:
+                if part is None:
+                    encode = partial(self._encode, seq, pixels, (rendition,))
+                    part = (await loop.run_in_executor(self._executor, encode))[
+                        rendition
+                    ]
+                viewer.offer(seq, part)
+            while True:
+                part = await viewer.next()
+                yield part
+                viewer.frames_sent += 1
+                viewer.bytes_sent += len(part)
+        finally:
+            with self._lock:
+                self._viewers.remove(viewer)
+                self._closed["frames_sent"] += viewer.frames_sent
+                self._closed["bytes_sent"] += viewer.bytes_sent
+                self._closed["frames_dropped"] += viewer.dropped
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _encode(
+        self, seq: int, pixels: np.ndarray, renditions: Iterable[Rendition]
+    ) -> Dict[Rendition, bytes]:
+        """Encode renditions not yet cached for frame ``seq``, in parallel when several."""
+
+        with self._lock:
+            cached = dict(self._parts) if seq == self.frames_published else {}
+        missing = [rendition for rendition in renditions if rendition not in cached]
+        if len(missing) == 1:
+            encoded = {missing[0]: encode_part(pixels, missing[0])}
+        else:
+            encoded = dict(
+                zip(
+                    missing,
+                    self._executor.map(partial(encode_part, pixels), missing),
+                    strict=True,
+                )
+            )
+        with self._lock:
+            self.frames_encoded += len(encoded)
+            if seq == self.frames_published:
+                self._parts.update(encoded)
+        return {**cached, **encoded}
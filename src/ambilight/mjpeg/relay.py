@@ -0,0 +1,151 @@
+"""Share one upstream MJPEG stream among many downstream viewers.
+
+Used by the LAN UI server when it runs without in-process access to the
+preview publisher: each distinct rendition is fetched from the local API
+once, split back into whole multipart parts, and fanned out with the same
+bounded, drop-to-latest viewer queues the publisher uses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from ambilight.mjpeg.publisher import BOUNDARY, PreviewViewer
+from ambilight.utils.logging import get_logger
+
+QueryKey = Tuple[Tuple[str, str], ...]
+
+
+class MultipartSplitter:
+    """Reassemble ``multipart/x-mixed-replace`` parts from arbitrary chunks."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Add a chunk; returns the parts it completed, each starting at the boundary."""
+
+        buffer = self._buffer
+        buffer.extend(chunk)
+        parts: List[bytes] = []
+        while True:
+            start = buffer.find(BOUNDARY)
+            if start < 0:
+                # Keep a possible partial boundary at the tail.
+                del buffer[: max(0, len(buffer) - len(BOUNDARY))]
+                return parts
+            del buffer[:start]
+            header_end = buffer.find(b"\r\n\r\n")
+            if header_end < 0:
+                return parts
+            end = self._part_end(bytes(buffer[:header_end]), header_end + 4)
+            if end is None or len(buffer) < end:
+                return parts
+            parts.append(bytes(buffer[:end]))
+            del buffer[:end]
+
+    def _part_end(self, headers: bytes, body_start: int) -> Optional[int]:
+        for line in headers.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                try:
+                    length = int(value)
+                except ValueError:
+                    break
+                if length >= 0:
+                    return body_start + length + 2
+                break
+        # No usable length: the part runs until the next boundary.
+        following = self._buffer.find(b"\r\n" + BOUNDARY, body_start)
+        return None if following < 0 else following + 2
+
+
+@dataclass
+class _Channel:
+    viewers: List[PreviewViewer] = field(default_factory=list)
+    latest: Optional[Tuple[int, bytes]] = None
+    seq: int = 0
+    task: Optional[asyncio.Task] = None
+
+
+class PreviewRelay:
+    """One upstream request per distinct query, shared by all viewers of it.
+
+    The upstream request starts with the first viewer and is closed when
+    the last one leaves; if it fails it is retried while viewers remain.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        path: str = "/api/preview/stream",
+        max_frames: int = 2,
+        retry_delay_sec: float = 1.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._base_url = base_url
+        self._path = path
+        self._max_frames = max_frames
+        self._retry_delay_sec = retry_delay_sec
+        self._transport = transport
+        self._channels: Dict[QueryKey, _Channel] = {}
+        self.upstream_connections = 0
+        self._logger = get_logger("ambilight.preview_relay")
+
+    @property
+    def subscribers(self) -> int:
+        return sum(len(channel.viewers) for channel in self._channels.values())
+
+    @property
+    def upstreams(self) -> int:
+        return len(self._channels)
+
+    async def stream(self, params: Dict[str, str]) -> AsyncIterator[bytes]:
+        key = tuple(sorted(params.items()))
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = _Channel()
+            channel.task = asyncio.create_task(self._pump(channel, dict(key)))
+        viewer = PreviewViewer(asyncio.get_running_loop(), max_frames=self._max_frames)
+        channel.viewers.append(viewer)
+        if channel.latest is not None:
+            viewer.offer(*channel.latest)
+        try:
+            while True:
+                part = await viewer.next()
+                yield part
+                viewer.frames_sent += 1
+                viewer.bytes_sent += len(part)
+        finally:
+            channel.viewers.remove(viewer)
+            if not channel.viewers:
+                del self._channels[key]
+                channel.task.cancel()
+
+    async def _pump(self, channel: _Channel, params: Dict[str, str]) -> None:
+        while True:
+            splitter = MultipartSplitter()
+            try:
+                async with httpx.AsyncClient(
+                    base_url=self._base_url, transport=self._transport, timeout=None
+                ) as client:
+                    async with client.stream(
+                        "GET", self._path, params=params
+                    ) as response:
+                        self.upstream_connections += 1
+                        async for chunk in response.aiter_bytes():
+                            for part in splitter.feed(chunk):
+                                channel.seq += 1
+                                channel.latest = (channel.seq, part)
+                                for viewer in channel.viewers:
+                                    viewer.offer(channel.seq, part)
+            except httpx.HTTPError as exc:
+                self._logger.warning("Preview upstream failed: %s", exc)
+            except Exception:
+                # Anything else would end the task silently and strand every viewer.
+                self._logger.exception("Preview upstream stream broken; reconnecting")
+            await asyncio.sleep(self._retry_delay_sec)
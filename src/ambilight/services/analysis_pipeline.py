@@ -0,0 +1,348 @@
+"""CPU-bound per-frame analysis, independent of asyncio and Home Assistant."""
+
+from __future__ import annotations
+
+import colorsys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ambilight.analysis.backends import AnalysisBackend, get_backend
+from ambilight.analysis.change_detector import FrameChangeDetector
+from ambilight.analysis.color_lut import ColorLut, build_color_lut
+from ambilight.analysis.dark_detector import DarkDetector
+from ambilight.analysis.dominant_color import (
+    DEFAULT_ENGINE,
+    ENGINE_MEDIANCUT,
+    histogram_dominant,
+)
+from ambilight.analysis.multi_zone import MultiZoneAnalyzer
+from ambilight.analysis.smoothing import SmoothingFilter, create_smoothing_filter
+from ambilight.analysis.tile_histogram import TileHistogram
+from ambilight.analysis.zone_stats import ZoneStats, zone_stats_from_histogram
+from ambilight.capture.frame_provider import Frame
+from ambilight.capture.regions import bounding_region
+from ambilight.config.models import AppConfig
+from ambilight.state.zone_state import ZoneRect
+
+RgbColor = Tuple[int, int, int]
+HsvColor = Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class ZoneTarget:
+    """Smoothed color for one output zone's entity."""
+
+    name: str
+    entity_id: str
+    color: RgbColor
+    dark: bool
+
+
+@dataclass(frozen=True)
+class ZoneMeasurement:
+    """Unsmoothed analysis of one zone in one frame."""
+
+    stats: ZoneStats
+    boosted: RgbColor
+
+
+# A zone's packed-RGB bin counts and its dominant color.
+Histogram = Tuple[np.ndarray, RgbColor]
+
+
+@dataclass(frozen=True)
+class ZoneHistograms:
+    """Config-independent part of a measurement: one histogram per zone."""
+
+    zone: ZoneRect
+    main: Histogram
+    zones: Tuple[Histogram, ...] = ()
+    changed: bool = True
+
+
+@dataclass(frozen=True)
+class FrameMeasurement:
+    """Everything ``process`` derives from a frame before temporal smoothing."""
+
+    zone: ZoneRect
+    main: ZoneMeasurement
+    zones: Tuple[ZoneMeasurement, ...] = ()
+    changed: bool = True
+
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    frame_timestamp: datetime
+    zone: ZoneRect
+    color: RgbColor
+    hsv: HsvColor
+    dark: bool
+    changed: bool
+    stats: ZoneStats
+    zones: Tuple[ZoneTarget, ...] = ()
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def _elapsed_ms(start_ns: int) -> float:
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
+
+@dataclass
+class AnalysisPipeline:
+    """Turn frames into smoothed, post-processed colors for every zone.
+
+    ``process`` is ``measure`` (stateless apart from caches) followed by
+    ``smooth`` (stateful, time-ordered). ``measure`` itself is ``histograms``,
+    which depends only on zone geometry, plus ``derive``, which applies a
+    config's threshold and color LUT. Offline analysis runs these pieces
+    separately: measurements in parallel, smoothing in frame order.
+    With output zones and a histogram backend, the main zone is binned in
+    the output zones' pass instead of through the tile cache. Holds the
+    per-zone caches (change detection, tile histograms, smoothing state)
+    and is meant to be driven by a single thread.
+    """
+
+    engine: str = DEFAULT_ENGINE
+    tile_min_area: int = 256 * 256
+
+    def __post_init__(self) -> None:
+        self.backend: AnalysisBackend = get_backend(self.engine)
+        self.change_detector = FrameChangeDetector()
+        self.tiles = TileHistogram()
+        self._smoothing_mode: Optional[str] = None
+        self._smoothing: Optional[SmoothingFilter] = None
+        self._main_histogram: Optional[Histogram] = None
+        self._derivations: Dict[tuple, tuple] = {}
+        self._luts: Dict[Tuple[float, float], ColorLut] = {}
+        self._dark_detector: Optional[DarkDetector] = None
+        self._zone_analyzer: Optional[MultiZoneAnalyzer] = None
+        self._zone_detector = FrameChangeDetector()
+        self._zone_histograms: Tuple[Histogram, ...] = ()
+        self._zone_filters: Dict[str, SmoothingFilter] = {}
+
+    def process(
+        self, frame: Frame, frame_ns: int, config: AppConfig
+    ) -> Optional[AnalysisResult]:
+        """Analyse one frame; None if the frame does not cover the configured zones."""
+
+        stage_ms: Dict[str, float] = {}
+        measurement = self.measure(frame, config, stage_ms)
+        if measurement is None:
+            return None
+
+        start = time.perf_counter_ns()
+        smoothed, hsv, dark = self.smooth(measurement.main, frame_ns, config)
+        stage_ms["color"] = _elapsed_ms(start)
+
+        zones: Tuple[ZoneTarget, ...] = ()
+        if config.zones:
+            start = time.perf_counter_ns()
+            zones = self.smooth_zones(measurement.zones, frame_ns, config)
+            stage_ms["zones"] = stage_ms.get("zones", 0.0) + _elapsed_ms(start)
+        return AnalysisResult(
+            frame_timestamp=frame.timestamp,
+            zone=measurement.zone,
+            color=smoothed,
+            hsv=hsv,
+            dark=dark,
+            changed=measurement.changed,
+            stats=measurement.main.stats,
+            zones=zones,
+            stage_ms=stage_ms,
+        )
+
+    def measure(
+        self,
+        frame: Frame,
+        config: AppConfig,
+        stage_ms: Optional[Dict[str, float]] = None,
+    ) -> Optional[FrameMeasurement]:
+        """Dominant colors and statistics of the main and output zones, unsmoothed."""
+
+        stage_ms = {} if stage_ms is None else stage_ms
+        raw = self.histograms(frame, config, stage_ms)
+        if raw is None:
+            return None
+        start = time.perf_counter_ns()
+        measurement = self.derive(raw, config)
+        stage_ms["analyse"] = stage_ms.get("analyse", 0.0) + _elapsed_ms(start)
+        return measurement
+
+    def histograms(
+        self,
+        frame: Frame,
+        config: AppConfig,
+        stage_ms: Optional[Dict[str, float]] = None,
+    ) -> Optional[ZoneHistograms]:
+        """Histogram the main and output zones; only their rectangles are read from config."""
+
+        stage_ms = {} if stage_ms is None else stage_ms
+        start = time.perf_counter_ns()
+        bounds = frame.bounds
+        zone = config.zone.clamp_to_bounds(bounds)
+        cropped = frame.view(zone)
+        if cropped is None:
+            return None
+        # With a histogram backend the main zone joins the output zones' pass,
+        # so the pixels they share (usually all of the output zones') are
+        # binned once and each output zone only adds its cells' bookkeeping.
+        batched = bool(config.zones) and self.backend.histogram is not None
+        if config.zones:
+            rects = tuple(
+                output.rect.clamp_to_bounds(bounds) for output in config.zones
+            )
+            if batched:
+                rects = (zone, *rects)
+            covered = bounding_region(rects)
+            zone_pixels = frame.view(covered)
+            if zone_pixels is None:
+                return None
+            # Zone rectangles relative to the covered block.
+            local_rects = tuple(
+                ZoneRect(
+                    x=r.x - covered.x, y=r.y - covered.y, width=r.width, height=r.height
+                )
+                for r in rects
+            )
+        if batched:
+            changed = self._zone_detector.has_changed(zone_pixels, key=rects)
+        else:
+            changed = self.change_detector.has_changed(cropped, key=zone)
+        stage_ms["detect"] = _elapsed_ms(start)
+
+        start = time.perf_counter_ns()
+        zones: Tuple[Histogram, ...] = ()
+        if batched:
+            histograms = self._zone_pass(zone_pixels, local_rects, changed)
+            self._main_histogram, zones = histograms[0], histograms[1:]
+            stage_ms["analyse"] = _elapsed_ms(start)
+        else:
+            if changed or self._main_histogram is None:
+                self._main_histogram = self._histogram(cropped)
+            stage_ms["analyse"] = _elapsed_ms(start)
+            if config.zones:
+                start = time.perf_counter_ns()
+                zones_changed = self._zone_detector.has_changed(zone_pixels, key=rects)
+                zones = self._zone_pass(zone_pixels, local_rects, zones_changed)
+                stage_ms["zones"] = _elapsed_ms(start)
+        return ZoneHistograms(zone, self._main_histogram, zones, changed)
+
+    def derive(self, raw: ZoneHistograms, config: AppConfig) -> FrameMeasurement:
+        """Apply a config's dark threshold and color LUT to zone histograms.
+
+        Results are cached per histogram and config, so unchanged zones and
+        repeated configs cost a dictionary lookup.
+        """
+
+        main = self._derived("main", raw.main, config)
+        zones = tuple(
+            self._derived(index, histogram, config)
+            for index, histogram in enumerate(raw.zones)
+        )
+        return FrameMeasurement(
+            zone=raw.zone, main=main, zones=zones, changed=raw.changed
+        )
+
+    def smooth(
+        self, measurement: ZoneMeasurement, frame_ns: int, config: AppConfig
+    ) -> Tuple[RgbColor, HsvColor, bool]:
+        """Advance the main zone's filter; returns (color, hsv, dark)."""
+
+        lut = self._color_lut(config)
+        smoothed = self._smoothing_filter(config).update(measurement.boosted, frame_ns)
+        hsv = colorsys.rgb_to_hsv(
+            smoothed[0] / 255.0, smoothed[1] / 255.0, smoothed[2] / 255.0
+        )
+        dark = lut.is_dark(smoothed) or self._dark_detector.is_dark_zone(
+            measurement.stats
+        )
+        return smoothed, (hsv[0], hsv[1], hsv[2]), dark
+
+    def smooth_zones(
+        self, measurements: Sequence[ZoneMeasurement], frame_ns: int, config: AppConfig
+    ) -> Tuple[ZoneTarget, ...]:
+        """Advance each output zone's own filter."""
+
+        lut = self._color_lut(config)
+        self._smoothing_filter(config)
+        targets = []
+        for zone, measurement in zip(config.zones, measurements, strict=True):
+            smoothing = self._zone_filters.get(zone.name)
+            if smoothing is None:
+                smoothing = create_smoothing_filter(self._smoothing_mode)
+                self._zone_filters[zone.name] = smoothing
+            smoothed = smoothing.update(measurement.boosted, frame_ns)
+            dark = lut.is_dark(smoothed) or self._dark_detector.is_dark_zone(
+                measurement.stats
+            )
+            targets.append(ZoneTarget(zone.name, zone.entity_id, smoothed, dark))
+        return tuple(targets)
+
+    def _histogram(self, cropped: np.ndarray) -> Histogram:
+        backend = self.backend
+        area = cropped.shape[0] * cropped.shape[1]
+        if backend.name != ENGINE_MEDIANCUT and area >= self.tile_min_area:
+            color = self.tiles.update(cropped)
+            # Copied: the tile cache updates its merged counts in place.
+            return self.tiles.counts.copy(), color
+        if backend.histogram is not None:
+            return backend.histogram(cropped)
+        counts, _ = histogram_dominant(cropped)
+        return counts, backend.extract(cropped)
+
+    def _zone_pass(
+        self, pixels: np.ndarray, rects: Tuple[ZoneRect, ...], changed: bool
+    ) -> Tuple[Histogram, ...]:
+        """Histogram every zone in ``rects`` in one pass, or reuse the last pass."""
+
+        if self._zone_analyzer is None or tuple(self._zone_analyzer.zones) != rects:
+            self._zone_analyzer = MultiZoneAnalyzer(rects)
+            self._zone_histograms = ()
+        if changed or not self._zone_histograms:
+            self._zone_histograms = tuple(self._zone_analyzer.analyse(pixels))
+        return self._zone_histograms
+
+    def _derived(
+        self, slot: object, histogram: Histogram, config: AppConfig
+    ) -> ZoneMeasurement:
+        key = (slot, id(config))
+        cached = self._derivations.get(key)
+        # The entry holds ``config`` itself, so its id cannot be reused meanwhile.
+        if cached is not None and cached[0] is histogram and cached[1] is config:
+            return cached[2]
+        counts, color = histogram
+        lut = self._color_lut(config)
+        stats = zone_stats_from_histogram(counts, color, config.dark_threshold)
+        measurement = ZoneMeasurement(stats, lut.apply(color))
+        if len(self._derivations) >= 256:
+            self._derivations.clear()
+        self._derivations[key] = (histogram, config, measurement)
+        return measurement
+
+    def _smoothing_filter(self, config: AppConfig) -> SmoothingFilter:
+        if config.smoothing_mode != self._smoothing_mode or self._smoothing is None:
+            self._smoothing_mode = config.smoothing_mode
+            self._smoothing = create_smoothing_filter(self._smoothing_mode)
+            self._zone_filters.clear()
+        return self._smoothing
+
+    def _color_lut(self, config: AppConfig) -> ColorLut:
+        """The LUT for a config's post-processing, built once per parameter set."""
+
+        key = (config.saturation_boost, config.dark_threshold)
+        lut = self._luts.get(key)
+        if lut is None:
+            # Sweeps alternate between configs every frame; live edits add a few.
+            if len(self._luts) >= 16:
+                self._luts.clear()
+            lut = self._luts[key] = build_color_lut(*key)
+        if (
+            self._dark_detector is None
+            or self._dark_detector.threshold != config.dark_threshold
+        ):
+            self._dark_detector = DarkDetector(config.dark_threshold)
+        return lut
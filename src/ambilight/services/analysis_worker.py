@@ -0,0 +1,122 @@
+"""Dedicated thread running analysis off the asyncio event loop."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import Optional, Tuple
+
+from ambilight.capture.frame_provider import Frame
+from ambilight.config.models import AppConfig
+from ambilight.services.analysis_pipeline import AnalysisPipeline, AnalysisResult
+from ambilight.services.frame_hub import FrameHub, FrameSubscription
+from ambilight.state.zone_state import ZoneRect
+from ambilight.utils.latest_slot import LatestValueSlot
+from ambilight.utils.logging import get_logger
+
+
+@dataclass
+class AnalysisWorker:
+    """Analyse frames from the hub and publish each result to ``results``.
+
+    The worker sleeps on its hub subscription and starts analysing as soon as
+    a frame is captured, so capture-to-result latency is the processing time.
+    A ``None`` result means the provider had no frame. The heavy stages are
+    NumPy calls that release the GIL, so the event loop keeps serving HTTP
+    while a frame is analysed. ``config`` and ``is_active`` are read once per
+    wake-up, so config changes and pause/resume need no extra signalling.
+    Without new frames the last one is re-analysed only until the smoothed
+    output settles.
+    """
+
+    hub: FrameHub
+    pipeline: AnalysisPipeline
+    config: Callable[[], AppConfig]
+    is_active: Callable[[], bool] = lambda: True
+    results: LatestValueSlot[Optional[AnalysisResult]] = field(
+        default_factory=LatestValueSlot
+    )
+    _thread: Optional[threading.Thread] = field(default=None, init=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+    _regions: Optional[Tuple[ZoneRect, ...]] = field(default=None, init=False)
+    _last_config: Optional[AppConfig] = field(default=None, init=False)
+    _last_output: Optional[tuple] = field(default=None, init=False)
+    _settled: bool = field(default=False, init=False)
+
+    def __post_init__(self) -> None:
+        self._logger = get_logger("ambilight.worker")
+        self.subscription: FrameSubscription = self.hub.subscribe("analysis")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._settled = False
+        self._thread = threading.Thread(
+            target=self._run, name="ambilight-analysis", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        version = 0
+        frame: Optional[Frame] = None
+        while not self._stop.is_set():
+            config = self.config()
+            interval = 1.0 / max(1.0, config.analysis_hz)
+            self.subscription.max_hz = config.analysis_hz
+            self._sync_regions(config)
+            if config is not self._last_config:
+                # New zones or color settings: the current frame needs analysis again.
+                self._last_config = config
+                self._settled = False
+            delivery = self.subscription.frames.wait(version, timeout=interval)
+            fresh = delivery is not None
+            if fresh:
+                version, frame = delivery
+            if not self.is_active():
+                # Re-analyse the current frame on resume even if it is unchanged.
+                self._settled = False
+                continue
+            if frame is None:
+                if fresh:
+                    self.results.put(None)
+                continue
+            if not fresh and self._settled:
+                continue
+            try:
+                self._analyse(frame, config)
+            except Exception:
+                self._logger.exception("analysis step failed")
+
+    def _analyse(self, frame: Frame, config: AppConfig) -> None:
+        result = self.pipeline.process(frame, time.monotonic_ns(), config)
+        if result is None:
+            # Captured before the provider picked up new regions.
+            return
+        output = (result.color, result.dark, result.zones)
+        self._settled = output == self._last_output
+        self._last_output = output
+        stage_ms = {"capture": self.hub.capture_ms, **result.stage_ms}
+        stage_ms["total"] = sum(stage_ms.values())
+        self.results.put(replace(result, stage_ms=stage_ms))
+
+    def _sync_regions(self, config: AppConfig) -> None:
+        """Tell the hub which regions analysis needs when they change."""
+
+        regions = (config.zone, *(output.rect for output in config.zones))
+        if regions == self._regions:
+            return
+        self._regions = regions
+        self.hub.set_regions(regions)
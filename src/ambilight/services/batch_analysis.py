@@ -0,0 +1,217 @@
+"""Offline color timelines from recordings or image folders, as fast as possible.
+
+Analysis is split the way ``AnalysisPipeline.process`` is: measuring runs in
+a process pool over chunks of frames, and ``smooth`` runs in frame order in
+the parent. Both halves are the live pipeline's own code, so a timeline
+matches what ``SyncController`` would have sent for the same frames.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from ambilight.analysis.dominant_color import DEFAULT_ENGINE
+from ambilight.capture.frame_provider import Frame
+from ambilight.capture.recording import MAGIC, FrameRecording
+from ambilight.config.models import AppConfig
+from ambilight.services.analysis_pipeline import AnalysisPipeline, FrameMeasurement
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp"}
+
+
+@dataclass(frozen=True)
+class ZoneTimeline:
+    """Per-frame colors of one zone: raw dominant, smoothed output, dark flag."""
+
+    dominant: np.ndarray
+    color: np.ndarray
+    dark: np.ndarray
+
+
+@dataclass(frozen=True)
+class ColorTimeline:
+    config: AppConfig
+    frame_ns: np.ndarray
+    main: ZoneTimeline
+    zones: Dict[str, ZoneTimeline]
+
+    @property
+    def dark_fraction(self) -> float:
+        return float(self.main.dark.mean()) if self.main.dark.size else 0.0
+
+    def to_arrays(self, prefix: str = "") -> Dict[str, np.ndarray]:
+        """Flat name -> array mapping for ``np.savez``."""
+
+        arrays = {f"{prefix}frame_ns": self.frame_ns}
+        for name, timeline in (("main", self.main), *self.zones.items()):
+            for field_name in ("dominant", "color", "dark"):
+                arrays[f"{prefix}{name}_{field_name}"] = getattr(timeline, field_name)
+        return arrays
+
+
+class FrameSource:
+    """Random access to recorded frames or a sorted folder of images."""
+
+    def __init__(self, path: Path, fps: float = 30.0) -> None:
+        self.path = Path(path)
+        self._recording: Optional[FrameRecording] = None
+        self._images: List[Path] = []
+        if self.path.is_dir():
+            self._images = sorted(
+                p for p in self.path.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES
+            )
+            step = int(1e9 / fps)
+            self.frame_ns = np.arange(len(self._images), dtype=np.int64) * step
+        else:
+            with open(self.path, "rb") as handle:
+                if handle.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{self.path} is neither a recording nor a folder")
+            self._recording = FrameRecording(self.path)
+            self.frame_ns = self._recording.capture_times_ns()
+
+    def __len__(self) -> int:
+        return len(self.frame_ns)
+
+    def frame(self, index: int) -> Frame:
+        if self._recording is not None:
+            pixels = self._recording.pixels(index)
+        else:
+            with Image.open(self._images[index]) as image:
+                pixels = np.asarray(image.convert("RGB"))
+        return Frame(pixels=pixels, timestamp=datetime.utcnow(), seq=index + 1)
+
+
+def _measure_chunk(
+    path: Path,
+    start: int,
+    stop: int,
+    configs: Sequence[AppConfig],
+    engine: str,
+    fps: float,
+) -> List[List[Optional[FrameMeasurement]]]:
+    """Measure frames ``start:stop`` for every config; runs in a pool worker.
+
+    Configs that share zone geometry share one pipeline, so a threshold or
+    boost sweep histograms each frame once and only re-derives per config.
+    Frames are histogrammed one at a time, as the live pipeline does: only
+    the chunks are parallel. Binning a stack of frames per numpy call
+    measured slower, as each frame is already one array-wide pass.
+    """
+
+    source = FrameSource(path, fps)
+    groups: Dict[tuple, List[int]] = {}
+    for index, config in enumerate(configs):
+        geometry = (config.zone, tuple(zone.rect for zone in config.zones))
+        groups.setdefault(geometry, []).append(index)
+    pipelines = [(AnalysisPipeline(engine), members) for members in groups.values()]
+    results: List[List[Optional[FrameMeasurement]]] = [[] for _ in configs]
+    for index in range(start, stop):
+        frame = source.frame(index)
+        for pipeline, members in pipelines:
+            raw = pipeline.histograms(frame, configs[members[0]])
+            for member in members:
+                measured = (
+                    None if raw is None else pipeline.derive(raw, configs[member])
+                )
+                results[member].append(measured)
+    return results
+
+
+def _chunks(count: int, chunk_frames: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + chunk_frames, count))
+        for start in range(0, count, chunk_frames)
+    ]
+
+
+def analyse_timeline(
+    path: Path,
+    configs: Sequence[AppConfig],
+    engine: str = DEFAULT_ENGINE,
+    workers: Optional[int] = None,
+    chunk_frames: int = 256,
+    fps: float = 30.0,
+) -> List[ColorTimeline]:
+    """Compute one color timeline per config for every frame in ``path``.
+
+    ``workers=1`` runs inline; otherwise chunks of ``chunk_frames`` frames
+    are measured in a process pool (default: one worker per CPU). Each
+    worker maps the source itself, so no frame data crosses processes.
+    Smoothing restarts at the first frame, as it does on ``SyncController``
+    start.
+    """
+
+    path = Path(path)
+    source = FrameSource(path, fps)
+    chunks = _chunks(len(source), chunk_frames)
+    workers = workers or os.cpu_count() or 1
+    measured: List[List[Optional[FrameMeasurement]]] = [[] for _ in configs]
+    if workers == 1 or len(chunks) <= 1:
+        parts = [
+            _measure_chunk(path, start, stop, configs, engine, fps)
+            for start, stop in chunks
+        ]
+    else:
+        with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as pool:
+            futures = [
+                pool.submit(_measure_chunk, path, start, stop, configs, engine, fps)
+                for start, stop in chunks
+            ]
+            parts = [future.result() for future in futures]
+    for part in parts:
+        for collected, chunk in zip(measured, part, strict=True):
+            collected.extend(chunk)
+    return [
+        _smooth_timeline(config, source.frame_ns, measurements, engine)
+        for config, measurements in zip(configs, measured, strict=True)
+    ]
+
+
+def _smooth_timeline(
+    config: AppConfig,
+    frame_ns: np.ndarray,
+    measurements: Sequence[Optional[FrameMeasurement]],
+    engine: str,
+) -> ColorTimeline:
+    pipeline = AnalysisPipeline(engine)
+    kept: List[int] = []
+    main: Tuple[list, list, list] = ([], [], [])
+    zones = {zone.name: ([], [], []) for zone in config.zones}
+    for index, measurement in enumerate(measurements):
+        if measurement is None:
+            continue
+        kept.append(index)
+        stamp = int(frame_ns[index])
+        color, _, dark = pipeline.smooth(measurement.main, stamp, config)
+        for column, value in zip(
+            main, (measurement.main.stats.dominant_rgb, color, dark), strict=True
+        ):
+            column.append(value)
+        targets = pipeline.smooth_zones(measurement.zones, stamp, config)
+        for target, zone_measurement in zip(targets, measurement.zones, strict=True):
+            values = (zone_measurement.stats.dominant_rgb, target.color, target.dark)
+            for column, value in zip(zones[target.name], values, strict=True):
+                column.append(value)
+    return ColorTimeline(
+        config=config,
+        frame_ns=frame_ns[kept],
+        main=_zone_timeline(*main),
+        zones={name: _zone_timeline(*columns) for name, columns in zones.items()},
+    )
+
+
+def _zone_timeline(dominant: list, color: list, dark: list) -> ZoneTimeline:
+    return ZoneTimeline(
+        dominant=np.asarray(dominant, dtype=np.uint8).reshape(-1, 3),
+        color=np.asarray(color, dtype=np.uint8).reshape(-1, 3),
+        dark=np.asarray(dark, dtype=bool),
+    )
@@ -0,0 +1,140 @@
+"""Latest-wins delivery of light commands, decoupled from analysis."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Tuple
+
+from ambilight.ha.client import HomeAssistantClient
+from ambilight.state.output_state import OutputStateTracker
+
+RgbColor = Tuple[int, int, int]
+
+
+@dataclass
+class CommandSender:
+    """Send the newest desired state of each light from one dedicated task.
+
+    ``submit`` never blocks: it puts the desired color (``None`` = off) for
+    an entity into a single-slot mailbox, replacing any unsent one. The task
+    transmits entries oldest entity first, so throttling, slow responses and
+    error backoff in the client delay only the sender, never analysis.
+    A color may carry a ``transition`` (seconds) for the light to fade over.
+    Updates replaced before being sent count as ``coalesced``; updates the
+    ``tracker`` finds indistinguishable from what the light was told, or
+    from the command in flight, count as ``dropped``. A failed send is
+    retried after ``retry_delay_sec`` unless a newer state superseded it.
+    When the tracker reports a light due for a refresh, its last state is
+    queued again from the task's own timer, since a static picture submits
+    nothing new.
+    """
+
+    ha_client: HomeAssistantClient
+    retry_delay_sec: float = 0.5
+    on_result: Optional[Callable[[bool], None]] = None
+    tracker: OutputStateTracker = field(default_factory=OutputStateTracker)
+    sent: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    failed: int = 0
+    _mailbox: "OrderedDict[Optional[str], Tuple[Optional[RgbColor], Optional[float]]]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _in_flight: Optional[Tuple[Optional[str], Optional[RgbColor]]] = field(
+        default=None, init=False
+    )
+    _wake: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _idle: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def submit(
+        self,
+        color: Optional[RgbColor],
+        entity_id: Optional[str] = None,
+        transition: Optional[float] = None,
+    ) -> None:
+        """Make ``color`` the desired state of ``entity_id`` (default entity if None)."""
+
+        if entity_id in self._mailbox:
+            self.coalesced += 1
+            self._mailbox[entity_id] = (color, transition)
+            return
+        if self._in_flight is not None and self._in_flight[0] == entity_id:
+            redundant = self.tracker.similar(self._in_flight[1], color)
+        else:
+            redundant = not self.tracker.needs_update(entity_id, color)
+        if redundant:
+            self.dropped += 1
+            return
+        self._mailbox[entity_id] = (color, transition)
+        self._idle.clear()
+        self._wake.set()
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted state was sent; False on timeout."""
+
+        if not self._mailbox and self._in_flight is None:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            self._queue_refreshes()
+            if not self._mailbox:
+                self._idle.set()
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), self.tracker.next_refresh_in()
+                    )
+                except TimeoutError:
+                    pass
+                continue
+            entity_id, (color, transition) = self._mailbox.popitem(last=False)
+            self._in_flight = (entity_id, color)
+            try:
+                if color is None:
+                    success = await self.ha_client.turn_off(entity_id=entity_id)
+                else:
+                    success = await self.ha_client.set_color(
+                        color, entity_id=entity_id, transition=transition
+                    )
+            finally:
+                self._in_flight = None
+            if self.on_result is not None:
+                self.on_result(success)
+            if success:
+                self.sent += 1
+                self.tracker.record(entity_id, color)
+                continue
+            self.failed += 1
+            self.tracker.forget(entity_id)
+            if entity_id not in self._mailbox:
+                self._mailbox[entity_id] = (color, transition)
+            await asyncio.sleep(self.retry_delay_sec)
+
+    def _queue_refreshes(self) -> None:
+        for entity_id, color in self.tracker.due():
+            busy = self._in_flight is not None and self._in_flight[0] == entity_id
+            if entity_id not in self._mailbox and not busy:
+                self._mailbox[entity_id] = (color, None)
+                self._idle.clear()
@@ -0,0 +1,186 @@
+"""Single capture pump fanning frames out to rate-limited subscribers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ambilight.capture.frame_provider import Frame, FrameProvider
+from ambilight.state.zone_state import ZoneRect
+from ambilight.utils.latest_slot import LatestValueSlot
+from ambilight.utils.logging import get_logger
+
+
+@dataclass
+class FrameSubscription:
+    """One consumer's view of the frame stream.
+
+    ``frames`` only ever holds the newest frame, so a slow subscriber drops
+    to the latest instead of queueing. Frames arriving faster than ``max_hz``
+    are held back and the newest one is delivered when the interval is up.
+    With ``preview_width`` set the subscriber receives the provider's
+    low-resolution full-frame preview instead of the analysis frame. While
+    ``paused`` nothing is delivered or rendered; the newest frame is
+    delivered on resume. A ``None`` value means the provider stopped
+    producing frames.
+    """
+
+    name: str
+    max_hz: float = 0.0
+    preview_width: Optional[int] = None
+    frames: LatestValueSlot[Optional[Frame]] = field(default_factory=LatestValueSlot)
+    delivered: int = 0
+    paused: bool = False
+    _pending: bool = field(default=False, init=False)
+    _pending_frame: Optional[Frame] = field(default=None, init=False)
+    _next_due: float = field(default=0.0, init=False)
+
+    @property
+    def dropped(self) -> int:
+        return self.frames.dropped
+
+
+@dataclass
+class FrameHub:
+    """Poll the provider on one thread and publish each new frame once.
+
+    Every provider call happens on the pump thread, so providers need no
+    locking. Repeated frames (same ``seq``) are counted in ``duplicates`` and
+    not published. Subscribers wait on their slot with ``wait`` from a thread
+    or ``wait_async`` from asyncio, so they wake as soon as a frame lands.
+    """
+
+    frame_provider: FrameProvider
+    capture_hz: float = 60.0
+    duplicates: int = 0
+    capture_ms: float = 0.0
+    _subscriptions: List[FrameSubscription] = field(default_factory=list, init=False)
+    _thread: Optional[threading.Thread] = field(default=None, init=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _regions: Optional[Tuple[ZoneRect, ...]] = field(default=None, init=False)
+    _regions_dirty: bool = field(default=False, init=False)
+    _last_seq: int = field(default=0, init=False)
+    _captured_seq: int = field(default=0, init=False)
+    _connected: Optional[bool] = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self._logger = get_logger("ambilight.capture")
+
+    def subscribe(
+        self, name: str, max_hz: float = 0.0, preview_width: Optional[int] = None
+    ) -> FrameSubscription:
+        subscription = FrameSubscription(name, max_hz, preview_width)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def set_regions(self, regions: Sequence[ZoneRect]) -> None:
+        """Ask the pump to narrow capture; applied before its next frame."""
+
+        with self._lock:
+            self._regions = tuple(regions)
+            self._regions_dirty = True
+
+    def stats(self) -> Dict[str, Tuple[int, int]]:
+        """(delivered, dropped) per subscriber."""
+
+        with self._lock:
+            return {
+                sub.name: (sub.delivered, sub.dropped) for sub in self._subscriptions
+            }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._last_seq = self._captured_seq = 0
+        self._connected = None
+        self._thread = threading.Thread(
+            target=self._run, name="ambilight-capture", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        interval = 1.0 / max(1.0, self.capture_hz)
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                self.pump()
+            except Exception:
+                self._logger.exception("frame capture failed")
+            self._stop.wait(max(0.0, interval - (time.perf_counter() - started)))
+
+    def pump(self) -> None:
+        """Capture once and deliver to every subscriber that is due."""
+
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            regions = self._regions if self._regions_dirty else None
+            self._regions_dirty = False
+        if regions is not None:
+            set_regions = getattr(self.frame_provider, "set_regions", None)
+            if set_regions is not None:
+                set_regions(regions)
+            # The current image must be re-cut even though its seq is unchanged.
+            self._last_seq = 0
+
+        start = time.perf_counter_ns()
+        frame = self.frame_provider.get_frame(since_seq=self._last_seq)
+        capture_ms = (time.perf_counter_ns() - start) / 1e6
+        if frame is None:
+            if self._connected is not False:
+                self._connected = False
+                for sub in subscriptions:
+                    sub._pending = False
+                    sub.frames.put(None)
+            return
+        self._connected = True
+        if frame.is_newer_than(self._last_seq):
+            # Same image re-cut for new regions; the full-frame preview is unchanged.
+            recut = frame.seq != 0 and frame.seq == self._captured_seq
+            self._last_seq = self._captured_seq = frame.seq
+            self.capture_ms = capture_ms
+            for sub in subscriptions:
+                if recut and sub.preview_width:
+                    continue
+                sub._pending = True
+                sub._pending_frame = None if sub.preview_width else frame
+        else:
+            self.duplicates += 1
+
+        now = time.monotonic()
+        for sub in subscriptions:
+            if sub.paused or not sub._pending or now < sub._next_due:
+                continue
+            delivery = sub._pending_frame
+            if delivery is None:
+                delivery = self._preview(sub.preview_width, frame)
+            sub._pending = False
+            sub._pending_frame = None
+            sub._next_due = now + (1.0 / sub.max_hz if sub.max_hz > 0 else 0.0)
+            sub.delivered += 1
+            sub.frames.put(delivery)
+
+    def _preview(self, max_width: int, frame: Frame) -> Optional[Frame]:
+        get_preview = getattr(self.frame_provider, "get_preview", None)
+        if get_preview is None:
+            return frame
+        return get_preview(max_width)
@@ -3,24 +3,27 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
-import colorsys
-import numpy as np
-
-from ambilight.analysis.dark_detector import DarkDetector
-from ambilight.analysis.dominant_color import dominant_color_rgb
-from ambilight.analysis.smoothing import SmoothingFilter150ms
+from ambilight.analysis.dominant_color import DEFAULT_ENGINE
+from ambilight.analysis.keyframes import KeyframeSelector
 from ambilight.capture.frame_provider import FrameProvider
 from ambilight.config.models import AppConfig
 from ambilight.ha.client import HomeAssistantClient
 from ambilight.mjpeg.publisher import MjpegPreviewPublisher
+from ambilight.services.analysis_pipeline import AnalysisPipeline, AnalysisResult
+from ambilight.services.analysis_worker import AnalysisWorker
+from ambilight.services.command_sender import CommandSender
+from ambilight.services.frame_hub import FrameHub
+from ambilight.state.output_state import OutputStateTracker
 from ambilight.state.runtime_state import RuntimeState, SyncStatus
-from ambilight.state.zone_state import DisplayBounds, ZoneRect
 from ambilight.utils.logging import get_logger
 
+RgbColor = Tuple[int, int, int]
+
 
 @dataclass
 class SyncController:
@@ -29,13 +32,42 @@ class SyncController:
     publisher: MjpegPreviewPublisher
     runtime_state: RuntimeState
     config: AppConfig
+    dominant_engine: str = DEFAULT_ENGINE
+    tile_min_area: int = 256 * 256
+    preview_max_width: int = 640
+    capture_hz: float = 60.0
+    # Color changes below this CIE76 difference are not sent to the lights.
+    output_delta_e: float = 2.0
+    output_refresh_sec: float = 30.0
+    # Send keyframes of the color trajectory with HA transitions between them.
+    output_transitions: bool = True
 
     _analysis_task: Optional[asyncio.Task] = None
     _preview_task: Optional[asyncio.Task] = None
     _running: bool = False
 
     def __post_init__(self) -> None:
-        self._smoothing = SmoothingFilter150ms()
+        self._pipeline = AnalysisPipeline(self.dominant_engine, self.tile_min_area)
+        # One capture pump feeds analysis and the preview; nothing else polls.
+        self.frame_hub = FrameHub(self.frame_provider, capture_hz=self.capture_hz)
+        self._preview = self.frame_hub.subscribe(
+            "preview", preview_width=self.preview_max_width
+        )
+        self._worker = AnalysisWorker(
+            hub=self.frame_hub,
+            pipeline=self._pipeline,
+            config=lambda: self.config,
+            is_active=lambda: (
+                self.runtime_state.sync_state.status == SyncStatus.RUNNING
+            ),
+        )
+        # Light commands go through a latest-wins mailbox; analysis never awaits HA.
+        self._sender = CommandSender(
+            self.ha_client,
+            on_result=self._record_ha_result,
+            tracker=OutputStateTracker(self.output_delta_e, self.output_refresh_sec),
+        )
+        self._keyframes: Dict[Optional[str], KeyframeSelector] = {}
         self._logger = get_logger("ambilight.sync")
 
     async def start(self) -> None:
@@ -45,6 +77,10 @@ class SyncController:
         self.runtime_state.sync_state.status = SyncStatus.RUNNING
         self.frame_provider.start(self.config.display_id)
         self.runtime_state.diagnostics.selected_display = self.config.display_id
+        self._preview.paused = not self.publisher.subscribers
+        self.frame_hub.start()
+        self._worker.start()
+        self._sender.start()
         self._analysis_task = asyncio.create_task(self._analysis_loop())
         self._preview_task = asyncio.create_task(self._preview_loop())
 
@@ -52,7 +88,7 @@ class SyncController:
         if not self._running:
             return
         self.runtime_state.sync_state.status = SyncStatus.PAUSED
-        await self.ha_client.turn_off()
+        await self._turn_off_all()
 
     async def resume(self) -> None:
         if not self._running:
@@ -62,7 +98,12 @@ class SyncController:
     async def stop(self) -> None:
         self._running = False
         self.runtime_state.sync_state.status = SyncStatus.STOPPED
-        await self.ha_client.turn_off()
+        await asyncio.to_thread(self._worker.stop)
+        await asyncio.to_thread(self.frame_hub.stop)
+        # Lights go off even if sync never started; the sender stops afterwards.
+        self._sender.start()
+        await self._turn_off_all()
+        await self._sender.stop()
         self.frame_provider.stop()
         if self._analysis_task:
             self._analysis_task.cancel()
@@ -70,60 +111,135 @@ class SyncController:
             self._preview_task.cancel()
 
     async def _preview_loop(self) -> None:
+        diagnostics = self.runtime_state.diagnostics
+        version = 0
         while self._running:
-            frame = self.frame_provider.get_frame()
-            if frame is None:
-                self.runtime_state.diagnostics.capture_status = "disconnected"
-                await asyncio.sleep(self.config.preview_interval_sec)
+            interval = self.config.preview_interval_sec
+            self._preview.max_hz = 1.0 / interval
+            # Nobody watching: do not even render the preview frame.
+            self._preview.paused = not self.publisher.subscribers
+            try:
+                version, preview = await asyncio.wait_for(
+                    self._preview.frames.wait_async(version), timeout=interval
+                )
+            except TimeoutError:
+                # No new frame (idle screen); still refresh the capture counters.
+                self._record_capture_stats()
+                continue
+            self._record_capture_stats()
+            if preview is None:
+                diagnostics.capture_status = "disconnected"
                 continue
-            self.runtime_state.diagnostics.capture_status = "connected"
-            self.publisher.update_frame(frame.pixels)
-            self.runtime_state.diagnostics.preview_fps = 1.0 / self.config.preview_interval_sec
-            await asyncio.sleep(self.config.preview_interval_sec)
+            diagnostics.capture_status = "connected"
+            # JPEG encoding releases the GIL in Pillow; keep it off the loop.
+            await asyncio.to_thread(self.publisher.update_frame, preview.pixels)
+            diagnostics.preview_fps = self._preview.max_hz
 
     async def _analysis_loop(self) -> None:
-        interval = 1.0 / max(1.0, self.config.analysis_hz)
-        dark_detector = DarkDetector(self.config.dark_threshold)
+        """Apply worker results to runtime state and Home Assistant."""
+
+        diagnostics = self.runtime_state.diagnostics
+        diagnostics.analysis_backend = self._pipeline.backend.name
+        version = 0
         while self._running:
+            version, result = await self._worker.results.wait_async(version)
             if self.runtime_state.sync_state.status != SyncStatus.RUNNING:
-                await asyncio.sleep(interval)
                 continue
-            frame = self.frame_provider.get_frame()
-            if frame is None:
-                self.runtime_state.diagnostics.capture_status = "disconnected"
-                await asyncio.sleep(interval)
+            if result is None:
+                diagnostics.capture_status = "disconnected"
+                continue
+            diagnostics.capture_status = "connected"
+            self._record_pipeline_stats(result)
+            if result.zones:
+                self._send_output_zones(result)
+            smoothed = result.color
+            self._submit(None if result.dark else smoothed)
+            if (
+                not result.changed
+                and smoothed == self.runtime_state.sync_state.last_color_rgb
+            ):
                 continue
-            self.runtime_state.diagnostics.capture_status = "connected"
-            zone = self._clamp_zone(self.config.zone, frame.pixels)
-            self.runtime_state.diagnostics.zone = zone
-            cropped = frame.pixels[zone.y : zone.y + zone.height, zone.x : zone.x + zone.width]
-            color = dominant_color_rgb(cropped)
-            boosted = self._boost_saturation(color, self.config.saturation_boost)
-            smoothed = self._smoothing.update(boosted, frame.timestamp)
-            self.runtime_state.diagnostics.analysis_hz = self.config.analysis_hz
-            self.runtime_state.diagnostics.latency_ms = (
-                datetime.utcnow() - frame.timestamp
+            diagnostics.analysis_hz = self.config.analysis_hz
+            diagnostics.latency_ms = (
+                datetime.utcnow() - result.frame_timestamp
             ).total_seconds() * 1000.0
             self.runtime_state.sync_state.last_color_rgb = smoothed
-            self.runtime_state.sync_state.last_update_ts = frame.timestamp
-            hsv = colorsys.rgb_to_hsv(smoothed[0] / 255.0, smoothed[1] / 255.0, smoothed[2] / 255.0)
-            self.runtime_state.diagnostics.current_color_rgb = smoothed
-            self.runtime_state.diagnostics.current_color_hsv = (hsv[0], hsv[1], hsv[2])
-            if dark_detector.is_dark(smoothed):
-                success = await self.ha_client.turn_off()
-                self.runtime_state.diagnostics.ha_status = "connected" if success else "disconnected"
-            else:
-                success = await self.ha_client.set_color(smoothed)
-                self.runtime_state.diagnostics.ha_status = "connected" if success else "disconnected"
-            await asyncio.sleep(interval)
-
-    def _clamp_zone(self, zone: ZoneRect, pixels: np.ndarray) -> ZoneRect:
-        bounds = DisplayBounds(width=pixels.shape[1], height=pixels.shape[0])
-        return zone.clamp_to_bounds(bounds)
-
-    def _boost_saturation(self, color: tuple[int, int, int], boost: float) -> tuple[int, int, int]:
-        r, g, b = color
-        h, s, v = colorsys.rgb_to_hsv(r / 255.0, g / 255.0, b / 255.0)
-        s = min(1.0, s + boost)
-        r2, g2, b2 = colorsys.hsv_to_rgb(h, s, v)
-        return (int(r2 * 255), int(g2 * 255), int(b2 * 255))
+            self.runtime_state.sync_state.last_update_ts = result.frame_timestamp
+            diagnostics.current_color_rgb = smoothed
+            diagnostics.current_color_hsv = result.hsv
+
+    def _send_output_zones(self, result: AnalysisResult) -> None:
+        diagnostics = self.runtime_state.diagnostics
+        if set(diagnostics.zone_colors) != {zone.name for zone in result.zones}:
+            diagnostics.zone_colors = {}
+        for zone in result.zones:
+            diagnostics.zone_colors[zone.name] = zone.color
+            self._submit(None if zone.dark else zone.color, zone.entity_id)
+
+    def _submit(
+        self, color: Optional[RgbColor], entity_id: Optional[str] = None
+    ) -> None:
+        if not self.output_transitions:
+            self._sender.submit(color, entity_id)
+            return
+        selector = self._keyframes.get(entity_id)
+        if selector is None:
+            selector = self._keyframes[entity_id] = KeyframeSelector()
+        keyframe = selector.update(color, time.monotonic_ns())
+        if keyframe is not None:
+            self._sender.submit(keyframe.color, entity_id, keyframe.transition_sec)
+
+    async def _turn_off_all(self) -> None:
+        self._keyframes.clear()
+        self._sender.submit(None)
+        for zone in self.config.zones:
+            self._sender.submit(None, zone.entity_id)
+        # Bounded by the client's request timeout; a down HA must not hang stop.
+        await self._sender.flush(timeout=5.0)
+
+    def _record_ha_result(self, success: bool) -> None:
+        diagnostics = self.runtime_state.diagnostics
+        diagnostics.ha_status = "connected" if success else "disconnected"
+        rate_control = getattr(self.ha_client, "rate_control", None)
+        if rate_control is not None:
+            diagnostics.ha_rate_hz = round(rate_control.rate_hz, 2)
+            diagnostics.ha_rtt_ms = rate_control.rtt_percentiles()
+        # Refreshes are sent while analysis is idle, so count here too.
+        self._record_command_stats()
+
+    def _record_command_stats(self) -> None:
+        diagnostics = self.runtime_state.diagnostics
+        diagnostics.commands_sent = self._sender.sent
+        diagnostics.commands_coalesced = self._sender.coalesced
+        diagnostics.commands_dropped = self._sender.dropped
+        diagnostics.commands_refreshed = self._sender.tracker.refreshes
+
+    def _record_pipeline_stats(self, result: AnalysisResult) -> None:
+        diagnostics = self.runtime_state.diagnostics
+        pipeline = self._pipeline
+        diagnostics.zone = result.zone
+        diagnostics.zone_stats = result.stats
+        diagnostics.stage_timings_ms = result.stage_ms
+        diagnostics.results_dropped = self._worker.results.dropped
+        self._record_command_stats()
+        self._record_capture_stats()
+        diagnostics.frames_unchanged = pipeline.change_detector.hits
+        diagnostics.frames_changed = pipeline.change_detector.misses
+        diagnostics.tiles_recomputed = pipeline.tiles.tiles_recomputed
+        diagnostics.tiles_reused = pipeline.tiles.tiles_reused
+
+    def _record_capture_stats(self) -> None:
+        diagnostics = self.runtime_state.diagnostics
+        diagnostics.frames_duplicate = self.frame_hub.duplicates
+        stats = self.frame_hub.stats()
+        diagnostics.frames_delivered = {
+            name: delivered for name, (delivered, _) in stats.items()
+        }
+        diagnostics.frames_dropped = {
+            name: dropped for name, (_, dropped) in stats.items()
+        }
+        stream = self.publisher.stats()
+        diagnostics.preview_clients = stream["subscribers"]
+        diagnostics.preview_bytes_sent = stream["bytes_sent"]
+        diagnostics.preview_frames_dropped = stream["frames_dropped"]
+        diagnostics.preview_frames_encoded = stream["frames_encoded"]
@@ -0,0 +1,132 @@
+"""What each light was last told, and whether a new command would be visible."""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+RgbColor = Tuple[int, int, int]
+LabColor = Tuple[float, float, float]
+
+# sRGB (D65) to CIE XYZ, rows scaled by the D65 white point.
+_XYZ_ROWS = (
+    (0.4124 / 0.95047, 0.3576 / 0.95047, 0.1805 / 0.95047),
+    (0.2126, 0.7152, 0.0722),
+    (0.0193 / 1.08883, 0.1192 / 1.08883, 0.9505 / 1.08883),
+)
+_LINEAR = tuple(
+    value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+    for value in (channel / 255.0 for channel in range(256))
+)
+
+
+def _lab_f(t: float) -> float:
+    return (
+        t ** (1.0 / 3.0) if t > 216.0 / 24389.0 else (24389.0 / 27.0 * t + 16.0) / 116.0
+    )
+
+
+def rgb_to_lab(color: RgbColor) -> LabColor:
+    """Convert an 8-bit sRGB color to CIE L*a*b* (D65)."""
+
+    linear = [_LINEAR[channel] for channel in color]
+    fx, fy, fz = (
+        _lab_f(sum(w * c for w, c in zip(row, linear, strict=True)))
+        for row in _XYZ_ROWS
+    )
+    return 116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)
+
+
+def delta_e(first: RgbColor, second: RgbColor) -> float:
+    """CIE76 color difference; about 2.3 is a just noticeable difference."""
+
+    return math.dist(rgb_to_lab(first), rgb_to_lab(second))
+
+
+@dataclass
+class _Told:
+    color: Optional[RgbColor]
+    lab: Optional[LabColor]
+    at: float
+
+
+@dataclass
+class OutputStateTracker:
+    """Remember the last command each light acknowledged.
+
+    A new command is needed when the light's state is unknown, when it
+    switches between on and off, or when the color differs by at least
+    ``delta_e_threshold`` from what the light was told. Comparing against
+    the last command (not the last request) lets slow drifts accumulate
+    until visible. Independently, ``due`` lists lights not told anything for
+    ``refresh_interval_sec``, so their state can be re-sent and a light
+    changed from elsewhere is corrected even when the picture is static.
+    """
+
+    delta_e_threshold: float = 2.0
+    refresh_interval_sec: float = 30.0
+    refreshes: int = 0
+    _told: Dict[Optional[str], _Told] = field(default_factory=dict, init=False)
+
+    def similar(self, first: Optional[RgbColor], second: Optional[RgbColor]) -> bool:
+        """Whether two states (``None`` = off) look the same on a light."""
+
+        if first is None or second is None:
+            return first is second
+        return first == second or delta_e(first, second) < self.delta_e_threshold
+
+    def needs_update(self, entity_id: Optional[str], color: Optional[RgbColor]) -> bool:
+        told = self._told.get(entity_id)
+        if told is None:
+            return True
+        if color is None or told.color is None:
+            return color is not told.color
+        if color == told.color:
+            return False
+        return math.dist(rgb_to_lab(color), told.lab) >= self.delta_e_threshold
+
+    def record(
+        self,
+        entity_id: Optional[str],
+        color: Optional[RgbColor],
+        now: Optional[float] = None,
+    ) -> None:
+        """Note that ``entity_id`` acknowledged ``color``."""
+
+        lab = None if color is None else rgb_to_lab(color)
+        self._told[entity_id] = _Told(
+            color, lab, time.monotonic() if now is None else now
+        )
+
+    def due(
+        self, now: Optional[float] = None
+    ) -> List[Tuple[Optional[str], Optional[RgbColor]]]:
+        """Lights whose last command is ``refresh_interval_sec`` old, with that state.
+
+        Returned lights count as refreshed now, so they are listed once per interval.
+        """
+
+        now = time.monotonic() if now is None else now
+        due = []
+        for entity_id, told in self._told.items():
+            if now - told.at >= self.refresh_interval_sec:
+                told.at = now
+                due.append((entity_id, told.color))
+        self.refreshes += len(due)
+        return due
+
+    def next_refresh_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next light is due for a refresh; None if none is known."""
+
+        if not self._told:
+            return None
+        now = time.monotonic() if now is None else now
+        oldest = min(told.at for told in self._told.values())
+        return max(0.0, oldest + self.refresh_interval_sec - now)
+
+    def forget(self, entity_id: Optional[str]) -> None:
+        """Mark the light's state unknown, e.g. after a failed command."""
+
+        self._told.pop(entity_id, None)
@@ -5,8 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
+from ambilight.analysis.zone_stats import ZoneStats
 from ambilight.state.zone_state import ZoneRect
 
 RgbColor = Tuple[int, int, int]
@@ -36,7 +37,30 @@ class Diagnostics:
     current_color_rgb: Optional[RgbColor] = None
     current_color_hsv: Optional[HsvColor] = None
     ha_status: str = "disconnected"
+    ha_rate_hz: Optional[float] = None
+    ha_rtt_ms: Dict[str, float] = field(default_factory=dict)
     capture_status: str = "disconnected"
+    analysis_backend: Optional[str] = None
+    backend_timings_ms: Dict[str, float] = field(default_factory=dict)
+    frames_unchanged: int = 0
+    frames_changed: int = 0
+    tiles_recomputed: int = 0
+    tiles_reused: int = 0
+    zone_stats: Optional[ZoneStats] = None
+    zone_colors: Dict[str, RgbColor] = field(default_factory=dict)
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
+    results_dropped: int = 0
+    commands_sent: int = 0
+    commands_coalesced: int = 0
+    commands_dropped: int = 0
+    commands_refreshed: int = 0
+    frames_duplicate: int = 0
+    frames_delivered: Dict[str, int] = field(default_factory=dict)
+    frames_dropped: Dict[str, int] = field(default_factory=dict)
+    preview_clients: int = 0
+    preview_bytes_sent: int = 0
+    preview_frames_dropped: int = 0
+    preview_frames_encoded: int = 0
 
 
 @dataclass
@@ -0,0 +1,83 @@
+"""Latest-value handoff between a producer thread and sync or async consumers."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from threading import Condition
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class LatestValueSlot(Generic[T]):
+    """Hold only the newest value; unread values are overwritten, never queued.
+
+    Each ``put`` bumps a version number. Consumers wait for a version newer
+    than the one they last saw, so a slow consumer skips straight to the
+    newest value instead of working through a backlog.
+    """
+
+    dropped: int = 0
+    _value: Optional[T] = field(default=None, init=False)
+    _version: int = field(default=0, init=False)
+    _taken: bool = field(default=True, init=False)
+    _condition: Condition = field(default_factory=Condition, init=False)
+    _async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = field(
+        default_factory=list, init=False
+    )
+
+    def put(self, value: T) -> int:
+        with self._condition:
+            if not self._taken:
+                self.dropped += 1
+            self._value = value
+            self._version += 1
+            self._taken = False
+            waiters, self._async_waiters = self._async_waiters, []
+            self._condition.notify_all()
+            version = self._version
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiting loop has already been closed.
+                pass
+        return version
+
+    def get(self) -> Tuple[int, Optional[T]]:
+        with self._condition:
+            self._taken = True
+            return self._version, self._value
+
+    def wait(
+        self, since: int, timeout: Optional[float] = None
+    ) -> Optional[Tuple[int, Optional[T]]]:
+        """Block until a version newer than ``since`` exists, or return None on timeout."""
+
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._version > since, timeout):
+                return None
+            self._taken = True
+            return self._version, self._value
+
+    async def wait_async(self, since: int) -> Tuple[int, Optional[T]]:
+        """Await a version newer than ``since`` without blocking the event loop."""
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._version > since:
+                    self._taken = True
+                    return self._version, self._value
+                event = asyncio.Event()
+                waiter = (loop, event)
+                self._async_waiters.append(waiter)
+            try:
+                await event.wait()
+            finally:
+                # A cancelled or timed-out waiter must not linger until the next put.
+                with self._condition:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
@@ -3,22 +3,41 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
-import httpx
 from fastapi.staticfiles import StaticFiles
 
+from ambilight.mjpeg.publisher import (
+    DEFAULT_QUALITY,
+    MjpegPreviewPublisher,
+    PreviewSize,
+    Rendition,
+)
+from ambilight.mjpeg.relay import PreviewRelay
 from ambilight.web.bridge import Bridge
 
 
 class LanUiServer:
-    """Serve static UI over LAN and forward allowed actions to localhost API."""
+    """Serve static UI over LAN and forward allowed actions to localhost API.
 
-    def __init__(self, bridge: Bridge, static_dir: Path) -> None:
+    With ``publisher`` (same process) LAN viewers subscribe to the preview
+    directly; the publisher only hands out encoded frames, so the control
+    API stays reachable through the bridge allow-list alone. Otherwise one
+    upstream stream per rendition is shared by all LAN viewers.
+    """
+
+    def __init__(
+        self,
+        bridge: Bridge,
+        static_dir: Path,
+        publisher: Optional[MjpegPreviewPublisher] = None,
+    ) -> None:
         self._bridge = bridge
         self._static_dir = static_dir
+        self._publisher = publisher
+        self._relay = PreviewRelay(bridge.local_api_base)
         self.app = FastAPI(title="Ambilight LAN UI")
         self._register_routes()
 
@@ -41,17 +60,20 @@ class LanUiServer:
             if not path:
                 raise HTTPException(status_code=400, detail="Missing path")
             response = await self._bridge.forward(path, method=method, json=data)
-            return JSONResponse(status_code=response.status_code, content=response.json())
+            return JSONResponse(
+                status_code=response.status_code, content=response.json()
+            )
 
         @app.get("/preview")
-        async def preview_stream() -> StreamingResponse:
-            async def _iter_stream() -> bytes:
-                async with httpx.AsyncClient(base_url=self._bridge.local_api_base) as client:
-                    async with client.stream("GET", "/api/preview/stream") as response:
-                        async for chunk in response.aiter_bytes():
-                            yield chunk
-
+        async def preview_stream(
+            size: PreviewSize = "full",
+            quality: int = Query(DEFAULT_QUALITY, ge=10, le=95),
+        ) -> StreamingResponse:
+            if self._publisher is not None:
+                body = self._publisher.stream(Rendition.named(size, quality))
+            else:
+                body = self._relay.stream({"size": size, "quality": str(quality)})
             return StreamingResponse(
-                _iter_stream(),
+                body,
                 media_type="multipart/x-mixed-replace; boundary=frame",
             )
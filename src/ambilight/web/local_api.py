@@ -3,20 +3,28 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import List
+from typing import List, Literal, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from ambilight.config.json_store import JsonConfigStore
-from ambilight.config.models import AppConfig, Preset
-from ambilight.mjpeg.publisher import MjpegPreviewPublisher
+from ambilight.config.models import AppConfig, OutputZone, Preset
+from ambilight.mjpeg.publisher import (
+    DEFAULT_QUALITY,
+    MjpegPreviewPublisher,
+    PreviewSize,
+    Rendition,
+)
 from ambilight.services.sync_controller import SyncController
 from ambilight.state.runtime_state import RuntimeState
 from ambilight.state.zone_state import ZoneRect
 
 
+SmoothingMode = Literal["window", "ema", "one_euro", "kalman"]
+
+
 class ZoneRectModel(BaseModel):
     x: int
     y: int
@@ -24,6 +32,12 @@ class ZoneRectModel(BaseModel):
     height: int
 
 
+class OutputZoneModel(BaseModel):
+    name: str
+    entity_id: str
+    rect: ZoneRectModel
+
+
 class AppConfigModel(BaseModel):
     display_id: int = Field(..., ge=1, le=2)
     zone: ZoneRectModel
@@ -31,6 +45,8 @@ class AppConfigModel(BaseModel):
     analysis_hz: float
     dark_threshold: float = Field(..., ge=0.0, le=1.0)
     saturation_boost: float = Field(..., ge=0.0, le=1.0)
+    smoothing_mode: Optional[SmoothingMode] = None
+    zones: Optional[List[OutputZoneModel]] = None
 
 
 class PresetModel(BaseModel):
@@ -41,6 +57,8 @@ class PresetModel(BaseModel):
     analysis_hz: float
     dark_threshold: float
     saturation_boost: float
+    smoothing_mode: Optional[SmoothingMode] = None
+    zones: Optional[List[OutputZoneModel]] = None
 
 
 class DisplayInfo(BaseModel):
@@ -50,7 +68,18 @@ class DisplayInfo(BaseModel):
     height: int
 
 
-def _model_to_config(model: AppConfigModel) -> AppConfig:
+def _model_zones(
+    zones: Optional[List[OutputZoneModel]], current: AppConfig
+) -> Tuple[OutputZone, ...]:
+    if zones is None:
+        return current.zones
+    return tuple(
+        OutputZone(name=z.name, entity_id=z.entity_id, rect=ZoneRect(**z.rect.dict()))
+        for z in zones
+    )
+
+
+def _model_to_config(model: AppConfigModel, current: AppConfig) -> AppConfig:
     zone = ZoneRect(**model.zone.dict())
     return AppConfig(
         display_id=model.display_id,
@@ -59,10 +88,12 @@ def _model_to_config(model: AppConfigModel) -> AppConfig:
         analysis_hz=model.analysis_hz,
         dark_threshold=model.dark_threshold,
         saturation_boost=model.saturation_boost,
+        smoothing_mode=model.smoothing_mode or current.smoothing_mode,
+        zones=_model_zones(model.zones, current),
     )
 
 
-def _model_to_preset(model: PresetModel) -> Preset:
+def _model_to_preset(model: PresetModel, current: AppConfig) -> Preset:
     zone = ZoneRect(**model.zone.dict())
     return Preset(
         name=model.name,
@@ -72,6 +103,8 @@ def _model_to_preset(model: PresetModel) -> Preset:
         analysis_hz=model.analysis_hz,
         dark_threshold=model.dark_threshold,
         saturation_boost=model.saturation_boost,
+        smoothing_mode=model.smoothing_mode or current.smoothing_mode,
+        zones=_model_zones(model.zones, current),
     )
 
 
@@ -116,7 +149,7 @@ class LocalApiServer:
 
         @app.put("/api/config", response_model=AppConfigModel)
         async def update_config(payload: AppConfigModel) -> AppConfigModel:
-            config = _model_to_config(payload)
+            config = _model_to_config(payload, self._sync_controller.config)
             self._config_store.save_config(config)
             self._sync_controller.config = config
             return AppConfigModel(**asdict(config))
@@ -128,7 +161,7 @@ class LocalApiServer:
 
         @app.post("/api/presets", status_code=201)
         async def save_preset(payload: PresetModel) -> dict:
-            preset = _model_to_preset(payload)
+            preset = _model_to_preset(payload, self._sync_controller.config)
             self._config_store.save_preset(preset)
             return {"status": "saved"}
 
@@ -145,6 +178,8 @@ class LocalApiServer:
                 analysis_hz=preset.analysis_hz,
                 dark_threshold=preset.dark_threshold,
                 saturation_boost=preset.saturation_boost,
+                smoothing_mode=preset.smoothing_mode,
+                zones=preset.zones,
             )
             self._config_store.save_config(config)
             self._sync_controller.config = config
@@ -175,8 +210,11 @@ class LocalApiServer:
             return {"status": "stopped"}
 
         @app.get("/api/preview/stream")
-        async def preview_stream() -> StreamingResponse:
+        async def preview_stream(
+            size: PreviewSize = "full",
+            quality: int = Query(DEFAULT_QUALITY, ge=10, le=95),
+        ) -> StreamingResponse:
             return StreamingResponse(
-                self._publisher.stream(),
+                self._publisher.stream(Rendition.named(size, quality)),
                 media_type="multipart/x-mixed-replace; boundary=frame",
             )
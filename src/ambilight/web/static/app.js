@@ -18,6 +18,7 @@ const loadConfig = async () => {
   $("previewInterval").value = config.preview_interval_sec;
   $("darkThreshold").value = config.dark_threshold;
   $("saturationBoost").value = config.saturation_boost;
+  $("smoothingMode").value = config.smoothing_mode;
   $("zoneX").value = config.zone.x;
   $("zoneY").value = config.zone.y;
   $("zoneW").value = config.zone.width;
@@ -30,6 +31,7 @@ const saveConfig = async () => {
     preview_interval_sec: parseFloat($("previewInterval").value),
     dark_threshold: parseFloat($("darkThreshold").value),
     saturation_boost: parseFloat($("saturationBoost").value),
+    smoothing_mode: $("smoothingMode").value,
     analysis_hz: 25,
     zone: {
       x: parseInt($("zoneX").value, 10),
@@ -79,3 +79,27 @@ def test_sync_controls() -> None:
     assert client.post("/api/sync/pause").status_code == 200
     assert client.post("/api/sync/resume").status_code == 200
     assert client.post("/api/sync/stop").status_code == 200
+
+
+def test_config_output_zones_round_trip() -> None:
+    client = _make_app()
+    payload = client.get("/api/config").json()
+    payload["zones"] = [
+        {
+            "name": "left",
+            "entity_id": "light.left",
+            "rect": {"x": 0, "y": 0, "width": 3, "height": 10},
+        }
+    ]
+    updated = client.put("/api/config", json=payload)
+    assert updated.status_code == 200
+    assert updated.json()["zones"][0]["entity_id"] == "light.left"
+    assert client.get("/api/config").json()["zones"][0]["name"] == "left"
+    payload["zones"] = []
+    assert client.put("/api/config", json=payload).json()["zones"] == []
+
+
+def test_preview_stream_rejects_unknown_rendition() -> None:
+    client = _make_app()
+    assert client.get("/api/preview/stream", params={"size": "huge"}).status_code == 422
+    assert client.get("/api/preview/stream", params={"quality": 5}).status_code == 422
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, timedelta
 
 import numpy as np
 
 from ambilight.analysis.dominant_color import dominant_color_rgb
 from ambilight.analysis.smoothing import SmoothingFilter150ms
+from ambilight.capture.frame_provider import Frame
+from ambilight.config.models import AppConfig, OutputZone
+from ambilight.services.analysis_pipeline import AnalysisPipeline
+from ambilight.state.zone_state import ZoneRect
 
 
 def test_dominant_color_from_synthetic_frame() -> None:
@@ -22,3 +27,46 @@ def test_smoothing_window_keeps_recent_samples() -> None:
     filt.update((0, 0, 0), now - timedelta(milliseconds=200))
     smoothed = filt.update((255, 0, 0), now)
     assert smoothed == (255, 0, 0)
+
+
+def test_main_zone_is_binned_with_the_output_zones() -> None:
+    rng = np.random.default_rng(4)
+    pixels = rng.integers(0, 256, size=(300, 400, 3), dtype=np.uint8)
+    pixels[50:250, 40:360] = (30, 90, 160)
+    main = ZoneRect(x=20, y=10, width=360, height=280)
+    config = AppConfig(
+        display_id=1,
+        zone=main,
+        preview_interval_sec=1.0,
+        analysis_hz=30.0,
+        dark_threshold=0.1,
+        saturation_boost=0.0,
+    )
+    zoned = replace(
+        config,
+        zones=(
+            OutputZone(
+                name="left",
+                entity_id="light.left",
+                rect=ZoneRect(x=0, y=0, width=60, height=300),
+            ),
+            OutputZone(
+                name="top",
+                entity_id="light.top",
+                rect=ZoneRect(x=0, y=0, width=400, height=40),
+            ),
+        ),
+    )
+    frame = Frame(pixels=pixels, timestamp=datetime.utcnow())
+
+    alone = AnalysisPipeline().histograms(frame, config)
+    pipeline = AnalysisPipeline()
+    batched = pipeline.histograms(frame, zoned)
+    assert (
+        pipeline._zone_analyzer is not None and len(pipeline._zone_analyzer.zones) == 3
+    )
+    assert np.array_equal(batched.main[0], alone.main[0])
+    assert batched.main[1] == alone.main[1] == (30, 90, 160)
+    assert [counts.sum() for counts, _ in batched.zones] == [60 * 300, 400 * 40]
+    # Nothing moved: the whole pass is reused.
+    assert not pipeline.histograms(frame, zoned).changed
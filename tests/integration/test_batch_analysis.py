@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from ambilight.capture.frame_provider import Frame
+from ambilight.capture.recording import FrameRecorder, FrameRecording
+from ambilight.capture.synthetic import SyntheticFrameProvider
+from ambilight.config.models import AppConfig, OutputZone
+from ambilight.services.analysis_pipeline import AnalysisPipeline
+from ambilight.services.batch_analysis import analyse_timeline
+from ambilight.state.zone_state import ZoneRect
+
+CONFIG = AppConfig(
+    display_id=1,
+    zone=ZoneRect(x=10, y=5, width=60, height=30),
+    preview_interval_sec=1.0,
+    analysis_hz=25.0,
+    dark_threshold=0.1,
+    saturation_boost=0.2,
+    smoothing_mode="ema",
+    zones=(
+        OutputZone("left", "light.left", ZoneRect(x=0, y=0, width=20, height=45)),
+        OutputZone("right", "light.right", ZoneRect(x=60, y=0, width=20, height=45)),
+    ),
+)
+
+
+def _record(path: Path, count: int) -> None:
+    source = SyntheticFrameProvider(80, 45)
+    source.start(1)
+    with FrameRecorder(path, (45, 80), chunk_frames=8) as recorder:
+        for index in range(count):
+            frame = source.get_frame()
+            # Hold some frames so change detection and smoothing both get exercised.
+            if index % 4 == 3:
+                frame = replace(frame, pixels=np.zeros_like(frame.pixels))
+            recorder.write(replace(frame, capture_ns=(index + 1) * 33_000_000))
+
+
+def test_batch_timeline_matches_live_pipeline(tmp_path: Path) -> None:
+    path = tmp_path / "capture.amb"
+    _record(path, 40)
+    dimmer = replace(CONFIG, dark_threshold=0.3, saturation_boost=0.0)
+    timelines = analyse_timeline(path, [CONFIG, dimmer], workers=2, chunk_frames=16)
+
+    recording = FrameRecording(path)
+    times = recording.capture_times_ns()
+    for config, timeline in zip((CONFIG, dimmer), timelines, strict=True):
+        pipeline = AnalysisPipeline()
+        for index in range(len(recording)):
+            frame = Frame(pixels=recording.pixels(index), timestamp=datetime.utcnow())
+            result = pipeline.process(frame, int(times[index]), config)
+            assert tuple(timeline.main.color[index]) == result.color
+            assert timeline.main.dark[index] == result.dark
+            assert tuple(timeline.main.dominant[index]) == result.stats.dominant_rgb
+            for target in result.zones:
+                assert tuple(timeline.zones[target.name].color[index]) == target.color
+                assert timeline.zones[target.name].dark[index] == target.dark
+    assert timelines[1].dark_fraction >= timelines[0].dark_fraction > 0.0
+
+
+def test_image_folder_source(tmp_path: Path) -> None:
+    for index, value in enumerate((30, 200)):
+        pixels = np.full((45, 80, 3), value, dtype=np.uint8)
+        Image.fromarray(pixels).save(tmp_path / f"frame_{index:03d}.png")
+    (timeline,) = analyse_timeline(tmp_path, [CONFIG], workers=1)
+    assert timeline.frame_ns.tolist() == [0, 33_333_333]
+    assert timeline.main.dominant.tolist() == [[30, 30, 30], [200, 200, 200]]
+    assert timeline.main.dark.tolist() == [True, False]
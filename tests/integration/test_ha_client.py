@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from typing import Any
 
 import httpx
 
 from ambilight.ha.client import HomeAssistantClient
+from ambilight.ha.rate_control import AimdRateController
 
 
 def test_ha_client_sends_requests() -> None:
@@ -24,9 +26,40 @@ def test_ha_client_sends_requests() -> None:
     client._client = httpx.AsyncClient(transport=transport, base_url="http://ha.local")
 
     async def run() -> None:
-        await client.set_color((10, 20, 30))
+        await client.set_color((10, 20, 30), transition=0.25)
         await client.turn_off()
         await client.close()
 
     asyncio.run(run())
     assert len(requests) == 2
+    assert json.loads(requests[0].content)["transition"] == 0.25
+
+
+def test_rate_control_follows_home_assistant_responses() -> None:
+    statuses = iter([200] * 20 + [503] * 3)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), json=[])
+
+    control = AimdRateController(rate_hz=100.0, max_rate_hz=200.0, increase_hz=50.0)
+    client = HomeAssistantClient(
+        base_url="http://ha.local",
+        token="token",
+        entity_id="light.lamp",
+        rate_control=control,
+    )
+    client._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://ha.local"
+    )
+
+    async def run() -> list[bool]:
+        results = [await client.set_color((i, 0, 0)) for i in range(23)]
+        await client.close()
+        return results
+
+    results = asyncio.run(run())
+    assert results == [True] * 20 + [False] * 3
+    assert (control.successes, control.failures) == (20, 3)
+    # Grew while answered, then halved per failure without sleeping in backoff.
+    assert control.rate_hz < 100.0
+    assert set(control.rtt_percentiles()) == {"p50", "p95", "p99"}
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from websockets.asyncio.server import serve  # noqa: E402
+
+from ambilight.ha.client import TRANSPORT_WEBSOCKET, HomeAssistantClient  # noqa: E402
+from ambilight.ha.rate_control import AimdRateController  # noqa: E402
+
+
+class StandInHomeAssistant:
+    """Minimal Home Assistant WebSocket API: auth handshake and call_service results."""
+
+    def __init__(
+        self, token: str = "token", drop_after: int = 0, silent: bool = False
+    ) -> None:
+        self.token = token
+        self.drop_after = drop_after
+        self.silent = silent
+        self.unknown_entities = {"light.missing"}
+        self.calls: list[dict[str, Any]] = []
+        self.connections = 0
+
+    async def handler(self, ws) -> None:
+        self.connections += 1
+        await ws.send(json.dumps({"type": "auth_required"}))
+        auth = json.loads(await ws.recv())
+        if auth.get("access_token") != self.token:
+            await ws.send(json.dumps({"type": "auth_invalid", "message": "bad token"}))
+            return
+        await ws.send(json.dumps({"type": "auth_ok"}))
+        async for raw in ws:
+            message = json.loads(raw)
+            self.calls.append(message)
+            if self.silent:
+                continue
+            if message["service_data"].get("entity_id") in self.unknown_entities:
+                error = {"code": "not_found", "message": "entity not found"}
+                result = {
+                    "id": message["id"],
+                    "type": "result",
+                    "success": False,
+                    "error": error,
+                }
+            else:
+                result = {"id": message["id"], "type": "result", "success": True}
+            await ws.send(json.dumps(result))
+            if self.drop_after and len(self.calls) % self.drop_after == 0:
+                await ws.close()
+                return
+
+
+def _client(port: int, token: str = "token") -> HomeAssistantClient:
+    return HomeAssistantClient(
+        base_url=f"http://127.0.0.1:{port}",
+        token=token,
+        entity_id="light.lamp",
+        min_interval_ms=0,
+        transport=TRANSPORT_WEBSOCKET,
+    )
+
+
+def test_calls_share_one_connection_and_report_rejections() -> None:
+    ha = StandInHomeAssistant()
+    control = AimdRateController(rate_hz=1000.0, max_rate_hz=1000.0)
+
+    async def run() -> None:
+        async with serve(ha.handler, "127.0.0.1", 0) as server:
+            client = _client(server.sockets[0].getsockname()[1])
+            client.rate_control = control
+            results = [await client.set_color((i, 0, 0)) for i in range(50)]
+            results.append(await client.turn_off(entity_id="light.strip"))
+            assert all(results)
+            # Home Assistant's answer, not the socket write, decides the outcome.
+            assert not await client.set_color((1, 2, 3), entity_id="light.missing")
+            assert await client._ws.call_service("light", "turn_off", {}, wait=True)
+            await client.close()
+
+    asyncio.run(run())
+    assert ha.connections == 1
+    ids = [call["id"] for call in ha.calls]
+    assert ids == sorted(set(ids))
+    assert ha.calls[0]["service_data"] == {
+        "entity_id": "light.lamp",
+        "rgb_color": [0, 0, 0],
+        "brightness": 255,
+    }
+    assert ha.calls[50]["service"] == "turn_off"
+    # Round trips are timed from send to result.
+    assert (control.successes, control.failures) == (52, 1)
+
+
+def test_reconnects_after_connection_drop_and_rejects_bad_token() -> None:
+    ha = StandInHomeAssistant(drop_after=2)
+
+    async def run() -> None:
+        async with serve(ha.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            client = _client(port)
+            transport = client._ws
+            for _ in range(2):
+                assert await transport.call_service("light", "turn_on", {}, wait=True)
+            while transport.connected:
+                await asyncio.sleep(0.01)
+            assert await client.set_color((1, 2, 3))
+            assert transport.connects == 2
+            await client.close()
+
+            rejected = _client(port, token="wrong")
+            rejected.rate_control = control
+            assert not await rejected.set_color((1, 2, 3))
+            # Backing off: the next call fails fast without reconnecting.
+            assert not await rejected.set_color((1, 2, 3))
+            await rejected.close()
+
+    control = AimdRateController()
+    asyncio.run(run())
+    assert ha.connections == 3
+    # Only the failed connection attempt is reported, not the fast failure.
+    assert control.failures == 1
+
+
+def test_unanswered_call_times_out_and_drops_the_connection() -> None:
+    ha = StandInHomeAssistant(silent=True)
+    control = AimdRateController()
+
+    async def run() -> None:
+        async with serve(ha.handler, "127.0.0.1", 0) as server:
+            client = _client(server.sockets[0].getsockname()[1])
+            client.rate_control = control
+            transport = client._ws
+            transport.result_timeout = 0.2
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            # The socket stays open but no result ever comes, as on a half-open link.
+            assert not await client.set_color((1, 2, 3))
+            assert loop.time() - start < 2.0
+            assert not transport.connected
+            assert transport.in_flight == 0
+            await client.close()
+
+    asyncio.run(run())
+    assert len(ha.calls) == 1
+    assert (control.successes, control.failures) == (0, 1)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ambilight.mjpeg.publisher import BOUNDARY, MjpegPreviewPublisher, Rendition
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((180, 320, 3), value * 20, dtype=np.uint8)
+
+
+def _decode(part: bytes) -> Image.Image:
+    assert part.startswith(BOUNDARY)
+    return Image.open(BytesIO(part.split(b"\r\n\r\n", 1)[1]))
+
+
+def _value(part: bytes) -> int:
+    return round(int(np.asarray(_decode(part))[0, 0, 0]) / 20)
+
+
+def test_twenty_viewers_get_each_frame_once_and_slow_viewer_drops_to_latest() -> None:
+    publisher = MjpegPreviewPublisher(max_frames=2)
+    received: list[list[int]] = [[] for _ in range(20)]
+
+    async def viewer(index: int, delay: float) -> None:
+        stream = publisher.stream()
+        async for part in stream:
+            received[index].append(_value(part))
+            if received[index][-1] == 10:
+                break
+            await asyncio.sleep(delay)
+        await stream.aclose()
+
+    async def run() -> None:
+        tasks = [
+            asyncio.create_task(viewer(i, 0.05 if i == 0 else 0.0)) for i in range(20)
+        ]
+        while publisher.subscribers < 20:
+            await asyncio.sleep(0)
+        for value in range(1, 11):
+            # Published from a worker thread, as the preview loop does.
+            await asyncio.to_thread(publisher.update_frame, _frame(value))
+            await asyncio.sleep(0.005)
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=5.0)
+
+    asyncio.run(run())
+    for frames in received[1:]:
+        assert frames == list(range(1, 11))
+    slow = received[0]
+    assert slow == sorted(set(slow)) and slow[-1] == 10 and len(slow) < 10
+    stats = publisher.stats()
+    assert stats["subscribers"] == 0
+    # One encode per frame, however many viewers watch it.
+    assert stats["frames_encoded"] == 10
+    assert stats["frames_dropped"] > 0
+    # The closing frame of each viewer is read but never acknowledged by the client.
+    assert stats["frames_sent"] == sum(len(frames) - 1 for frames in received)
+    assert stats["bytes_sent"] > 0
+
+
+def test_encodes_only_watched_renditions_once_each() -> None:
+    publisher = MjpegPreviewPublisher()
+    publisher.update_frame(_frame(1))
+    assert publisher.frames_encoded == 0
+
+    async def run() -> None:
+        stream = publisher.stream()
+        # Encoded on demand for the first viewer; then it waits, without polling.
+        assert _value(await stream.__anext__()) == 1
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(stream.__anext__(), timeout=0.05)
+        publisher.update_frame(_frame(2))
+        # Viewers that connect late start with the latest frame in their rendition.
+        thumbs = [
+            publisher.stream(Rendition.named("thumb", quality=40)) for _ in range(3)
+        ]
+        parts = [await thumb.__anext__() for thumb in thumbs]
+        assert all(part == parts[0] for part in parts)
+        assert _decode(parts[0]).size == (160, 90)
+        assert _value(parts[0]) == 2
+        publisher.update_frame(_frame(3))
+        assert _decode(await thumbs[0].__anext__()).width == 160
+        for thumb in thumbs:
+            await thumb.aclose()
+
+    asyncio.run(run())
+    # Frame 1 at full size, frames 2 and 3 once each as thumbnails.
+    assert publisher.frames_encoded == 3
+    publisher.close()
+
+
+def test_late_viewer_gets_the_frame_as_published_not_the_reused_buffer() -> None:
+    publisher = MjpegPreviewPublisher()
+    buffer = _frame(1)
+    publisher.update_frame(buffer)
+    # The capture pool hands the same buffer out again for a later frame.
+    buffer[:] = _frame(2)
+
+    async def run() -> int:
+        stream = publisher.stream()
+        part = await stream.__anext__()
+        await stream.aclose()
+        return _value(part)
+
+    assert asyncio.run(run()) == 1
+    publisher.close()
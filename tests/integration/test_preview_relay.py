@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import numpy as np
+
+from ambilight.mjpeg.publisher import Rendition, encode_part
+from ambilight.mjpeg.relay import MultipartSplitter, PreviewRelay
+
+PARTS = [
+    encode_part(np.full((24, 32, 3), value, dtype=np.uint8), Rendition())
+    for value in (10, 90, 170, 250)
+]
+
+
+def test_splitter_reassembles_parts_from_arbitrary_chunks() -> None:
+    body = b"".join(PARTS)
+    splitter = MultipartSplitter()
+    parts = []
+    for start in range(0, len(body), 7):
+        parts.extend(splitter.feed(body[start : start + 7]))
+    assert parts == PARTS
+
+
+def test_lan_viewers_share_one_upstream_stream() -> None:
+    requests: list[httpx.Request] = []
+
+    async def run() -> list[list[bytes]]:
+        viewers_ready = asyncio.Event()
+
+        async def body():
+            await viewers_ready.wait()
+            payload = b"".join(PARTS)
+            # Chunk boundaries that do not line up with parts.
+            for start in range(0, len(payload), 500):
+                yield payload[start : start + 500]
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(10)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, content=body())
+
+        relay = PreviewRelay("http://local", transport=httpx.MockTransport(handler))
+        received: list[list[bytes]] = [[] for _ in range(5)]
+
+        async def viewer(index: int) -> None:
+            stream = relay.stream({"size": "thumb", "quality": "50"})
+            async for part in stream:
+                received[index].append(part)
+                if len(received[index]) == len(PARTS):
+                    break
+            await stream.aclose()
+
+        tasks = [asyncio.create_task(viewer(i)) for i in range(5)]
+        while relay.subscribers < 5:
+            await asyncio.sleep(0.001)
+        viewers_ready.set()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=5.0)
+        assert relay.upstreams == 0
+        return received
+
+    received = asyncio.run(run())
+    assert all(parts == PARTS for parts in received)
+    assert len(requests) == 1
+    assert dict(requests[0].url.params) == {"size": "thumb", "quality": "50"}
+
+
+def test_bad_part_header_does_not_strand_viewers() -> None:
+    bad = PARTS[0].replace(b"Content-Length: ", b"Content-Length: x", 1)
+    splitter = MultipartSplitter()
+    # Falls back to the next boundary to find where the bad part ends.
+    assert splitter.feed(bad + PARTS[1]) == [bad, PARTS[1]]
+
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("malformed upstream")
+        return httpx.Response(200, content=PARTS[2])
+
+    async def run() -> bytes:
+        relay = PreviewRelay(
+            "http://local", retry_delay_sec=0.01, transport=httpx.MockTransport(handler)
+        )
+        stream = relay.stream({})
+        part = await asyncio.wait_for(stream.__anext__(), timeout=2.0)
+        await stream.aclose()
+        return part
+
+    assert asyncio.run(run()) == PARTS[2]
+    assert calls >= 2
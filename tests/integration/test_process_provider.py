@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+from functools import partial
+
+from ambilight.capture.process_provider import ProcessFrameProvider
+from ambilight.capture.synthetic import SyntheticFrameProvider
+
+
+def test_process_provider_streams_frames_from_child() -> None:
+    provider = ProcessFrameProvider(
+        partial(SyntheticFrameProvider, 64, 32), max_shape=(32, 64), target_fps=200.0
+    )
+    provider.start(1)
+    try:
+        assert provider.alive
+        deadline = time.monotonic() + 5.0
+        first = None
+        while first is None and time.monotonic() < deadline:
+            first = provider.get_frame()
+        assert first is not None
+        assert first.pixels.shape == (32, 64, 3)
+        assert not first.pixels.flags.writeable
+        red = int(first.pixels[0, 0, 0])
+        time.sleep(0.05)
+        assert int(provider.get_frame().pixels[0, 0, 0]) != red
+        del first
+    finally:
+        provider.stop()
+    assert provider.get_frame() is None
+
+
+def test_process_provider_stops_returning_frames_when_child_dies() -> None:
+    provider = ProcessFrameProvider(
+        partial(SyntheticFrameProvider, 64, 32), max_shape=(32, 64), target_fps=200.0
+    )
+    provider.start(1)
+    try:
+        deadline = time.monotonic() + 5.0
+        while provider.get_frame() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert provider.get_frame() is not None
+        provider._process.kill()
+        provider._process.join(timeout=5.0)
+        assert not provider.alive
+        assert provider.get_frame() is None
+        assert provider.get_preview(32) is None
+    finally:
+        provider.stop()
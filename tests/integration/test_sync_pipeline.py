@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from ambilight.capture.frame_provider import Frame
+from ambilight.config.models import AppConfig, OutputZone
+from ambilight.mjpeg.publisher import MjpegPreviewPublisher
+from ambilight.services.sync_controller import SyncController
+from ambilight.state.runtime_state import RuntimeState
+from ambilight.state.zone_state import ZoneRect
+
+
+class StaticFrameProvider:
+    def __init__(self, pixels: np.ndarray) -> None:
+        self.pixels = pixels
+
+    def start(self, display_id: int) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+    def get_frame(self, since_seq: int = 0) -> Frame:
+        return Frame(pixels=self.pixels, timestamp=datetime.utcnow())
+
+
+class RecordingHaClient:
+    def __init__(self) -> None:
+        self.colors: list[tuple[int, int, int]] = []
+        self.off_calls = 0
+        self.entity_colors: dict[str, list[tuple[int, int, int]]] = {}
+        self.entity_off: dict[str, int] = {}
+        self.transitions: list[float | None] = []
+
+    async def set_color(
+        self,
+        color: tuple[int, int, int],
+        brightness: int = 255,
+        entity_id: str | None = None,
+        transition: float | None = None,
+    ) -> bool:
+        self.transitions.append(transition)
+        if entity_id is None:
+            self.colors.append(color)
+        else:
+            self.entity_colors.setdefault(entity_id, []).append(color)
+        return True
+
+    async def turn_off(self, entity_id: str | None = None) -> bool:
+        if entity_id is None:
+            self.off_calls += 1
+        else:
+            self.entity_off[entity_id] = self.entity_off.get(entity_id, 0) + 1
+        return True
+
+
+def _make_controller(
+    pixels: np.ndarray,
+    zones: tuple[OutputZone, ...] = (),
+    frame_provider: StaticFrameProvider | None = None,
+    **options: Any,
+) -> tuple[SyncController, RecordingHaClient]:
+    config = AppConfig(
+        display_id=1,
+        zone=ZoneRect(x=0, y=0, width=pixels.shape[1], height=pixels.shape[0]),
+        preview_interval_sec=1.0,
+        analysis_hz=200.0,
+        dark_threshold=0.1,
+        saturation_boost=0.0,
+        zones=zones,
+    )
+    ha_client = RecordingHaClient()
+    controller = SyncController(
+        frame_provider=frame_provider or StaticFrameProvider(pixels),
+        ha_client=ha_client,
+        publisher=MjpegPreviewPublisher(),
+        runtime_state=RuntimeState(),
+        config=config,
+        **options,
+    )
+    return controller, ha_client
+
+
+def test_static_frames_skip_analysis() -> None:
+    pixels = np.zeros((40, 60, 3), dtype=np.uint8)
+    pixels[:, :] = [200, 50, 50]
+    controller, ha_client = _make_controller(pixels)
+
+    async def run() -> None:
+        await controller.start()
+        await asyncio.sleep(0.3)
+        await controller.stop()
+
+    asyncio.run(run())
+    diagnostics = controller.runtime_state.diagnostics
+    assert diagnostics.frames_changed == 1
+    assert diagnostics.frames_unchanged > 10
+    assert len(ha_client.colors) < diagnostics.frames_unchanged
+    assert ha_client.colors[-1] == (200, 50, 50)
+    # The first keyframe is a step; there is nothing to fade from.
+    assert ha_client.transitions[0] == 0.0
+
+
+def test_output_zones_drive_their_own_entities() -> None:
+    pixels = np.zeros((40, 60, 3), dtype=np.uint8)
+    pixels[:, :30] = [200, 50, 50]
+    pixels[:, 30:] = [20, 60, 220]
+    zones = (
+        OutputZone(
+            name="left",
+            entity_id="light.left",
+            rect=ZoneRect(x=0, y=0, width=10, height=40),
+        ),
+        OutputZone(
+            name="right",
+            entity_id="light.right",
+            rect=ZoneRect(x=50, y=0, width=10, height=40),
+        ),
+    )
+    controller, ha_client = _make_controller(pixels, zones)
+
+    async def run() -> None:
+        await controller.start()
+        await asyncio.sleep(0.2)
+        await controller.stop()
+
+    asyncio.run(run())
+    assert ha_client.entity_colors["light.left"] == [(200, 50, 50)]
+    assert ha_client.entity_colors["light.right"] == [(20, 60, 220)]
+    assert ha_client.entity_off == {"light.left": 1, "light.right": 1}
+    assert controller.runtime_state.diagnostics.zone_colors["right"] == (20, 60, 220)
+
+
+class SequencedFrameProvider(StaticFrameProvider):
+    """Returns one captured frame again and again, as an idle screen does."""
+
+    def get_frame(self, since_seq: int = 0) -> Frame:
+        return Frame(
+            pixels=self.pixels, timestamp=datetime.utcnow(), seq=1, capture_ns=1
+        )
+
+
+def test_repeated_frames_are_skipped_once_settled() -> None:
+    pixels = np.zeros((40, 60, 3), dtype=np.uint8)
+    pixels[:, :] = [200, 50, 50]
+    controller, ha_client = _make_controller(
+        pixels, frame_provider=SequencedFrameProvider(pixels)
+    )
+    controller.config = replace(controller.config, preview_interval_sec=0.02)
+
+    async def run() -> None:
+        viewer = controller.publisher.stream()
+        watching = asyncio.create_task(viewer.__anext__())
+        await controller.start()
+        await asyncio.sleep(0.3)
+        await controller.stop()
+        await watching
+        await viewer.aclose()
+
+    asyncio.run(run())
+    diagnostics = controller.runtime_state.diagnostics
+    # Analysed until the smoothed color stops moving, then skipped outright.
+    assert diagnostics.frames_changed == 1
+    assert diagnostics.frames_unchanged < 5
+    assert diagnostics.frames_duplicate > 10
+    assert diagnostics.frames_delivered["preview"] == 1
+    assert ha_client.colors[-1] == (200, 50, 50)
+
+
+def test_static_picture_is_refreshed_from_the_sender_timer() -> None:
+    pixels = np.zeros((40, 60, 3), dtype=np.uint8)
+    pixels[:, :] = [200, 50, 50]
+    for transitions in (True, False):
+        controller, ha_client = _make_controller(
+            pixels,
+            frame_provider=SequencedFrameProvider(pixels),
+            output_refresh_sec=0.3,
+            output_transitions=transitions,
+        )
+
+        async def run(controller: SyncController) -> None:
+            await controller.start()
+            await asyncio.sleep(1.1)
+            await controller.stop()
+
+        asyncio.run(run(controller))
+        diagnostics = controller.runtime_state.diagnostics
+        # Analysis settled at once; the light is still re-told its color.
+        assert diagnostics.frames_changed == 1
+        assert len(ha_client.colors) >= 3
+        assert set(ha_client.colors) == {(200, 50, 50)}
+        assert diagnostics.commands_refreshed >= 2
+
+
+def test_preview_is_not_rendered_without_viewers() -> None:
+    pixels = np.full((40, 60, 3), 120, dtype=np.uint8)
+    controller, _ = _make_controller(pixels)
+    controller.config = replace(controller.config, preview_interval_sec=0.02)
+
+    async def run() -> None:
+        await controller.start()
+        await asyncio.sleep(0.2)
+        await controller.stop()
+
+    asyncio.run(run())
+    assert controller.runtime_state.diagnostics.frames_delivered["preview"] == 0
+    assert controller.publisher.stats()["frames_encoded"] == 0
+
+
+class AlternatingFrameProvider(StaticFrameProvider):
+    def __init__(self, frames: list[np.ndarray]) -> None:
+        super().__init__(frames[0])
+        self.frames = frames
+        self.calls = 0
+
+    def get_frame(self, since_seq: int = 0) -> Frame:
+        self.calls += 1
+        return Frame(
+            pixels=self.frames[self.calls % len(self.frames)],
+            timestamp=datetime.utcnow(),
+        )
+
+
+def test_event_loop_stays_responsive_during_analysis() -> None:
+    rng = np.random.default_rng(3)
+    frames = [
+        rng.integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8) for _ in range(2)
+    ]
+    controller, _ = _make_controller(
+        frames[0], frame_provider=AlternatingFrameProvider(frames)
+    )
+    controller.config = replace(controller.config, preview_interval_sec=2.0)
+    lags: list[float] = []
+    totals: list[float] = []
+
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+        await controller.start()
+        diagnostics = controller.runtime_state.diagnostics
+        # Sample for at least 60 steps and until several analyses have completed.
+        while len(lags) < 60 or (diagnostics.frames_changed <= 3 and len(lags) < 600):
+            start = loop.time()
+            await asyncio.sleep(0.005)
+            lags.append(loop.time() - start - 0.005)
+            totals.append(
+                controller.runtime_state.diagnostics.stage_timings_ms.get("total", 0.0)
+            )
+        await controller.stop()
+
+    asyncio.run(run())
+    diagnostics = controller.runtime_state.diagnostics
+    assert diagnostics.frames_changed > 3
+    # Every step re-analyses a full-HD frame; the loop must not wait for it.
+    assert max(lags) * 1000.0 < max(totals) / 2
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ambilight.analysis.backends import (
+    AnalysisBackend,
+    available_backends,
+    calibrate_backends,
+    get_backend,
+    synthetic_zone,
+)
+
+
+def test_registry_contains_builtin_backends() -> None:
+    names = {backend.name for backend in available_backends()}
+    assert {"mediancut", "histogram"} <= names
+    with pytest.raises(ValueError):
+        get_backend("missing")
+
+
+def test_calibration_skips_inaccurate_backends() -> None:
+    broken = AnalysisBackend(name="broken", extract=lambda pixels: (0, 0, 0))
+    result = calibrate_backends(
+        64, 48, frames=2, backends=[broken, get_backend("histogram")]
+    )
+    assert result.selected == "histogram"
+    assert set(result.timings_ms) == {"broken", "histogram"}
+    assert result.max_error["histogram"] <= 16
+
+
+def test_numba_backend_matches_histogram() -> None:
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(5)
+    zone, _ = synthetic_zone(rng, 40, 30)
+    assert get_backend("numba").extract(zone) == get_backend("histogram").extract(zone)
@@ -2,8 +2,14 @@ from __future__ import annotations
 
 from datetime import datetime
 
+import pytest
+
 from ambilight.analysis.dark_detector import DarkDetector
-from ambilight.analysis.smoothing import SmoothingFilter150ms
+from ambilight.analysis.smoothing import (
+    SMOOTHING_MODES,
+    SmoothingFilter150ms,
+    create_smoothing_filter,
+)
 
 
 def test_dark_detector_threshold() -> None:
@@ -18,3 +24,20 @@ def test_smoothing_returns_average() -> None:
     filt.update((0, 0, 0), now)
     smoothed = filt.update((100, 100, 100), now)
     assert smoothed == (50, 50, 50)
+
+
+def test_smoothing_window_uses_monotonic_ns() -> None:
+    filt = SmoothingFilter150ms()
+    filt.update((90, 0, 0), 0)
+    filt.update((30, 0, 0), 100_000_000)
+    assert filt.update((60, 0, 0), 200_000_000) == (45, 0, 0)
+
+
+def test_all_smoothing_modes_converge_on_steady_input() -> None:
+    for mode in SMOOTHING_MODES:
+        filt = create_smoothing_filter(mode)
+        for i in range(50):
+            smoothed = filt.update((10, 120, 240), i * 40_000_000)
+        assert smoothed == (10, 120, 240), mode
+    with pytest.raises(ValueError):
+        create_smoothing_filter("median")
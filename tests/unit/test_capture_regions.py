@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+
+from ambilight.capture.frame_provider import Frame
+from ambilight.capture.regions import (
+    bounding_region,
+    crop_frame,
+    preview_rendition,
+    regions_signature,
+)
+from ambilight.capture.synthetic import SyntheticFrameProvider
+from ambilight.config.models import AppConfig, OutputZone
+from ambilight.services.analysis_pipeline import AnalysisPipeline
+from ambilight.state.zone_state import ZoneRect
+
+
+def test_cropped_frame_views_match_full_frame() -> None:
+    pixels = np.arange(20 * 30 * 3, dtype=np.uint32).reshape(20, 30, 3).astype(np.uint8)
+    frame = Frame(pixels=pixels, timestamp=datetime.utcnow())
+    zones = [
+        ZoneRect(x=2, y=3, width=5, height=4),
+        ZoneRect(x=20, y=10, width=8, height=6),
+    ]
+    region = bounding_region(zones)
+    assert region == ZoneRect(x=2, y=3, width=26, height=13)
+
+    cropped = crop_frame(frame, region)
+    assert cropped.origin == (2, 3)
+    assert cropped.bounds == frame.bounds
+    assert np.shares_memory(cropped.pixels, pixels)
+    for zone in zones:
+        assert np.array_equal(cropped.view(zone), frame.view(zone))
+    assert cropped.view(ZoneRect(x=0, y=0, width=5, height=5)) is None
+    assert preview_rendition(pixels, max_width=10).shape == (7, 10, 3)
+
+
+def test_pipeline_results_do_not_depend_on_region_capture() -> None:
+    config = AppConfig(
+        display_id=1,
+        zone=ZoneRect(x=40, y=20, width=60, height=30),
+        preview_interval_sec=1.0,
+        analysis_hz=25.0,
+        dark_threshold=0.1,
+        saturation_boost=0.2,
+        zones=(
+            OutputZone("top", "light.top", ZoneRect(x=100, y=0, width=50, height=10)),
+        ),
+    )
+    full = SyntheticFrameProvider(160, 90)
+    regional = SyntheticFrameProvider(160, 90)
+    regional.set_regions([config.zone, config.zones[0].rect])
+    full.start(1)
+    regional.start(1)
+    frame = regional.get_frame()
+    assert frame.pixels.shape == (50, 110, 3)
+    expected = AnalysisPipeline().process(full.get_frame(), 0, config)
+    actual = AnalysisPipeline().process(frame, 0, config)
+    assert actual.color == expected.color
+    assert actual.zones == expected.zones
+    preview = regional.get_preview(max_width=40)
+    assert preview.pixels.shape[1] <= 40
+    assert preview.seq == frame.seq
+
+
+def test_regions_signature_sees_small_changes_inside_zones_only() -> None:
+    display = np.zeros((2160, 3840, 3), dtype=np.uint8)
+    zones = [
+        ZoneRect(x=0, y=0, width=96, height=540),
+        ZoneRect(x=864, y=0, width=96, height=540),
+    ]
+    before = regions_signature(display, zones, scale=0.25)
+    # Every 4x4 display block becomes one analysed pixel; change one block.
+    display[1000:1004, 200:204] = 255
+    assert regions_signature(display, zones, scale=0.25) != before
+    changed = regions_signature(display, zones, scale=0.25)
+    display[1000:1004, 1800:1804] = 255  # between the zones
+    assert regions_signature(display, zones, scale=0.25) == changed
+    # A single display pixel is averaged into the analysed frame, so it counts too.
+    display[1001, 203] = 7
+    assert regions_signature(display, zones, scale=0.25) != changed
+    # Without regions the whole display is watched.
+    whole = regions_signature(display, [], scale=0.25)
+    display[1000:1004, 1800:1804] = 0
+    assert regions_signature(display, [], scale=0.25) != whole
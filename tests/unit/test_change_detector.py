@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ambilight.analysis.change_detector import FrameChangeDetector
+
+
+def test_change_detector_counts_hits_and_misses() -> None:
+    detector = FrameChangeDetector()
+    frame = np.zeros((90, 160, 3), dtype=np.uint8)
+    assert detector.has_changed(frame) is True
+    assert detector.has_changed(frame.copy()) is False
+    changed = frame.copy()
+    changed[:, :] = [255, 0, 0]
+    assert detector.has_changed(changed) is True
+    assert (detector.hits, detector.misses) == (1, 2)
+
+
+def test_change_detector_key_forces_recompute() -> None:
+    detector = FrameChangeDetector()
+    frame = np.zeros((10, 10, 3), dtype=np.uint8)
+    detector.has_changed(frame, key="a")
+    assert detector.has_changed(frame, key="b") is True
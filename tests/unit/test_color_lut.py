@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import colorsys
+
+import numpy as np
+
+from ambilight.analysis.color_lut import build_color_lut
+from ambilight.analysis.dark_detector import DarkDetector
+
+
+def _boost(color: tuple[int, int, int], boost: float) -> tuple[int, int, int]:
+    h, s, v = colorsys.rgb_to_hsv(*(c / 255.0 for c in color))
+    r, g, b = colorsys.hsv_to_rgb(h, min(1.0, s + boost), v)
+    return (round(r * 255), round(g * 255), round(b * 255))
+
+
+def test_lut_matches_colorsys_boost_for_saturated_colors() -> None:
+    lut = build_color_lut(0.3, 0.1)
+    rng = np.random.default_rng(3)
+    for color in rng.integers(0, 256, size=(200, 3)):
+        color = tuple(int(c) for c in color)
+        if max(color) - min(color) < 64:
+            continue
+        expected = _boost(color, 0.3)
+        assert (
+            max(abs(a - b) for a, b in zip(lut.apply(color), expected, strict=True))
+            <= 1
+        )
+
+
+def test_lut_boost_keeps_hue_of_near_neutral_colors() -> None:
+    lut = build_color_lut(0.2, 0.1)
+    # A table over RGB interpolated these to (207, 171, 184) and (119, 112, 104).
+    for color, exact in [
+        ((216, 215, 217), (194, 171, 217)),
+        ((128, 130, 128), (102, 130, 102)),
+    ]:
+        assert (
+            max(abs(a - b) for a, b in zip(lut.apply(color), exact, strict=True)) <= 1
+        )
+    rng = np.random.default_rng(5)
+    greys = rng.integers(0, 256, size=(300, 1)) + rng.integers(-3, 4, size=(300, 3))
+    for color in np.clip(greys, 0, 255):
+        color = tuple(int(c) for c in color)
+        assert (
+            max(
+                abs(a - b)
+                for a, b in zip(lut.apply(color), _boost(color, 0.2), strict=True)
+            )
+            <= 1
+        )
+
+
+def test_lut_identity_and_vectorised_lookup_agree() -> None:
+    lut = build_color_lut(0.0, 0.1)
+    colors = np.array([[0, 0, 0], [12, 200, 99], [255, 255, 255]])
+    assert [lut.apply(tuple(int(c) for c in row)) for row in colors] == [
+        (0, 0, 0),
+        (12, 200, 99),
+        (255, 255, 255),
+    ]
+    assert lut.apply_many(colors).tolist() == colors.tolist()
+    boosted = build_color_lut(0.3, 0.1)
+    rng = np.random.default_rng(7)
+    colors = rng.integers(0, 256, size=(100, 3))
+    single = np.array([boosted.apply(tuple(int(c) for c in row)) for row in colors])
+    assert np.abs(boosted.apply_many(colors).astype(int) - single).max() <= 1
+
+
+def test_lut_dark_classification_matches_detector() -> None:
+    lut = build_color_lut(0.2, 0.25)
+    detector = DarkDetector(threshold=0.25)
+    for color in [(0, 0, 0), (60, 60, 60), (70, 70, 70), (255, 0, 0), (0, 90, 0)]:
+        assert lut.is_dark(color) == detector.is_dark(color)
+
+
+def test_lut_is_cached_per_parameters() -> None:
+    assert build_color_lut(0.2, 0.1) is build_color_lut(0.2, 0.1)
+    assert build_color_lut(0.2, 0.1) is not build_color_lut(0.3, 0.1)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from ambilight.services.command_sender import CommandSender
+from ambilight.state.output_state import OutputStateTracker
+
+Command = Tuple[Optional[str], Optional[Tuple[int, int, int]]]
+
+
+class SlowHaClient:
+    """Takes ``delay`` seconds per call; fails the first ``failures`` calls."""
+
+    def __init__(self, delay: float = 0.05, failures: int = 0) -> None:
+        self.delay = delay
+        self.failures = failures
+        self.commands: List[Command] = []
+
+    async def _call(self, command: Command) -> bool:
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.commands.append(command)
+        return True
+
+    async def set_color(self, color, entity_id=None, transition=None) -> bool:
+        return await self._call((entity_id, color))
+
+    async def turn_off(self, entity_id=None) -> bool:
+        return await self._call((entity_id, None))
+
+
+def test_submit_never_waits_and_only_the_newest_color_is_sent() -> None:
+    client = SlowHaClient()
+
+    async def run() -> CommandSender:
+        # Any difference counts, so only coalescing and exact repeats are at play.
+        sender = CommandSender(
+            client, tracker=OutputStateTracker(delta_e_threshold=0.0)
+        )
+        sender.start()
+        sender.submit((1, 0, 0))
+        await asyncio.sleep(0.01)  # first color is now in flight
+        start = time.perf_counter()
+        for value in range(2, 60):
+            sender.submit((value, 0, 0))
+        sender.submit((5, 5, 5), entity_id="light.strip")
+        assert time.perf_counter() - start < 0.01
+        assert await sender.flush(timeout=1.0)
+        # Matches what the lights already show.
+        sender.submit((59, 0, 0))
+        sender.submit((5, 5, 5), entity_id="light.strip")
+        await sender.stop()
+        return sender
+
+    sender = asyncio.run(run())
+    assert client.commands == [
+        (None, (1, 0, 0)),
+        (None, (59, 0, 0)),
+        ("light.strip", (5, 5, 5)),
+    ]
+    assert (sender.sent, sender.coalesced, sender.dropped) == (3, 57, 2)
+
+
+def test_failed_send_is_retried_unless_superseded() -> None:
+    client = SlowHaClient(delay=0.0, failures=2)
+    results: List[bool] = []
+
+    async def run() -> CommandSender:
+        sender = CommandSender(client, retry_delay_sec=0.02, on_result=results.append)
+        sender.start()
+        sender.submit(None)
+        await asyncio.sleep(0.005)
+        sender.submit((9, 9, 9))  # replaces the pending retry
+        assert await sender.flush(timeout=1.0)
+        await sender.stop()
+        return sender
+
+    sender = asyncio.run(run())
+    assert client.commands == [(None, (9, 9, 9))]
+    assert results == [False, False, True]
+    assert sender.failed == 2
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from ambilight.config.models import AppConfig
+from ambilight.config.models import AppConfig, OutputZone
 from ambilight.config.validators import validate_config, validate_zone
 from ambilight.state.zone_state import ZoneRect
 
@@ -24,3 +24,34 @@ def test_validate_config_clamps_ranges() -> None:
     validated = validate_config(config)
     assert validated.dark_threshold == 1.0
     assert validated.saturation_boost == 0.0
+
+
+def test_validate_config_rejects_unknown_smoothing_mode() -> None:
+    config = AppConfig(
+        display_id=1,
+        zone=ZoneRect(x=0, y=0, width=10, height=10),
+        preview_interval_sec=1.0,
+        analysis_hz=25.0,
+        dark_threshold=0.1,
+        saturation_boost=0.2,
+        smoothing_mode="median",
+    )
+    with pytest.raises(ValueError):
+        validate_config(config)
+
+
+def test_validate_config_rejects_duplicate_output_zones() -> None:
+    edge = OutputZone(
+        name="left", entity_id="light.left", rect=ZoneRect(x=0, y=0, width=5, height=10)
+    )
+    config = AppConfig(
+        display_id=1,
+        zone=ZoneRect(x=0, y=0, width=10, height=10),
+        preview_interval_sec=1.0,
+        analysis_hz=25.0,
+        dark_threshold=0.1,
+        saturation_boost=0.2,
+        zones=(edge, edge),
+    )
+    with pytest.raises(ValueError):
+        validate_config(config)
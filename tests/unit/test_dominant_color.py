@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ambilight.analysis.dominant_color import (
+    ENGINE_HISTOGRAM,
+    ENGINE_MEDIANCUT,
+    LEGACY_TOLERANCE,
+    dominant_color_rgb,
+)
+
+
+def _zone_with_minority(
+    base: tuple[int, int, int], other: tuple[int, int, int]
+) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    zone = np.empty((60, 90, 3), dtype=np.uint8)
+    zone[:, :] = base
+    zone[:20, :30] = other
+    noise = rng.integers(-3, 4, size=zone.shape)
+    return np.clip(zone.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize(
+    "base,other",
+    [
+        ((200, 40, 40), (10, 10, 250)),
+        ((30, 120, 90), (250, 250, 250)),
+        ((5, 5, 5), (255, 200, 0)),
+    ],
+)
+def test_histogram_engine_matches_mediancut(base, other) -> None:
+    zone = _zone_with_minority(base, other)
+    legacy = dominant_color_rgb(zone, ENGINE_MEDIANCUT)
+    fast = dominant_color_rgb(zone, ENGINE_HISTOGRAM)
+    assert (
+        max(abs(a - b) for a, b in zip(legacy, fast, strict=True)) <= LEGACY_TOLERANCE
+    )
+
+
+def test_histogram_engine_accepts_rgba() -> None:
+    zone = np.zeros((4, 4, 4), dtype=np.uint8)
+    zone[:, :] = [10, 20, 30, 255]
+    assert dominant_color_rgb(zone, ENGINE_HISTOGRAM) == (10, 20, 30)
+
+
+def test_unknown_engine_rejected() -> None:
+    with pytest.raises(ValueError):
+        dominant_color_rgb(np.zeros((2, 2, 3), dtype=np.uint8), "bogus")
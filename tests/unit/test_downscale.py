@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from ambilight.capture.downscale import BufferPool, Downscaler
+
+
+def _area_average(src: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Reference: exact area average through float64 prefix sums."""
+
+    def axis_average(values: np.ndarray, target: int, axis: int) -> np.ndarray:
+        source = values.shape[axis]
+        cum = np.cumsum(values, axis=axis)
+        cum = np.concatenate(
+            [np.zeros_like(np.take(cum, [0], axis=axis)), cum], axis=axis
+        )
+        edges = np.arange(target + 1) * source / target
+        index = np.minimum(np.floor(edges).astype(int), source - 1)
+        shape = [1, 1, 1]
+        shape[axis] = -1
+        frac = (edges - index).reshape(shape)
+        lower = np.take(cum, index, axis=axis)
+        at_edge = lower + frac * (np.take(cum, index + 1, axis=axis) - lower)
+        return np.diff(at_edge, axis=axis) * target / source
+
+    rows = axis_average(src.astype(np.float64), height, axis=0)
+    return axis_average(rows, width, axis=1)
+
+
+@pytest.mark.parametrize("size", [(60, 40), (80, 45), (37, 23)])
+def test_downscale_matches_area_average(size: tuple[int, int]) -> None:
+    src = np.random.default_rng(4).integers(0, 256, size=(90, 120, 3), dtype=np.uint8)
+    out = Downscaler().resize(src, size)
+    assert out.shape == (size[1], size[0], 3)
+    expected = np.round(_area_average(src, *size))
+    assert np.abs(out.astype(np.int32) - expected).max() <= 1
+
+
+def test_integer_box_sums_do_not_overflow() -> None:
+    for rows in (256, 257):
+        src = np.full((rows, 4, 3), 255, dtype=np.uint8)
+        assert (Downscaler().resize(src, (4, 1)) == 255).all()
+
+
+def test_steady_state_resize_does_not_allocate_frames() -> None:
+    src = np.random.default_rng(5).integers(0, 256, size=(540, 960, 3), dtype=np.uint8)
+    downscaler = Downscaler()
+    for size in ((480, 270), (640, 360)):
+        downscaler.resize(src, size)
+        allocations = downscaler.pool.allocations
+        tracemalloc.start()
+        for _ in range(5):
+            downscaler.resize(src, size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Only NumPy's small casting buffers remain; one output frame is ~390 KB.
+        assert peak < 64 * 1024
+        assert downscaler.pool.allocations == allocations
+
+
+def test_buffer_pool_rotates_and_reallocates_on_shape_change() -> None:
+    pool = BufferPool(count=2)
+    first = pool.take((2, 2, 3))
+    second = pool.take((2, 2, 3))
+    assert first is not second
+    assert pool.take((2, 2, 3)) is first
+    assert pool.take((4, 2, 3)).shape == (4, 2, 3)
+    assert pool.allocations == 4
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+import numpy as np
+
+from ambilight.capture.frame_provider import Frame
+from ambilight.services.frame_hub import FrameHub
+
+
+class ScriptedProvider:
+    """Returns the frame with the current ``seq``; tests bump it to capture."""
+
+    def __init__(self) -> None:
+        self.seq = 1
+        self.calls = 0
+
+    def start(self, display_id: int) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+    def get_frame(self, since_seq: int = 0) -> Frame:
+        self.calls += 1
+        pixels = np.full((4, 8, 3), self.seq, dtype=np.uint8)
+        return Frame(pixels=pixels, timestamp=datetime.utcnow(), seq=self.seq)
+
+    def get_preview(self, max_width: int) -> Frame:
+        frame = self.get_frame()
+        return Frame(
+            pixels=frame.pixels[:, :max_width], timestamp=frame.timestamp, seq=frame.seq
+        )
+
+
+def test_hub_publishes_each_frame_once_and_rate_limits_to_latest() -> None:
+    provider = ScriptedProvider()
+    hub = FrameHub(provider)
+    fast = hub.subscribe("analysis")
+    slow = hub.subscribe("recorder", max_hz=1.0)
+    preview = hub.subscribe("preview", preview_width=2)
+
+    hub.pump()
+    hub.pump()
+    assert hub.duplicates == 1
+    assert fast.frames.get()[1].seq == 1
+    assert slow.frames.get()[1].seq == 1
+    assert preview.frames.get()[1].pixels.shape == (4, 2, 3)
+
+    provider.seq = 2
+    hub.pump()
+    provider.seq = 3
+    hub.pump()
+    # The slow subscriber is not due yet; it keeps only the newest frame pending.
+    version, latest = fast.frames.get()
+    assert (version, latest.seq) == (3, 3)
+    assert fast.dropped == 1
+    assert slow.delivered == 1
+    slow._next_due = time.monotonic()
+    hub.pump()
+    assert slow.frames.get()[1].seq == 3
+    assert hub.stats()["recorder"] == (2, 0)
+
+
+def test_region_change_recuts_current_frame_for_analysis_only() -> None:
+    provider = ScriptedProvider()
+    hub = FrameHub(provider)
+    analysis = hub.subscribe("analysis")
+    preview = hub.subscribe("preview", preview_width=2)
+    hub.pump()
+    hub.set_regions([])
+    hub.pump()
+    assert analysis.delivered == 2
+    assert preview.delivered == 1
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from ambilight.analysis.keyframes import Keyframe, KeyframeSelector
+from ambilight.analysis.smoothing import SmoothingFilter150ms
+from ambilight.state.output_state import delta_e
+
+TICK_NS = 33_333_333  # 30 Hz
+
+
+def _run(raw_colors):
+    selector = KeyframeSelector()
+    smoothing = SmoothingFilter150ms()
+    keyframes = []
+    smoothed = []
+    for index, raw in enumerate(raw_colors):
+        color = smoothing.update(raw, index * TICK_NS)
+        smoothed.append(color)
+        keyframe = selector.update(color, index * TICK_NS)
+        if keyframe is not None:
+            keyframes.append((index, keyframe))
+    return keyframes, smoothed
+
+
+def test_slow_fade_becomes_few_keyframes_that_trace_it() -> None:
+    fade = [(int(200 - 200 * i / 90), 50, int(200 * i / 90)) for i in range(90)]
+    keyframes, smoothed = _run(fade + [(0, 50, 200)] * 30)
+    assert len(keyframes) < len(fade) * 0.15
+    assert keyframes[0] == (0, Keyframe((200, 50, 0), 0.0))
+    assert keyframes[-1][1].color == (0, 50, 200)
+    # Fades cover the trajectory back to back, none longer than a segment.
+    total = sum(keyframe.transition_sec for _, keyframe in keyframes)
+    assert abs(total - len(fade) * TICK_NS / 1e9) < 0.15
+    assert all(keyframe.transition_sec <= 0.5 for _, keyframe in keyframes)
+    # Each fade stays within tolerance of the samples it replaces.
+    previous = keyframes[0][1].color
+    for index, keyframe in keyframes[1:]:
+        span = round(keyframe.transition_sec * 1e9 / TICK_NS)
+        for back in range(1, span):
+            share = (span - back) / span
+            faded = tuple(
+                round(a + (b - a) * share)
+                for a, b in zip(previous, keyframe.color, strict=True)
+            )
+            assert delta_e(smoothed[index - back], faded) <= 2.5
+        previous = keyframe.color
+
+
+def test_cuts_are_prompt_and_on_off_steps() -> None:
+    keyframes, _ = _run([(200, 50, 50)] * 10 + [(20, 220, 40)] * 10)
+    assert [index for index, _ in keyframes] == [0, 10, 11, 12, 13, 14]
+    assert keyframes[-1][1].color == (20, 220, 40)
+    # A cut is a step, not a fade over the time since the previous keyframe.
+    assert all(keyframe.transition_sec == 0.0 for _, keyframe in keyframes)
+
+    selector = KeyframeSelector()
+    assert selector.update((10, 10, 10), 0) == Keyframe((10, 10, 10), 0.0)
+    assert selector.update(None, TICK_NS) == Keyframe(None, 0.0)
+    assert selector.update(None, 2 * TICK_NS) is None
+    assert selector.update((90, 10, 10), 3 * TICK_NS) == Keyframe((90, 10, 10), 0.0)
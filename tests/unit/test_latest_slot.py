@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from ambilight.utils.latest_slot import LatestValueSlot
+
+
+def test_slot_keeps_only_latest_value() -> None:
+    slot = LatestValueSlot[int]()
+    slot.put(1)
+    slot.put(2)
+    version = slot.put(3)
+    assert slot.get() == (version, 3)
+    assert slot.dropped == 2
+    assert slot.wait(version, timeout=0.01) is None
+
+
+def test_async_waiter_wakes_on_put_from_thread() -> None:
+    slot = LatestValueSlot[str]()
+
+    async def run() -> tuple[int, str | None]:
+        timer = threading.Timer(0.05, slot.put, args=("frame",))
+        timer.start()
+        return await asyncio.wait_for(slot.wait_async(0), timeout=1.0)
+
+    assert asyncio.run(run()) == (1, "frame")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import histogram_dominant
+from ambilight.analysis.multi_zone import MultiZoneAnalyzer
+from ambilight.state.zone_state import ZoneRect
+
+
+def test_overlapping_zones_match_separate_crops() -> None:
+    rng = np.random.default_rng(5)
+    frame = rng.integers(0, 256, size=(90, 160, 3), dtype=np.uint8)
+    frame[:40, :70] = [200, 20, 20]
+    frame[50:, 100:] = [10, 30, 220]
+    zones = [
+        ZoneRect(x=0, y=0, width=160, height=90),
+        ZoneRect(x=10, y=5, width=80, height=50),
+        ZoneRect(x=60, y=30, width=100, height=60),
+        ZoneRect(x=150, y=0, width=40, height=20),
+    ]
+    results = MultiZoneAnalyzer(zones).analyse(frame)
+    assert len(results) == len(zones)
+    for zone, (counts, color) in zip(zones, results, strict=True):
+        crop = frame[
+            zone.y : zone.y + zone.height, zone.x : min(160, zone.x + zone.width)
+        ]
+        expected_counts, expected_color = histogram_dominant(crop)
+        assert color == expected_color
+        assert np.array_equal(counts, expected_counts)
+
+
+def test_analyzer_rebuilds_on_shape_change() -> None:
+    analyzer = MultiZoneAnalyzer([ZoneRect(x=0, y=0, width=8, height=8)])
+    analyzer.analyse(np.zeros((8, 8, 3), dtype=np.uint8))
+    counts, color = analyzer.analyse(np.full((4, 4, 3), 120, dtype=np.uint8))[0]
+    assert color == (120, 120, 120)
+    assert int(counts.sum()) == 16
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ambilight.analysis.smoothing import EmaFilter
+from ambilight.state.output_state import OutputStateTracker, delta_e, rgb_to_lab
+
+
+def test_lab_conversion_matches_reference_values() -> None:
+    assert np.allclose(rgb_to_lab((255, 255, 255)), (100.0, 0.0, 0.0), atol=0.05)
+    assert np.allclose(rgb_to_lab((255, 0, 0)), (53.24, 80.09, 67.20), atol=0.05)
+    assert delta_e((0, 0, 0), (0, 0, 0)) == 0.0
+    # A one-step change is invisible; a primary swap is not.
+    assert delta_e((120, 80, 40), (121, 80, 40)) < 1.0
+    assert delta_e((255, 0, 0), (0, 255, 0)) > 100.0
+
+
+def test_tracker_suppresses_invisible_changes_and_refreshes() -> None:
+    tracker = OutputStateTracker(delta_e_threshold=2.0, refresh_interval_sec=10.0)
+    assert tracker.needs_update("light.a", (100, 50, 50))
+    assert tracker.next_refresh_in(now=0.0) is None
+    tracker.record("light.a", (100, 50, 50), now=0.0)
+    assert not tracker.needs_update("light.a", (100, 50, 50))
+    assert not tracker.needs_update("light.a", (101, 50, 50))
+    assert tracker.needs_update("light.a", (130, 50, 50))
+    assert tracker.needs_update("light.a", None)
+
+    tracker.record("light.b", None, now=4.0)
+    assert tracker.next_refresh_in(now=1.0) == 9.0
+    assert tracker.due(now=9.0) == []
+    assert tracker.due(now=10.0) == [("light.a", (100, 50, 50))]
+    # Listed once per interval, then the next light is due.
+    assert tracker.due(now=12.0) == []
+    assert tracker.next_refresh_in(now=12.0) == 2.0
+    assert tracker.due(now=14.0) == [("light.b", None)]
+    assert tracker.refreshes == 2
+
+    assert not tracker.needs_update("light.b", None)
+    tracker.forget("light.b")
+    assert tracker.needs_update("light.b", None)
+
+
+def test_tracker_cuts_commands_for_smoothed_content() -> None:
+    rng = np.random.default_rng(0)
+    tracker = OutputStateTracker()
+    smoothing = EmaFilter(time_constant_ms=300.0)
+    sent = 0
+    ticks = 10 * 120  # two minutes at 10 Hz
+    for tick in range(ticks):
+        scene = tick // 100  # a cut every ten seconds
+        base = np.array([60 + 40 * (scene % 4), 80, 200 - 30 * (scene % 3)])
+        raw = np.clip(base + rng.normal(0, 0.6, 3), 0, 255).round().astype(int)
+        color = smoothing.update(tuple(int(v) for v in raw), tick * 100_000_000)
+        now = tick / 10.0
+        if tracker.needs_update(None, color):
+            tracker.record(None, color, now=now)
+            sent += 1
+        sent += len(tracker.due(now=now))
+    assert sent < ticks * 0.1
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from ambilight.ha.rate_control import AimdRateController
+
+
+def test_rate_climbs_while_round_trips_stay_fast() -> None:
+    control = AimdRateController(rate_hz=10.0, max_rate_hz=20.0, increase_hz=2.0)
+    now = 0.0
+    while now < 3.0:
+        control.record(5.0, True, now=now)
+        now += control.interval_ms / 1000.0
+    # About increase_hz per second, capped at the lights' maximum.
+    assert 15.0 < control.rate_hz <= 16.5
+    for _ in range(200):
+        control.record(5.0, True, now=now)
+    assert control.rate_hz == 20.0
+    assert control.rtt_percentiles() == {"p50": 5.0, "p95": 5.0, "p99": 5.0}
+
+
+def test_failures_and_slow_round_trips_back_off() -> None:
+    control = AimdRateController(rate_hz=16.0, decrease_cooldown_sec=0.5)
+    control.record(4.0, True, now=0.0)
+    rate = control.rate_hz
+    # A burst of congested round trips halves the rate once per cooldown.
+    for step in range(5):
+        control.record(80.0, True, now=1.0 + step * 0.01)
+    assert control.rate_hz == rate / 2
+    control.record(80.0, True, now=1.6)
+    assert control.rate_hz == rate / 4
+    # Failures back off under the same cooldown.
+    for _ in range(20):
+        control.record(0.0, False, now=2.2)
+    assert control.rate_hz == rate / 8
+    assert control.failures == 20
+    # Recovery at most doubles per acknowledged command.
+    control.record(4.0, True, now=3.0)
+    assert rate / 8 < control.rate_hz <= rate / 4
+    assert control.rtt_percentiles()["p99"] == 80.0
+
+
+def test_outage_burst_halves_once_per_cooldown() -> None:
+    control = AimdRateController(rate_hz=20.0, decrease_cooldown_sec=0.5)
+    # Home Assistant restarts: every command fails for two seconds.
+    now = 0.0
+    while now < 2.0:
+        control.record(1.0, False, now=now)
+        now += 0.01
+    assert control.failures == 200
+    assert control.decreases == 4
+    assert control.rate_hz == 20.0 / 16
+    # Well above the floor: the first command after the outage is not held back.
+    assert control.interval_ms < 1000.0
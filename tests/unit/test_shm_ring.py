@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ambilight.capture.shm_ring import SharedFrameRing
+
+
+def test_ring_returns_newest_frame_as_view() -> None:
+    ring = SharedFrameRing.create((8, 12), slots=3)
+    try:
+        assert ring.read() is None
+        for value in (10, 20):
+            ring.write(np.full((6, 12, 3), value, dtype=np.uint8), capture_ns=value)
+        frame = ring.read()
+        assert frame is not None
+        assert (frame.seq, frame.capture_ns, frame.pixels.shape) == (2, 20, (6, 12, 3))
+        assert int(frame.pixels[0, 0, 0]) == 20
+        assert ring.read(since_seq=frame.seq) is None
+        del frame
+    finally:
+        ring.close()
+
+
+def test_ring_detects_overwritten_slot() -> None:
+    ring = SharedFrameRing.create((4, 4), slots=2)
+    try:
+        ring.write(np.zeros((4, 4, 3), dtype=np.uint8), capture_ns=1)
+        frame = ring.read()
+        ring.write(np.ones((4, 4, 3), dtype=np.uint8), capture_ns=2)
+        assert ring.is_current(frame)
+        ring.write(np.full((4, 4, 3), 2, dtype=np.uint8), capture_ns=3)
+        assert not ring.is_current(frame)
+        with pytest.raises(ValueError):
+            ring.write(np.zeros((5, 4, 3), dtype=np.uint8), capture_ns=4)
+        del frame
+    finally:
+        ring.close()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from ambilight.capture.synthetic import PATTERNS, SyntheticFrameProvider
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_patterns_are_deterministic_and_reuse_buffers(pattern: str) -> None:
+    first = SyntheticFrameProvider(64, 36, pattern=pattern, seed=7)
+    second = SyntheticFrameProvider(64, 36, pattern=pattern, seed=7)
+    first.start(1)
+    second.start(1)
+    for _ in range(100):
+        a = first.get_frame()
+        b = second.get_frame()
+        assert a.pixels.shape == (36, 64, 3)
+        assert a.seq == b.seq
+        assert np.array_equal(a.pixels, b.pixels)
+    # Steady state writes into the preallocated pool only.
+    assert first.allocations == 3
+
+
+def test_scene_cuts_hold_content_between_cuts() -> None:
+    provider = SyntheticFrameProvider(64, 36, pattern="scenecut")
+    provider.start(1)
+    frames = [provider.get_frame().pixels.copy() for _ in range(46)]
+    assert all(np.array_equal(frames[0], frame) for frame in frames[:45])
+    assert not np.array_equal(frames[44], frames[45])
+
+
+def test_paced_provider_repeats_frames_until_due() -> None:
+    provider = SyntheticFrameProvider(32, 16, fps=20.0)
+    provider.start(1)
+    first = provider.get_frame()
+    again = provider.get_frame(since_seq=first.seq)
+    assert not again.is_newer_than(first.seq)
+    time.sleep(0.06)
+    assert provider.get_frame(since_seq=first.seq).is_newer_than(first.seq)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ambilight.analysis.dominant_color import dominant_color_histogram
+from ambilight.analysis.tile_histogram import TileHistogram
+
+
+def test_tiles_match_full_histogram_and_reuse_clean_tiles() -> None:
+    rng = np.random.default_rng(11)
+    zone = rng.integers(0, 256, size=(100, 150, 3), dtype=np.uint8)
+    zone[:70] = [40, 80, 160]
+    tiles = TileHistogram(tile_size=32)
+    assert tiles.update(zone) == dominant_color_histogram(zone)
+    total_tiles = tiles.tiles_recomputed
+
+    zone[5:20, 5:20] = [250, 250, 0]
+    zone[70:90, 100:120] = [0, 0, 0]
+    assert tiles.update(zone) == dominant_color_histogram(zone)
+    assert tiles.tiles_recomputed - total_tiles == 2
+    assert tiles.tiles_reused == total_tiles - 2
+    assert int(tiles.counts.sum()) == 100 * 150
+
+
+def test_tiles_reset_on_shape_change() -> None:
+    tiles = TileHistogram(tile_size=16)
+    tiles.update(np.zeros((20, 20, 3), dtype=np.uint8))
+    zone = np.full((40, 10, 3), 200, dtype=np.uint8)
+    assert tiles.update(zone) == (200, 200, 200)
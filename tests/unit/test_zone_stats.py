@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ambilight.analysis.dark_detector import DarkDetector
+from ambilight.analysis.dominant_color import dominant_color_histogram
+from ambilight.analysis.zone_stats import COARSE_BINS, compute_zone_stats
+
+
+def test_zone_stats_summarise_letterboxed_zone() -> None:
+    zone = np.zeros((100, 100, 3), dtype=np.uint8)
+    zone[40:60] = [250, 200, 20]
+    stats = compute_zone_stats(zone, dark_threshold=0.1)
+    assert stats.dominant_rgb == dominant_color_histogram(zone) == (0, 0, 0)
+    assert stats.pixel_count == 10_000
+    assert abs(stats.dark_fraction - 0.8) < 1e-9
+    assert 0.1 < stats.mean_luminance < 0.2
+    assert stats.saturation_spread > 0.3
+    assert len(stats.coarse_histogram) == COARSE_BINS
+    assert sum(stats.coarse_histogram) == 10_000
+    assert DarkDetector(threshold=0.1).is_dark_zone(stats) is True
+
+
+def test_zone_stats_bright_zone_not_dark() -> None:
+    zone = np.full((20, 30, 3), 180, dtype=np.uint8)
+    stats = compute_zone_stats(zone, dark_threshold=0.1)
+    assert stats.dark_fraction == 0.0
+    assert stats.saturation_spread == 0.0
+    assert DarkDetector(threshold=0.1).is_dark_zone(stats) is False